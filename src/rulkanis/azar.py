@@ -0,0 +1,88 @@
+# azar.py
+# -*- coding: utf-8 -*-
+# Generador de azar explícito del motor: los dados, el barajado y las elecciones
+# al azar pasan por un objeto ``Dados`` en lugar del módulo global ``random``,
+# así cada partida tiene su propio flujo reproducible. numpy se importa al
+# crear el primer generador, no al importar el módulo.
+
+from typing import TYPE_CHECKING
+
+from rulkanis.reglas import CARAS_DADO
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Tiradas que se sortean de una vez al vaciarse el bloque
+TAM_BLOQUE_DADOS = 64
+
+
+def secuencia_partida(semilla: int, partida: int) -> "np.random.SeedSequence":
+    """
+    Semilla de una partida derivada de la semilla de la corrida.
+
+    Cada partida tiene su propio flujo independiente (``spawn_key=(partida,)``):
+    su resultado no depende del bloque ni del proceso en que se simule, y puede
+    reproducirse sola.
+    """
+    import numpy as np
+
+    return np.random.SeedSequence(semilla, spawn_key=(partida,))
+
+
+class Dados:
+    """
+    Fuente de azar de una partida sobre un ``np.random.Generator`` (PCG64).
+
+    Las tiradas de dado se sirven de un bloque sorteado por adelantado que se
+    rellena de a ``TAM_BLOQUE_DADOS``; el orden de los valores es el mismo que
+    el de tirarlos de a uno, por lo que el tamaño del bloque no cambia los
+    resultados.
+
+    Args:
+        semilla (int | np.random.SeedSequence): Semilla inicial; None toma
+            entropía del sistema.
+    """
+
+    __slots__ = ("gen", "_bloque", "_pos")
+
+    def __init__(self, semilla=None):
+        self.sembrar(semilla)
+
+    def sembrar(self, semilla):
+        """Reinicia el generador con ``semilla`` y descarta las tiradas pendientes."""
+        import numpy as np
+
+        self.gen = np.random.Generator(np.random.PCG64(semilla))
+        self._bloque = []
+        self._pos = 0
+
+    def tirar(self) -> int:
+        """Tira un dado de ``CARAS_DADO`` caras (1..CARAS_DADO)."""
+        pos = self._pos
+        if pos >= len(self._bloque):
+            self._bloque = self.gen.integers(1, CARAS_DADO + 1, size=TAM_BLOQUE_DADOS).tolist()
+            pos = 0
+        self._pos = pos + 1
+        return self._bloque[pos]
+
+    def barajada(self, secuencia) -> list:
+        """Lista nueva con los elementos de ``secuencia`` en orden aleatorio."""
+        return [secuencia[i] for i in self.gen.permutation(len(secuencia)).tolist()]
+
+    def barajar(self, lista: list):
+        """Baraja ``lista`` en el lugar."""
+        lista[:] = self.barajada(lista)
+
+    def elegir(self, opciones):
+        """Un elemento al azar de ``opciones``."""
+        return opciones[int(self.gen.integers(len(opciones)))]
+
+    def muestra(self, opciones, cantidad: int) -> list:
+        """
+        ``cantidad`` elementos distintos de ``opciones``.
+
+        Raises:
+            ValueError: Si ``cantidad`` es mayor que ``len(opciones)``.
+        """
+        indices = self.gen.choice(len(opciones), cantidad, replace=False)
+        return [opciones[i] for i in indices.tolist()]
@@ -0,0 +1,405 @@
+# benchmark.py
+# -*- coding: utf-8 -*-
+# Benchmarks del simulador con mazos de referencia fijos. Los resultados se
+# guardan como JSON y ``comparar`` falla si algún rendimiento cae más de un
+# umbral respecto de la línea base. La línea base del repositorio está en
+# LINEA_BASE; los rendimientos dependen de la máquina, así que conviene
+# regenerarla (``correr -o``) en la máquina donde corre la comparación.
+#
+#   python -m rulkanis.benchmark correr -o benchmarks/linea_base.json
+#   python -m rulkanis.benchmark comparar [base.json] [nuevo.json] --umbral 0.1
+#   python -m rulkanis.benchmark importacion --presupuesto 0.25
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from rulkanis.azar import Dados
+from rulkanis.carta import Carta
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.datos_rulkanis import cartas_accion
+from rulkanis.exportador import EscritorExcel, abrir_escritor
+from rulkanis.jugador import Jugador
+from rulkanis.logger import NIVELES_LOG
+from rulkanis.mazo import construir_mazo_equipamiento, construir_mazo_random, construir_mazos_random
+from rulkanis.reglas import VIDA_INICIAL, aplicar_carta, aplicar_dano
+from rulkanis.simulador import _simular_bloque
+from rulkanis.torneo import origen_de
+
+VERSION_FORMATO = 1
+# Línea base guardada, relativa a la raíz del repositorio
+LINEA_BASE = os.path.join("benchmarks", "linea_base.json")
+# Semillas de los mazos de referencia y de las partidas
+SEMILLAS_MAZOS = (101, 202)
+SEMILLA_PARTIDAS = 7
+# Caída máxima de rendimiento aceptada por ``comparar`` (0.10 = 10 %)
+UMBRAL = 0.10
+# Mediciones por benchmark; se informa la mejor
+REPETICIONES = 5
+# Módulos que deben importarse rápido (workers del pool, corridas cortas) y
+# dependencias que no deben cargar al importarlos
+MODULOS_LIVIANOS = ("rulkanis.simulador", "rulkanis.mazo", "rulkanis.catalogo", "rulkanis.reglas")
+DEPENDENCIAS_PESADAS = ("numpy", "pandas", "openpyxl", "pyarrow")
+# Segundos máximos para importar cada módulo liviano en un intérprete nuevo
+PRESUPUESTO_IMPORTACION = 0.25
+
+BENCHMARKS = {}
+
+
+def benchmark(nombre: str, unidad: str):
+    """
+    Registra un benchmark. La función decorada recibe ``escala`` (1 normal,
+    menor para una corrida rápida), prepara lo que necesite y devuelve
+    ``(operacion, cantidad)``: una función sin argumentos y cuántas unidades
+    procesa cada llamada. Puede devolver además ``antes``, una función que se
+    llama sin medir antes de cada llamada a ``operacion`` (p. ej. para
+    reiniciar el estado que la operación consume).
+    """
+    def registrar(funcion):
+        BENCHMARKS[nombre] = (funcion, unidad)
+        return funcion
+    return registrar
+
+
+@contextlib.contextmanager
+def _silencio():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def mazos_referencia() -> tuple:
+    """Los dos mazos (mazo, origen) fijos de los benchmarks, armados con ``construir_mazo_random``."""
+    with _silencio():
+        return tuple(construir_mazo_random(f"Referencia {s}", seed=s) for s in SEMILLAS_MAZOS)
+
+
+def _jugadores():
+    catalogo = obtener_catalogo()
+    (mazo1, origen1), (mazo2, origen2) = mazos_referencia()
+    dados = Dados(SEMILLA_PARTIDAS)
+    return (
+        Jugador("Jugador 1", catalogo.cartas_de(mazo1), origen1, dados),
+        Jugador("Jugador 2", catalogo.cartas_de(mazo2), origen2, dados),
+    )
+
+
+# ---------------------------------------------------------------------------
+#  Micro-benchmarks
+@benchmark("aplicar_carta", "cartas/s")
+def _bench_aplicar_carta(escala):
+    j1, j2 = _jugadores()
+    cartas = obtener_catalogo().cartas_de(mazos_referencia()[0][0])
+
+    def operacion():
+        for carta in cartas:
+            aplicar_carta(carta, j1, j2)
+
+    def antes():
+        j1.reiniciar()
+        j2.reiniciar()
+    return operacion, len(cartas), antes
+
+
+@benchmark("aplicar_dano", "llamadas/s")
+def _bench_aplicar_dano(escala):
+    j1, _ = _jugadores()
+    veces = 1000
+
+    def operacion():
+        for i in range(veces):
+            j1.defensa = i & 3
+            j1.esquiva = i % 7 == 0
+            aplicar_dano(j1, 2)
+        j1.vida = VIDA_INICIAL
+    return operacion, veces
+
+
+@benchmark("aplicar_efectos_de_estado", "llamadas/s")
+def _bench_efectos(escala):
+    j1, _ = _jugadores()
+    veces = 1000
+
+    def operacion():
+        for i in range(veces):
+            j1.sangrado = i & 1
+            j1.fuego = i & 2
+            j1.paralizado = i & 1
+            j1.congelado = i % 3 == 0
+            j1.aplicar_efectos_de_estado()
+        j1.vida = VIDA_INICIAL
+    return operacion, veces
+
+
+@benchmark("carta", "cartas/s")
+def _bench_carta(escala):
+    def operacion():
+        for c in cartas_accion:
+            Carta(c["nombre"], c["nomenclatura"], c["nivel"])
+    return operacion, len(cartas_accion)
+
+
+@benchmark("construir_mazo_equipamiento", "mazos/s")
+def _bench_mazo_equipamiento(escala):
+    origen = origen_de((0, 1, 2, 3, 4))
+
+    def operacion():
+        construir_mazo_equipamiento(origen)
+    return operacion, 1
+
+
+@benchmark("construir_mazo_random", "mazos/s")
+def _bench_mazo_random(escala):
+    dados = Dados(SEMILLA_PARTIDAS)
+
+    def operacion():
+        with _silencio():
+            construir_mazo_random("Referencia", dados=dados)
+    return operacion, 1
+
+
+@benchmark("construir_mazos_random", "mazos/s")
+def _bench_mazos_random(escala):
+    dados = Dados(SEMILLA_PARTIDAS)
+    cantidad = max(1, int(10_000 * escala))
+
+    def operacion():
+        construir_mazos_random(cantidad, dados=dados)
+    return operacion, cantidad
+
+
+# ---------------------------------------------------------------------------
+#  Macro-benchmarks
+def _bench_partidas(nivel_log: str):
+    def preparar(escala):
+        (mazo1, origen1), (mazo2, origen2) = mazos_referencia()
+        cantidad = max(1, int((20 if nivel_log == "completo" else 200) * escala))
+
+        def operacion():
+            with _silencio():
+                _simular_bloque(mazo1, origen1, mazo2, origen2, 1, cantidad, SEMILLA_PARTIDAS, nivel_log)
+        return operacion, cantidad
+    return preparar
+
+
+for _nivel in NIVELES_LOG:
+    benchmark(f"partidas_{_nivel}", "partidas/s")(_bench_partidas(_nivel))
+
+
+def _bench_exportar(formato: str):
+    def preparar(escala):
+        (mazo1, origen1), (mazo2, origen2) = mazos_referencia()
+        partidas = max(1, int(200 * escala))
+        _, _, _, detalle, _, _ = _simular_bloque(
+            mazo1, origen1, mazo2, origen2, 1, partidas, SEMILLA_PARTIDAS, "turno"
+        )
+        df = detalle.a_dataframe()
+
+        def operacion():
+            with tempfile.TemporaryDirectory() as directorio:
+                if formato == "excel":
+                    escritor = EscritorExcel(f"{directorio}/resultados.xlsx")
+                else:
+                    escritor = abrir_escritor(directorio, formato)
+                with escritor:
+                    escritor.escribir("detalle", df)
+        return operacion, len(df)
+    return preparar
+
+
+for _formato in ("csv", "parquet", "excel"):
+    benchmark(f"exportar_{_formato}", "filas/s")(_bench_exportar(_formato))
+
+
+# ---------------------------------------------------------------------------
+#  Ejecución y comparación
+def medir(operacion, cantidad: int, repeticiones: int = REPETICIONES, antes=None) -> float:
+    """
+    Unidades por segundo de ``operacion``: la mejor de ``repeticiones``
+    mediciones. ``antes`` se llama antes de cada llamada, fuera de la medición.
+    """
+    antes = antes or (lambda: None)
+    antes()
+    operacion()  # calentamiento
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        antes()
+        t0 = time.perf_counter()
+        operacion()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return cantidad / mejor
+
+
+def correr(filtro: str = None, escala: float = 1.0, repeticiones: int = REPETICIONES) -> dict:
+    """
+    Corre los benchmarks registrados (los que contienen ``filtro`` en el nombre).
+
+    Benchmarks que necesitan una dependencia opcional que falta (p. ej.
+    pyarrow para "exportar_parquet") se omiten con un aviso.
+
+    Returns:
+        dict: Resultados en el formato de los archivos JSON de línea base.
+    """
+    resultados = {}
+    for nombre, (preparar, unidad) in BENCHMARKS.items():
+        if filtro and filtro not in nombre:
+            continue
+        try:
+            operacion, cantidad, *antes = preparar(escala)
+            valor = medir(operacion, cantidad, repeticiones, *antes)
+        except ImportError as e:
+            print(f"{nombre}: omitido ({e})", file=sys.stderr)
+            continue
+        resultados[nombre] = {"valor": valor, "unidad": unidad}
+        print(f"{nombre:<30} {valor:>14,.1f} {unidad}")
+    return {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "escala": escala,
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, nuevo: dict, umbral: float = UMBRAL) -> list:
+    """
+    Compara dos corridas benchmark por benchmark.
+
+    Returns:
+        list: Nombres de los benchmarks cuyo rendimiento cayó más de ``umbral``
+        (fracción) respecto de ``base``. Los que están en una sola corrida no
+        se comparan.
+    """
+    regresiones = []
+    for nombre, medicion in nuevo["resultados"].items():
+        if nombre not in base["resultados"]:
+            continue
+        anterior = base["resultados"][nombre]["valor"]
+        cambio = medicion["valor"] / anterior - 1
+        regresion = cambio < -umbral
+        if regresion:
+            regresiones.append(nombre)
+        print(f"{nombre:<30} {anterior:>14,.1f} -> {medicion['valor']:>14,.1f} "
+              f"{medicion['unidad']:<11} {100 * cambio:+7.1f}%{'  REGRESIÓN' if regresion else ''}")
+    return regresiones
+
+
+def medir_importacion(modulo: str, repeticiones: int = REPETICIONES) -> tuple:
+    """
+    Importa ``modulo`` en intérpretes nuevos y mide cuánto tarda.
+
+    Returns:
+        tuple: (segundos, pesadas): el mejor tiempo de ``repeticiones`` importaciones
+        y las dependencias de ``DEPENDENCIAS_PESADAS`` que quedaron cargadas.
+    """
+    codigo = (
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        f"import {modulo}\n"
+        "print(json.dumps([time.perf_counter() - t0, "
+        f"[m for m in {DEPENDENCIAS_PESADAS!r} if m in sys.modules]]))"
+    )
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rutas = filter(None, (raiz, os.environ.get("PYTHONPATH")))
+    entorno = {**os.environ, "PYTHONPATH": os.pathsep.join(rutas)}
+    mejor, pesadas = float("inf"), []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo], env=entorno, capture_output=True, text=True, check=True
+        ).stdout
+        segundos, pesadas = json.loads(salida)
+        mejor = min(mejor, segundos)
+    return mejor, pesadas
+
+
+def verificar_importacion(presupuesto: float = PRESUPUESTO_IMPORTACION,
+                          repeticiones: int = REPETICIONES) -> list:
+    """
+    Verifica que cada módulo de ``MODULOS_LIVIANOS`` se importe en menos de
+    ``presupuesto`` segundos y sin cargar ``DEPENDENCIAS_PESADAS``.
+
+    Returns:
+        list: Los módulos que no cumplen.
+    """
+    fallidos = []
+    for modulo in MODULOS_LIVIANOS:
+        segundos, pesadas = medir_importacion(modulo, repeticiones)
+        problema = []
+        if segundos > presupuesto:
+            problema.append(f"supera {1000 * presupuesto:.0f} ms")
+        if pesadas:
+            problema.append("carga " + ", ".join(pesadas))
+        if problema:
+            fallidos.append(modulo)
+        print(f"{modulo:<30} {1000 * segundos:>8.1f} ms{'  ' + '; '.join(problema) if problema else ''}")
+    return fallidos
+
+
+def _cargar(ruta: str) -> dict:
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m rulkanis.benchmark", description="Benchmarks del simulador Rulkanis")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_correr = sub.add_parser("correr", help="corre los benchmarks y guarda el JSON")
+    p_comparar = sub.add_parser("comparar", help="compara contra una línea base")
+    p_importacion = sub.add_parser("importacion", help="verifica el tiempo de importación de los módulos livianos")
+    p_importacion.add_argument("--presupuesto", type=float, default=PRESUPUESTO_IMPORTACION,
+                               help="segundos máximos por módulo (por defecto %(default)s)")
+    p_importacion.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    p_comparar.add_argument("base", nargs="?", default=LINEA_BASE,
+                            help="JSON de la línea base (por defecto %(default)s)")
+    p_comparar.add_argument("nuevo", nargs="?", help="JSON a comparar; si falta, se corre ahora")
+    p_comparar.add_argument("--umbral", type=float, default=UMBRAL,
+                            help="caída máxima aceptada, como fracción (por defecto %(default)s)")
+    for p in (p_correr, p_comparar):
+        p.add_argument("-o", "--salida", help="archivo JSON donde guardar la corrida")
+        p.add_argument("-k", "--filtro", help="solo los benchmarks que contienen este texto")
+        p.add_argument("--rapido", action="store_true", help="cargas más chicas (menos precisión)")
+        p.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    args = parser.parse_args(argv)
+
+    if args.comando == "importacion":
+        fallidos = verificar_importacion(args.presupuesto, args.repeticiones)
+        if fallidos:
+            print(f"\n{len(fallidos)} módulo(s) fuera de presupuesto: " + ", ".join(fallidos))
+            return 1
+        return 0
+
+    nuevo = None
+    if args.comando == "comparar" and args.nuevo:
+        nuevo = _cargar(args.nuevo)
+    else:
+        escala = 0.2 if args.rapido else 1.0
+        nuevo = correr(args.filtro, escala, args.repeticiones)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(nuevo, f, indent=2, ensure_ascii=False)
+    if args.comando == "correr":
+        return 0
+
+    base = _cargar(args.base)
+    if base.get("escala") != nuevo.get("escala"):
+        print(f"Aviso: la línea base usa escala {base.get('escala')} y esta corrida "
+              f"{nuevo.get('escala')}; los rendimientos pueden no ser comparables\n")
+    regresiones = comparar(base, nuevo, args.umbral)
+    if regresiones:
+        print(f"\n{len(regresiones)} benchmark(s) con regresión mayor a {100 * args.umbral:.0f}%: "
+              + ", ".join(regresiones))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
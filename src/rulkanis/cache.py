@@ -0,0 +1,257 @@
+# cache.py
+# -*- coding: utf-8 -*-
+# Caché persistente (SQLite) de resultados de partidas. Guarda el código de
+# ganador de cada partida por tramos de semillas, indexado por la huella de los
+# dos mazos, el motor y un hash del código del motor; así repetir un enfrentamiento, o
+# pedir más partidas, solo simula lo que falta.
+
+import hashlib
+import json
+import sqlite3
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from rulkanis import azar, carta, catalogo, datos_rulkanis, jugador, motor_vectorizado, reglas
+from rulkanis.estadistica import GANADORES
+from rulkanis.mazo import huella_mazo
+from rulkanis import simulador
+
+ARCHIVO_CACHE = "resultados_cache.sqlite"
+# Tamaño máximo de los resultados guardados; al superarlo se borran los tramos
+# usados hace más tiempo
+MAX_BYTES = 256 * 2**20
+# Partidas por tramo guardado con el motor clásico
+TAM_TRAMO = 16384
+# Módulos cuyo código decide el ganador de una partida: datos y reglas, cartas,
+# estado del jugador, azar, política de juego (simulador.elegir_carta, …) y el
+# motor vectorizado. Cualquier cambio en ellos invalida la caché.
+MODULOS_MOTOR = (datos_rulkanis, reglas, carta, catalogo, jugador, azar, simulador, motor_vectorizado)
+# Subir si cambia la lógica de simulación fuera de MODULOS_MOTOR
+VERSION_MOTOR = 2
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    nombre TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tramos (
+    clave TEXT NOT NULL,
+    semilla TEXT NOT NULL,
+    inicio INTEGER NOT NULL,
+    fin INTEGER NOT NULL,
+    ganadores BLOB NOT NULL,
+    usado REAL NOT NULL,
+    PRIMARY KEY (clave, semilla, inicio)
+);
+CREATE INDEX IF NOT EXISTS tramos_usado ON tramos (usado);
+"""
+
+
+@lru_cache(maxsize=None)
+def hash_reglas() -> str:
+    """Hash del código de ``MODULOS_MOTOR`` (y de ``VERSION_MOTOR``)."""
+    h = hashlib.sha256(str(VERSION_MOTOR).encode())
+    for modulo in MODULOS_MOTOR:
+        with open(modulo.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """
+    Caché de resultados por partida en un archivo SQLite.
+
+    Cada entrada es un tramo ``inicio..fin`` de partidas de un enfrentamiento
+    (mazo 1, mazo 2, motor, reglas) con una semilla, guardado como un byte por
+    partida. Al abrir la caché con otro ``hash_reglas()`` se descartan todas las
+    entradas.
+
+    Args:
+        ruta (str): Archivo de la base de datos.
+        max_bytes (int): Tamaño máximo de los resultados guardados.
+    """
+
+    def __init__(self, ruta: str = ARCHIVO_CACHE, max_bytes: int = MAX_BYTES):
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self._con = sqlite3.connect(ruta)
+        self._con.executescript(_ESQUEMA)
+        fila = self._con.execute("SELECT valor FROM meta WHERE nombre = 'reglas'").fetchone()
+        if fila is None or fila[0] != hash_reglas():
+            with self._con:
+                self._con.execute("DELETE FROM tramos")
+                self._con.execute(
+                    "INSERT OR REPLACE INTO meta (nombre, valor) VALUES ('reglas', ?)",
+                    (hash_reglas(),),
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self._con.close()
+
+    @staticmethod
+    def clave(mazo1, origen1, mazo2, origen2, motor: str) -> str:
+        """Clave del enfrentamiento: huellas de ambos mazos, motor y reglas."""
+        partes = [huella_mazo(mazo1, origen1), huella_mazo(mazo2, origen2), motor, hash_reglas()]
+        return hashlib.sha256(json.dumps(partes).encode()).hexdigest()
+
+    def tamano(self) -> int:
+        """Bytes de resultados guardados."""
+        return self._con.execute("SELECT COALESCE(SUM(LENGTH(ganadores)), 0) FROM tramos").fetchone()[0]
+
+    def iterar_ganadores(
+        self,
+        mazo1,
+        origen1,
+        mazo2,
+        origen2,
+        repeticiones: int,
+        seed: int,
+        motor: str = "clasico",
+        workers: int = 1,
+    ):
+        """
+        Igual que ``simulador.iterar_ganadores`` para las partidas
+        ``1..repeticiones``, pero leyendo de la caché los tramos ya jugados y
+        guardando los que se simulan.
+        """
+        clave = self.clave(mazo1, origen1, mazo2, origen2, motor)
+        semilla = str(seed)
+        tramos = self._con.execute(
+            "SELECT inicio, fin FROM tramos WHERE clave = ? AND semilla = ? AND inicio <= ? "
+            "ORDER BY inicio",
+            (clave, semilla, repeticiones),
+        ).fetchall()
+
+        def simular(primera, ultima):
+            return self._simular_y_guardar(
+                clave, semilla, mazo1, origen1, mazo2, origen2, primera, ultima, seed, motor,
+                workers,
+            )
+
+        if motor == "vectorizado":
+            # Los lotes se sortean completos: solo sirve un tramo idéntico al lote
+            guardados = set(tramos)
+            tam = simulador._TAM_LOTE_VECTORIZADO
+            lotes = [
+                (i, min(i + tam - 1, repeticiones)) for i in range(1, repeticiones + 1, tam)
+            ]
+            faltan = None
+            for lote in lotes:
+                ganadores = self._leer(clave, semilla, *lote) if lote in guardados else None
+                if ganadores is not None:
+                    if faltan is not None:
+                        yield from simular(faltan, lote[0] - 1)
+                        faltan = None
+                    yield ganadores
+                elif faltan is None:
+                    faltan = lote[0]
+            if faltan is not None:
+                yield from simular(faltan, repeticiones)
+            return
+
+        # Motor clásico: cada partida es independiente, sirve cualquier cobertura
+        partida = 1
+        for inicio, fin in tramos:
+            if fin < partida:
+                continue
+            if inicio > partida:
+                yield from simular(partida, min(inicio - 1, repeticiones))
+                partida = inicio
+            ultima = min(fin, repeticiones)
+            ganadores = self._leer(clave, semilla, inicio, fin)
+            if ganadores is None:
+                # Desalojado mientras se recorría la caché
+                yield from simular(partida, ultima)
+            else:
+                yield ganadores[partida - inicio: ultima - inicio + 1]
+            partida = ultima + 1
+            if partida > repeticiones:
+                break
+        if partida <= repeticiones:
+            yield from simular(partida, repeticiones)
+
+    def contar_victorias(self, mazo1, origen1, mazo2, origen2, repeticiones: int, seed: int,
+                         motor: str = "clasico", workers: int = 1) -> np.ndarray:
+        """Como ``simulador.contar_victorias``, pasando por la caché."""
+        conteo = np.zeros(len(GANADORES), dtype=np.int64)
+        for ganadores in self.iterar_ganadores(
+            mazo1, origen1, mazo2, origen2, repeticiones, seed, motor, workers
+        ):
+            conteo += np.bincount(ganadores, minlength=len(GANADORES))
+        return conteo
+
+    def _leer(self, clave: str, semilla: str, inicio: int, fin: int):
+        """Devuelve los ganadores del tramo ``inicio..fin`` (None si ya no está)."""
+        fila = self._con.execute(
+            "SELECT ganadores FROM tramos WHERE clave = ? AND semilla = ? AND inicio = ? AND fin = ?",
+            (clave, semilla, inicio, fin),
+        ).fetchone()
+        if fila is None:
+            return None
+        with self._con:
+            self._con.execute(
+                "UPDATE tramos SET usado = ? WHERE clave = ? AND semilla = ? AND inicio = ?",
+                (time.time(), clave, semilla, inicio),
+            )
+        return np.frombuffer(fila[0], dtype=np.int8)
+
+    def _simular_y_guardar(self, clave, semilla, mazo1, origen1, mazo2, origen2, primera, ultima,
+                           seed, motor, workers):
+        vectorizado = motor == "vectorizado"
+        pendientes = []
+        inicio = primera
+
+        def guardar():
+            nonlocal inicio
+            if pendientes:
+                ganadores = np.concatenate(pendientes)
+                self._guardar(clave, semilla, inicio, ganadores)
+                inicio += len(ganadores)
+                pendientes.clear()
+
+        try:
+            for ganadores in simulador.iterar_ganadores(
+                mazo1, origen1, mazo2, origen2, primera, ultima, seed, motor, workers
+            ):
+                pendientes.append(ganadores)
+                # Con el motor vectorizado cada bloque es un lote y se guarda aparte
+                if vectorizado or sum(map(len, pendientes)) >= TAM_TRAMO:
+                    guardar()
+                yield ganadores
+        finally:
+            # También al cerrar el generador antes de tiempo (parada anticipada)
+            guardar()
+
+    def _guardar(self, clave: str, semilla: str, inicio: int, ganadores: np.ndarray):
+        with self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO tramos (clave, semilla, inicio, fin, ganadores, usado) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, semilla, inicio, inicio + len(ganadores) - 1,
+                 np.ascontiguousarray(ganadores, dtype=np.int8).tobytes(), time.time()),
+            )
+        self._desalojar()
+
+    def _desalojar(self):
+        """Borra los tramos usados hace más tiempo hasta quedar bajo ``max_bytes``."""
+        exceso = self.tamano() - self.max_bytes
+        if exceso <= 0:
+            return
+        borrar = []
+        for rowid, tam in self._con.execute(
+            "SELECT rowid, LENGTH(ganadores) FROM tramos ORDER BY usado"
+        ):
+            borrar.append((rowid,))
+            exceso -= tam
+            if exceso <= 0:
+                break
+        with self._con:
+            self._con.executemany("DELETE FROM tramos WHERE rowid = ?", borrar)
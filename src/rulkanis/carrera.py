@@ -0,0 +1,135 @@
+# carrera.py
+# -*- coding: utf-8 -*-
+# Selección por carreras entre muchos mazos candidatos: todos juegan rondas
+# cortas contra los mismos rivales y se descartan los que ya quedaron por debajo
+# del líder, así el presupuesto de partidas se concentra en los que compiten.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rulkanis.catalogo import nuevo_mazo
+from rulkanis.estadistica import CODIGO_GANADOR, intervalo_wilson
+from rulkanis.simulador import iterar_ganadores
+
+# Partidas por ronda contra cada rival
+PARTIDAS_RONDA = 100
+
+
+def _jugar_ronda(mazo, origen, rivales: list, primera: int, ultima: int, seed: int, motor: str) -> int:
+    """Victorias del candidato en las partidas ``primera..ultima`` contra cada rival."""
+    victorias = 0
+    for mazo_rival, origen_rival in rivales:
+        for ganadores in iterar_ganadores(
+            mazo, origen, mazo_rival, origen_rival, primera, ultima, seed, motor
+        ):
+            victorias += int(np.count_nonzero(ganadores == CODIGO_GANADOR["Jugador 1"]))
+    return victorias
+
+
+def carrera_mazos(
+    candidatos: list,
+    rivales: list,
+    presupuesto: int,
+    partidas_ronda: int = PARTIDAS_RONDA,
+    confianza: float = 0.95,
+    sobrevivientes: int = 1,
+    workers: int = None,
+    seed: int = 0,
+    motor: str = "clasico",
+):
+    """
+    Compara ``candidatos`` por su porcentaje de victorias contra ``rivales``
+    con una carrera: en cada ronda los candidatos que siguen en pie juegan
+    ``partidas_ronda`` partidas más contra cada rival, y se elimina a todo
+    candidato cuyo intervalo de Wilson queda entero por debajo del intervalo
+    del líder (el de mayor porcentaje). Lo que no juegan los eliminados queda
+    para los que siguen.
+
+    Todos los candidatos juegan las mismas partidas (misma ``seed`` y mismos
+    números de partida, las mismas de ``simular_varias_partidas``), así las diferencias no se mezclan con diferencias de
+    azar. Cada comparación usa el nivel ``confianza`` por separado, sin
+    corregir por comparaciones múltiples.
+
+    La carrera termina al quedar ``sobrevivientes`` candidatos o cuando el
+    presupuesto no alcanza para otra ronda.
+
+    Args:
+        candidatos (list): Pares (mazo, origen) a comparar.
+        rivales (list): Pares (mazo, origen) contra los que juega cada candidato.
+        presupuesto (int): Partidas totales a repartir entre los candidatos.
+        partidas_ronda (int): Partidas por ronda contra cada rival.
+        confianza (float): Nivel de confianza de los intervalos.
+        sobrevivientes (int): Candidatos con los que se da por terminada la carrera.
+        workers (int): Procesos; por defecto ``os.cpu_count()``.
+        seed (int): Semilla común de todas las partidas.
+        motor (str): "clasico" o "vectorizado" (ver ``simular_varias_partidas``).
+
+    Returns:
+        tuple: (tabla, ahorradas). ``tabla`` es un DataFrame con una fila por
+        candidato (primero los sobrevivientes, de mayor a menor porcentaje) con
+        sus victorias, partidas, porcentaje, intervalo y la ronda en que se lo
+        eliminó. ``ahorradas`` son las partidas que no se jugaron respecto de
+        jugar con todos los candidatos tantas partidas como el que más jugó.
+    """
+    if not candidatos or not rivales:
+        raise ValueError("Se necesita al menos un candidato y un rival")
+    candidatos = [(nuevo_mazo(m), dict(o or {})) for m, o in candidatos]
+    rivales = [(nuevo_mazo(m), dict(o or {})) for m, o in rivales]
+    workers = workers or os.cpu_count() or 1
+    n = len(candidatos)
+    victorias = np.zeros(n, dtype=np.int64)
+    partidas = np.zeros(n, dtype=np.int64)
+    eliminado_en = [None] * n
+    vivos = list(range(n))
+    jugadas = 0  # partidas contra cada rival ya jugadas por los vivos
+    ronda = 0
+    costo_ronda = partidas_ronda * len(rivales)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while len(vivos) > sobrevivientes and int(partidas.sum()) + len(vivos) * costo_ronda <= presupuesto:
+            ronda += 1
+            primera, ultima = jugadas + 1, jugadas + partidas_ronda
+            argumentos = (
+                [candidatos[i][0] for i in vivos], [candidatos[i][1] for i in vivos],
+                *([x] * len(vivos) for x in (rivales, primera, ultima, seed, motor)),
+            )
+            resultados = pool.map(_jugar_ronda, *argumentos) if pool else map(_jugar_ronda, *argumentos)
+            for i, v in zip(vivos, resultados):
+                victorias[i] += v
+                partidas[i] += costo_ronda
+            jugadas = ultima
+
+            intervalos = {i: intervalo_wilson(int(victorias[i]), int(partidas[i]), confianza) for i in vivos}
+            lider = max(vivos, key=lambda i: victorias[i] / partidas[i])
+            inferior_lider = intervalos[lider][0]
+            for i in vivos:
+                if intervalos[i][1] < inferior_lider:
+                    eliminado_en[i] = ronda
+            vivos = [i for i in vivos if eliminado_en[i] is None]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    filas = []
+    for i in range(n):
+        inferior, superior = intervalo_wilson(int(victorias[i]), int(partidas[i]), confianza)
+        filas.append({
+            "Candidato": i,
+            "Victorias": int(victorias[i]),
+            "Partidas": int(partidas[i]),
+            "Porcentaje": round(100 * victorias[i] / partidas[i], 2) if partidas[i] else np.nan,
+            "IC inferior": round(100 * inferior, 2),
+            "IC superior": round(100 * superior, 2),
+        })
+    tabla = pd.DataFrame(filas)
+    tabla["Eliminado en ronda"] = pd.array(eliminado_en, dtype="Int64")
+    tabla["Sobreviviente"] = tabla["Eliminado en ronda"].isna()
+    tabla = tabla.sort_values(
+        ["Sobreviviente", "Porcentaje"], ascending=False, kind="stable"
+    ).reset_index(drop=True)
+    ahorradas = int(n * partidas.max() - partidas.sum())
+    return tabla, ahorradas
@@ -1,12 +1,52 @@
 from rulkanis.datos_rulkanis import nomenclaturas as _nomenclaturas
 
+# Categoría por código de acción
+_CATEGORIA_POR_CODIGO = {n['codigo']: n['categoria'] for n in _nomenclaturas}
+
+
+def parsear_codigos(nomenclatura: str) -> tuple:
+    """Separa una nomenclatura combinada ("AN+SC") en sus códigos normalizados."""
+    return tuple(c.strip().upper() for c in nomenclatura.split("+"))
+
+
 class Carta:
-    def __init__(self, nombre, nomenclatura, nivel):
-        self.nombre = nombre
-        self.nomenclatura = nomenclatura
-        self.nivel = nivel
-        self.tipo = self.definir_tipo()
-        self.categoria = self.obtener_categoria()
+    """
+    Carta de acción inmutable. Las cartas del juego se crean una sola vez en el
+    catálogo (ver ``rulkanis.catalogo``) y se comparten por referencia; ``id`` es
+    su posición en el catálogo.
+    """
+
+    __slots__ = (
+        "id", "nombre", "nomenclatura", "nivel", "codigos", "codigo_principal",
+        "tipo", "categoria", "programa",
+    )
+
+    def __init__(self, nombre, nomenclatura, nivel, id=None, programa=None):
+        _set = object.__setattr__
+        _set(self, "id", id)
+        _set(self, "nombre", nombre)
+        _set(self, "nomenclatura", nomenclatura)
+        _set(self, "nivel", nivel)
+        # Códigos de la nomenclatura, parseados una sola vez
+        codigos = parsear_codigos(nomenclatura)
+        _set(self, "codigos", codigos)
+        _set(self, "codigo_principal", codigos[0])
+        # Programa compilado (ver reglas.compilar_programa)
+        _set(self, "programa", programa)
+        _set(self, "tipo", self.definir_tipo())
+        _set(self, "categoria", self.obtener_categoria())
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"Carta es inmutable (no se puede asignar '{nombre}')")
+
+    def __delattr__(self, nombre):
+        raise AttributeError(f"Carta es inmutable (no se puede borrar '{nombre}')")
+
+    def __reduce__(self):
+        # Las cartas del catálogo se reinternan al deserializar (p. ej. en workers)
+        if self.id is not None:
+            return (_carta_por_id, (self.id,))
+        return (Carta, (self.nombre, self.nomenclatura, self.nivel, None, self.programa))
 
     def definir_tipo(self):
         uni = self.nombre.upper()
@@ -17,15 +57,14 @@ class Carta:
         return "NORMAL"
 
     def accion_principal(self):
-        return self.nomenclatura.split("+")[0].strip()
+        return self.codigo_principal
     
     def obtener_categoria(self):
         """
         Obtiene la categoría de una carta basada en su código de acción principal.
-        La función recupera el código de acción principal de la carta, lo procesa 
-        eliminando espacios en blanco y convirtiéndolo a mayúsculas, y luego lo 
-        compara con una lista predefinida de nomenclaturas. Si se encuentra una 
-        coincidencia, se devuelve la categoría correspondiente; de lo contrario, 
+        La función busca el código de acción principal de la carta (ya normalizado
+        a mayúsculas y sin espacios) en el índice de nomenclaturas. Si se encuentra
+        una coincidencia, se devuelve la categoría correspondiente; de lo contrario,
         se devuelve None.
 
         Args:
@@ -34,13 +73,14 @@ class Carta:
             str o None: La categoría de la carta si se encuentra una coincidencia 
                         en las nomenclaturas; de lo contrario, None.
         """
-        codigo = self.accion_principal().strip().upper()
-        for n in _nomenclaturas:
-            if n['codigo'] == codigo:
-                return n['categoria']
-        return None
+        return _CATEGORIA_POR_CODIGO.get(self.codigo_principal)
 
     def __repr__(self):
         return f"{self.nombre} (Nivel {self.nivel}, Tipo: {self.tipo})"
 
 
+
+
+def _carta_por_id(id):
+    from rulkanis.catalogo import obtener_catalogo
+    return obtener_catalogo()[id]
@@ -0,0 +1,88 @@
+# catalogo.py
+# -*- coding: utf-8 -*-
+# Catálogo único de cartas: cada carta de datos_rulkanis existe una sola vez,
+# con un id entero, y los mazos son arreglos de ids sobre este catálogo.
+
+from array import array
+from functools import lru_cache
+from rulkanis.datos_rulkanis import (
+    cartas_accion,
+    distribucion_equipamiento,
+    equipamiento_sets_nominales,
+)
+from rulkanis.carta import Carta, parsear_codigos
+from rulkanis.reglas import compilar_programa
+
+# Tipo de los arreglos de ids de un mazo
+TIPO_ID = "H"
+
+
+class Catalogo:
+    """
+    Conjunto inmutable de cartas con índices precalculados.
+
+    Atributos:
+        cartas (tuple): Cartas ordenadas por id.
+        por_nomenclatura (dict): nomenclatura -> id.
+        por_nivel (dict): nivel -> tupla de ids.
+        por_categoria (dict): categoría -> tupla de ids.
+        por_pieza (dict): (set, pieza, nivel) -> tupla de ids disponibles para esa
+            pieza del set de equipamiento, en orden de catálogo.
+    """
+
+    __slots__ = ("cartas", "por_nomenclatura", "por_nivel", "por_categoria", "por_pieza")
+
+    def __init__(self, datos_cartas: list, sets: dict, distribucion: dict):
+        self.cartas = tuple(
+            Carta(
+                c["nombre"],
+                c["nomenclatura"],
+                c["nivel"],
+                id=i,
+                programa=compilar_programa(parsear_codigos(c["nomenclatura"])),
+            )
+            for i, c in enumerate(datos_cartas)
+        )
+        self.por_nomenclatura = {c.nomenclatura: c.id for c in self.cartas}
+
+        por_nivel: dict = {}
+        por_categoria: dict = {}
+        for c in self.cartas:
+            por_nivel.setdefault(c.nivel, []).append(c.id)
+            por_categoria.setdefault(c.categoria, []).append(c.id)
+        self.por_nivel = {k: tuple(v) for k, v in por_nivel.items()}
+        self.por_categoria = {k: tuple(v) for k, v in por_categoria.items()}
+
+        self.por_pieza = {}
+        for nombre_set, piezas in sets.items():
+            for pieza, nomenclaturas in piezas.items():
+                noms = set(nomenclaturas)
+                for nivel in distribucion.get(pieza, {}):
+                    self.por_pieza[(nombre_set, pieza, nivel)] = tuple(
+                        i for i in self.por_nivel.get(nivel, ()) if self.cartas[i].nomenclatura in noms
+                    )
+
+    def __getitem__(self, id: int) -> Carta:
+        return self.cartas[id]
+
+    def __len__(self):
+        return len(self.cartas)
+
+    def __iter__(self):
+        return iter(self.cartas)
+
+    def cartas_de(self, ids) -> list:
+        """Devuelve las cartas (compartidas) correspondientes a un arreglo de ids."""
+        cartas = self.cartas
+        return [cartas[i] for i in ids]
+
+
+@lru_cache(maxsize=None)
+def obtener_catalogo() -> Catalogo:
+    """Devuelve el catálogo de cartas, construyéndolo la primera vez."""
+    return Catalogo(cartas_accion, equipamiento_sets_nominales, distribucion_equipamiento)
+
+
+def nuevo_mazo(ids=()) -> array:
+    """Crea un arreglo de ids de cartas para un mazo."""
+    return array(TIPO_ID, ids)
@@ -0,0 +1,110 @@
+# estadistica.py
+# -*- coding: utf-8 -*-
+# Estadísticas en línea de los resultados: conteo de ganadores, intervalos de
+# confianza de Wilson y parada secuencial por precisión objetivo.
+
+import math
+from statistics import NormalDist
+
+# Resultados posibles de una partida, en el orden de sus códigos
+GANADORES = ("Jugador 1", "Jugador 2", "Empate")
+CODIGO_GANADOR = {nombre: i for i, nombre in enumerate(GANADORES)}
+
+# Cada cuántas partidas se evalúa la parada anticipada
+PASO_CONTROL = 1000
+
+
+def intervalo_wilson(exitos: int, n: int, confianza: float = 0.95) -> tuple:
+    """
+    Intervalo de confianza de Wilson para una proporción.
+
+    Args:
+        exitos (int): Casos favorables.
+        n (int): Casos totales.
+        confianza (float): Nivel de confianza, p. ej. 0.95.
+
+    Returns:
+        tuple: (inferior, superior) como fracciones; (0.0, 1.0) si ``n`` es 0.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    p = exitos / n
+    z2n = z * z / n
+    centro = (p + z2n / 2) / (1 + z2n)
+    radio = z * math.sqrt(p * (1 - p) / n + z2n / (4 * n)) / (1 + z2n)
+    return max(0.0, centro - radio), min(1.0, centro + radio)
+
+
+class SeguimientoVictorias:
+    """
+    Conteo en línea de ganadores con parada secuencial.
+
+    Los resultados se agregan en orden de partida y la precisión se evalúa cada
+    ``paso`` partidas; como esos puntos de control dependen solo del número de
+    partida, la parada es la misma con cualquier número de workers.
+
+    Atributos:
+        conteo (np.ndarray): Partidas por resultado, en el orden de ``GANADORES``.
+        partidas (int): Partidas contadas.
+        detenida (bool): True si se alcanzó la precisión objetivo.
+    """
+
+    def __init__(self, precision: float = None, confianza: float = 0.95, paso: int = PASO_CONTROL):
+        """
+        Args:
+            precision (float): Semiancho objetivo del intervalo, en puntos
+                porcentuales (0.5 = ±0.5%). Si es None nunca se detiene.
+            confianza (float): Nivel de confianza de los intervalos.
+            paso (int): Partidas entre puntos de control.
+        """
+        import numpy as np
+
+        self.precision = precision
+        self.confianza = confianza
+        self.paso = paso
+        self.conteo = np.zeros(len(GANADORES), dtype=np.int64)
+        self.partidas = 0
+        self.detenida = False
+
+    def agregar(self, ganadores) -> int:
+        """
+        Agrega los códigos de ganador de las siguientes partidas.
+
+        Returns:
+            int: Cuántas de esas partidas se contaron. Es menor que
+            ``len(ganadores)`` si la precisión se alcanzó en un punto de control
+            intermedio; las partidas siguientes deben descartarse.
+        """
+        import numpy as np
+
+        ganadores = np.asarray(ganadores)
+        usadas = len(ganadores)
+        if self.precision is not None:
+            # Puntos de control que caen dentro de este tramo
+            siguiente = (self.partidas // self.paso + 1) * self.paso
+            for control in range(siguiente, self.partidas + usadas + 1, self.paso):
+                corte = control - self.partidas
+                conteo = self.conteo + np.bincount(ganadores[:corte], minlength=len(GANADORES))
+                if self._precision_alcanzada(conteo, control):
+                    usadas = corte
+                    self.detenida = True
+                    break
+        self.conteo += np.bincount(ganadores[:usadas], minlength=len(GANADORES))
+        self.partidas += usadas
+        return usadas
+
+    def _precision_alcanzada(self, conteo, n: int) -> bool:
+        objetivo = self.precision / 100
+        for exitos in conteo:
+            inferior, superior = intervalo_wilson(int(exitos), n, self.confianza)
+            if (superior - inferior) / 2 > objetivo:
+                return False
+        return True
+
+    def intervalos(self) -> list:
+        """Intervalo de Wilson, en porcentaje, de cada resultado de ``GANADORES``."""
+        return [
+            tuple(100 * x for x in intervalo_wilson(int(exitos), self.partidas, self.confianza))
+            for exitos in self.conteo
+        ]
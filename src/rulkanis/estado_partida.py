@@ -0,0 +1,145 @@
+# estado_partida.py
+# -*- coding: utf-8 -*-
+# Foto compacta e inmutable del estado de una partida a mitad de un turno, para
+# búsquedas que necesitan copiar el estado miles de veces (ver rulkanis.mcts).
+# Clonar una foto no copia nada: las manos y los mazos son tuplas compartidas, y
+# solo se arma una tupla nueva para la parte que cambia (copy-on-write).
+
+import hashlib
+
+from rulkanis.jugador import Jugador
+
+# Contadores de un jugador que se guardan en la foto, en este orden
+CONTADORES = (
+    "vida", "defensa", "sangrado", "fuego", "congelado", "paralizado", "esquiva",
+    "suerte_turnos", "salta_turno",
+)
+
+
+class EstadoPartida:
+    """
+    Estado de una partida: los dos jugadores, a quién le toca y el avance del
+    turno en curso (cartas jugadas, nivel usado y categorías jugadas).
+
+    Cada jugador es una tupla ``(contadores, mano, mazo, cursor)``: los valores
+    de ``CONTADORES``, la mano como pares ``(posición, carta)`` en orden de robo,
+    el mazo completo en el orden barajado y la posición de la próxima carta a
+    robar. Las tuplas no se modifican nunca, así que varias fotos las comparten.
+
+    Las fotos se comparan y se usan como claves de dict por su contenido
+    (``clave``); ``huella`` es un hash del mismo contenido que no cambia entre
+    procesos ni ejecuciones.
+
+    Atributos:
+        jugadores (tuple): Estado de "Jugador 1" y "Jugador 2".
+        mueve (int): Índice en ``jugadores`` del jugador del turno.
+        cartas_jugadas (int): Cartas jugadas con éxito en el turno.
+        nivel_total (int): Nivel usado en el turno.
+        categorias (frozenset): Categorías jugadas en el turno.
+    """
+
+    __slots__ = ("jugadores", "mueve", "cartas_jugadas", "nivel_total", "categorias")
+
+    def __init__(self, jugadores: tuple, mueve: int, cartas_jugadas: int = 0,
+                 nivel_total: int = 0, categorias=frozenset()):
+        self.jugadores = jugadores
+        self.mueve = mueve
+        self.cartas_jugadas = cartas_jugadas
+        self.nivel_total = nivel_total
+        self.categorias = frozenset(categorias)
+
+    @staticmethod
+    def _foto_jugador(j: Jugador, mazo: tuple = None) -> tuple:
+        return (
+            tuple(getattr(j, nombre) for nombre in CONTADORES),
+            tuple(j.mano.items()),
+            tuple(j._orden) if mazo is None else mazo,
+            j._cursor,
+        )
+
+    @classmethod
+    def desde_jugadores(cls, j1: Jugador, j2: Jugador, actual: Jugador,
+                        cartas_jugadas: int = 0, nivel_total: int = 0, categorias=frozenset()):
+        """Foto de ``j1`` y ``j2`` con el turno de ``actual`` en el avance dado."""
+        return cls(
+            (cls._foto_jugador(j1), cls._foto_jugador(j2)),
+            0 if actual is j1 else 1,
+            cartas_jugadas,
+            nivel_total,
+            categorias,
+        )
+
+    def cargar(self, j1: Jugador, j2: Jugador) -> tuple:
+        """
+        Deja ``j1`` y ``j2`` (jugadores de trabajo, no los de la partida) en el
+        estado de la foto, sin copiar los mazos: el mazo del jugador pasa a ser
+        la tupla de la foto, que ``Jugador.robar`` solo lee.
+
+        Returns:
+            tuple: (actual, oponente) según ``mueve``.
+        """
+        for j, (contadores, mano, mazo, cursor) in zip((j1, j2), self.jugadores):
+            for nombre, valor in zip(CONTADORES, contadores):
+                setattr(j, nombre, valor)
+            j.mano.clear()
+            j.mano.update(mano)
+            j._orden = mazo
+            j._cursor = cursor
+            j.descartadas.clear()
+        return (j1, j2) if self.mueve == 0 else (j2, j1)
+
+    def con_avance(self, cartas_jugadas: int, nivel_total: int, categorias) -> "EstadoPartida":
+        """Clon con otro avance del turno; los jugadores se comparten."""
+        return EstadoPartida(self.jugadores, self.mueve, cartas_jugadas, nivel_total, categorias)
+
+    def determinizar(self, dados, observador: int) -> "EstadoPartida":
+        """
+        Clon con lo que ``observador`` no ve sorteado de nuevo con ``dados``: el
+        orden de su propio mazo restante, y la mano y el mazo restante del
+        rival (sus cartas sin jugar se rebarajan y la mano conserva el tamaño y
+        las posiciones). Las cartas ya robadas o jugadas no cambian.
+        """
+        jugadores = list(self.jugadores)
+        contadores, mano, mazo, cursor = jugadores[observador]
+        jugadores[observador] = (contadores, mano, mazo[:cursor] + tuple(dados.barajada(mazo[cursor:])), cursor)
+
+        rival = 1 - observador
+        contadores, mano, mazo, cursor = jugadores[rival]
+        ocultas = dados.barajada([carta for _, carta in mano] + list(mazo[cursor:]))
+        mano = tuple((pos, carta) for (pos, _), carta in zip(mano, ocultas))
+        jugadores[rival] = (contadores, mano, mazo[:cursor] + tuple(ocultas[len(mano):]), cursor)
+        return EstadoPartida(tuple(jugadores), self.mueve, self.cartas_jugadas, self.nivel_total,
+                             self.categorias)
+
+    def clave(self) -> tuple:
+        """
+        Contenido de la foto con solo valores simples: contadores, ids de la mano
+        en orden y del mazo restante, a quién le toca y el avance del turno.
+        """
+        return (
+            tuple(
+                (contadores, tuple(carta.id for _, carta in mano), tuple(carta.id for carta in mazo[cursor:]))
+                for contadores, mano, mazo, cursor in self.jugadores
+            ),
+            self.mueve,
+            self.cartas_jugadas,
+            self.nivel_total,
+            tuple(sorted(self.categorias)),
+        )
+
+    def huella(self) -> str:
+        """Hash hexadecimal de ``clave``, igual en cualquier proceso o ejecución."""
+        return hashlib.blake2b(repr(self.clave()).encode(), digest_size=8).hexdigest()
+
+    def __eq__(self, otro):
+        return isinstance(otro, EstadoPartida) and self.clave() == otro.clave()
+
+    def __hash__(self):
+        return hash(self.clave())
+
+    def __repr__(self):
+        vidas = ", ".join(str(contadores[0]) for contadores, _, _, _ in self.jugadores)
+        return (
+            f"EstadoPartida(mueve=Jugador {self.mueve + 1}, vidas=({vidas}), "
+            f"cartas_jugadas={self.cartas_jugadas}, nivel_total={self.nivel_total})"
+        )
@@ -0,0 +1,153 @@
+# eventos.py
+# -*- coding: utf-8 -*-
+# Eventos estructurados de una partida. Cada evento es una tupla compacta
+# ``(código, *args)`` con argumentos enteros; el texto en español se genera
+# solo al exportar, con ``renderizar_evento`` / ``renderizar_eventos``.
+
+from rulkanis.datos_rulkanis import cartas_accion, nomenclaturas as _nomenclaturas
+
+# Códigos de acción en orden estable (los eventos guardan su índice)
+CODIGOS = tuple(n["codigo"] for n in _nomenclaturas)
+INDICE_CODIGO = {codigo: i for i, codigo in enumerate(CODIGOS)}
+_CATEGORIA = tuple(n["categoria"] for n in _nomenclaturas)
+
+ETIQUETAS = {
+    'AL': "Ataque Ligero", 'AN': "Ataque Normal", 'AC': "Ataque Crítico",
+    'SA': "Sangrado Azar", 'SC': "Sangrado Certero",
+    'FA': "Fuego Azar", 'FC': "Fuego Certero",
+    'BD': "Bufo Defensa", 'BDN': "Bufo Defensa Normal", 'BDF': "Bufo Defensa Fuerte",
+    'BVP': "Bufo Vida Pequeño", 'BVM': "Bufo Vida Mediano", 'BVG': "Bufo Vida Grande",
+    'PA': "Paralizar Azar", 'PC': "Paralizar Certero",
+    'CA': "Congelar Azar", 'CC': "Congelar Certero",
+    'BLA': "Limpieza", 'BS': "Bufo Suerte",
+    'EA': "Esquivar Azar", 'EC': "Esquivar Certero",
+    'RC': "Robo Carta",
+}
+_ETIQUETA = tuple(ETIQUETAS[c] for c in CODIGOS)
+
+# ---------------------------------------------------------------------------
+#  Códigos de evento
+# Efectos de estado al inicio del turno
+EV_SANGRADO = 1            # ()
+EV_FUEGO_DEFENSA = 2       # ()
+EV_FUEGO_VIDA = 3          # ()
+EV_CONGELADO = 4           # ()
+EV_PARALIZADO = 5          # (dado, limite, salta)
+# Resultado de aplicar_dano (van anidados dentro de EV_ATAQUE)
+EV_DANO_ESQUIVADO = 10     # ()
+EV_DANO_DEFENSA = 11       # (cantidad, defensa)
+EV_DANO_VIDA = 12          # (absorbido, restante, vida)
+# Handlers de reglas; ``ic`` es el índice del código en CODIGOS
+EV_CARTA = 20              # (id_carta, exito, dado)
+EV_ATAQUE = 21             # (ic, *resultado de aplicar_dano)
+EV_ESTADO_APLICADO = 22    # (ic, dado, dano, turnos); dado 0 si es certero
+EV_ESTADO_FALLIDO = 23     # (ic, dado)
+EV_DEFENSA = 24            # (ic, cantidad)
+EV_VIDA = 25               # (ic, cantidad, vida)
+EV_LIMPIEZA = 26           # (ic,)
+EV_SUERTE = 27             # (ic, turnos, limite)
+EV_ESQUIVA = 28            # (ic, dado, activada); dado 0 si es certero
+EV_ROBAR = 29              # (ic, cantidad)
+# Reacción del oponente: (id_carta, primer evento de la carta de esquive)
+EV_REACCION = 30
+
+# Formato de la columna "Evento" según el tipo de fila
+FORMATO_INICIO_TURNO = 0
+FORMATO_REACCION = 1
+FORMATO_JUGADA = 2
+
+_NOMBRES_CARTAS = tuple(c["nombre"] for c in cartas_accion)
+
+
+def _texto_dano(ev: tuple) -> str:
+    codigo = ev[0]
+    if codigo == EV_DANO_ESQUIVADO:
+        return "Daño esquivado"
+    if codigo == EV_DANO_DEFENSA:
+        return f"{ev[1]} absorbido por defensa (defensa ahora {ev[2]})"
+    return f"{ev[1]} absorbido, {ev[2]} a vida (vida ahora {ev[3]})"
+
+
+def _texto_estado(ic: int, dano: int, turnos: int) -> str:
+    if _CATEGORIA[ic] == "congelar":
+        return "salta turno"
+    if dano:
+        return f"{dano}×{turnos} turnos"
+    return f"{turnos} turnos"
+
+
+def renderizar_evento(ev: tuple, jugador: str = "") -> str:
+    """
+    Devuelve el texto de un evento estructurado.
+
+    Args:
+        ev (tuple): Evento ``(código, *args)``.
+        jugador (str): Nombre del jugador de la fila, usado por las reacciones.
+    """
+    codigo = ev[0]
+    if codigo == EV_SANGRADO:
+        return "Sangrado: -1 vida"
+    if codigo == EV_FUEGO_DEFENSA:
+        return "Fuego: -1 defensa"
+    if codigo == EV_FUEGO_VIDA:
+        return "Fuego: -1 vida"
+    if codigo == EV_CONGELADO:
+        return "Congelado: pierde turno"
+    if codigo == EV_PARALIZADO:
+        _, d, limite, salta = ev
+        if salta:
+            return f"Paralizado: dado {d} (<{limite}), pierde turno"
+        return f"Paralizado: dado {d} (≥{limite}), puede jugar"
+    if codigo == EV_CARTA:
+        _, id_carta, exito, dado = ev
+        texto = f"{_NOMBRES_CARTAS[id_carta]} ({'Éxito' if exito else 'Fallo'}"
+        if dado:
+            texto += f", dado={dado}"
+        return texto + ")"
+    if codigo == EV_REACCION:
+        _, id_carta, primero = ev
+        return f"REACCIÓN: {jugador} juega {_NOMBRES_CARTAS[id_carta]} → {renderizar_evento(primero)}"
+
+    etiqueta = _ETIQUETA[ev[1]]
+    if codigo == EV_ATAQUE:
+        return f"{etiqueta}: {_texto_dano(ev[2:])}"
+    if codigo == EV_ESTADO_APLICADO:
+        _, ic, dado, dano, turnos = ev
+        texto = _texto_estado(ic, dano, turnos)
+        if dado:
+            return f"{etiqueta}: aplicado (dado={dado}, {texto})"
+        return f"{etiqueta}: aplicado ({texto})"
+    if codigo == EV_ESTADO_FALLIDO:
+        return f"{etiqueta}: fallido (dado={ev[2]})"
+    if codigo == EV_DEFENSA:
+        return f"{etiqueta}: +{ev[2]} defensa"
+    if codigo == EV_VIDA:
+        return f"{etiqueta}: +{ev[2]} vida (vida ahora {ev[3]})"
+    if codigo == EV_LIMPIEZA:
+        return f"{etiqueta}: estados negativos eliminados"
+    if codigo == EV_SUERTE:
+        return f"{etiqueta}: activado ({ev[2]} turnos, limite={ev[3]})"
+    if codigo == EV_ESQUIVA:
+        _, _, dado, activada = ev
+        if not dado:
+            return f"{etiqueta}: activado"
+        return f"{etiqueta}: {'activado' if activada else 'fallido'} (dado={dado})"
+    if codigo == EV_ROBAR:
+        return f"{etiqueta}: ambos roban {ev[2]} carta"
+    raise ValueError(f"Evento desconocido: {ev!r}")
+
+
+def renderizar_eventos(valor, jugador: str = "") -> str:
+    """
+    Renderiza el valor guardado en la columna "Evento" de una fila de detalle,
+    ``(formato, eventos)``, con el separador que corresponde a su tipo de fila.
+    """
+    if not isinstance(valor, tuple):
+        return valor
+    formato, eventos = valor
+    textos = [renderizar_evento(ev, jugador) for ev in eventos]
+    if formato == FORMATO_INICIO_TURNO:
+        return "; ".join(textos) or "—"
+    if formato == FORMATO_REACCION:
+        return " | ".join(textos)
+    return " | " + " & ".join(textos)
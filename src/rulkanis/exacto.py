@@ -0,0 +1,415 @@
+# exacto.py
+# -*- coding: utf-8 -*-
+# Probabilidades exactas de un enfrentamiento: recorre el proceso estocástico de
+# ``simular_partida`` (misma política y mismas reglas) sumando la probabilidad de
+# cada resultado, con una tabla de transposición de estados ya expandidos.
+
+import heapq
+
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.estadistica import GANADORES
+from rulkanis.jugador import Jugador
+from rulkanis.reglas import (
+    aplicar_carta,
+    determinar_exito_carta,
+    CARAS_DADO,
+    CARTAS_INICIALES,
+    CATEGORIAS_ATAQUE,
+    CODIGOS_ESQUIVE,
+    MAX_CARTAS_TURNO,
+)
+from rulkanis.simulador import elegir_carta, elegir_esquive, fase_reaccion
+
+# Estados guardados como máximo en la tabla de transposición (cada uno ocupa
+# alrededor de un kilobyte)
+MAX_ESTADOS = 500_000
+
+# Fases de un estado: reparto de la mano inicial, inicio de turno (efectos de
+# estado) y jugada de una carta
+FASE_REPARTO, FASE_INICIO, FASE_JUGAR = 0, 1, 2
+
+# Claves de los estados finales, en el orden de GANADORES
+_FIN = tuple(("fin", i) for i in range(len(GANADORES)))
+_CODIGO_FIN = {clave: i for i, clave in enumerate(_FIN)}
+
+
+class _Eleccion(Exception):
+    """
+    La jugada depende de un resultado de azar que el guion no fija: hay que
+    reemplazar la elección ``indice`` del guion por cada una de ``opciones``,
+    pares (valor, probabilidad).
+    """
+
+    def __init__(self, indice: int, opciones):
+        self.indice = indice
+        self.opciones = opciones
+
+
+class _Dado:
+    """
+    Dado del que solo se sabe que cayó en ``minimo..maximo``. Al compararlo con
+    un umbral que parte el rango lanza ``_Eleccion`` con las dos mitades, así
+    cada dado se ramifica solo en los resultados que las reglas distinguen.
+    """
+
+    __slots__ = ("indice", "minimo", "maximo")
+
+    def __init__(self, indice: int, minimo: int, maximo: int):
+        self.indice = indice
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def _mayor_o_igual(self, umbral) -> bool:
+        if self.minimo >= umbral:
+            return True
+        if self.maximo < umbral:
+            return False
+        raise _Eleccion(self.indice, (
+            ((self.minimo, umbral - 1), (umbral - self.minimo) / CARAS_DADO),
+            ((umbral, self.maximo), (self.maximo - umbral + 1) / CARAS_DADO),
+        ))
+
+    def __ge__(self, umbral):
+        return self._mayor_o_igual(umbral)
+
+    def __lt__(self, umbral):
+        return not self._mayor_o_igual(umbral)
+
+    def __gt__(self, umbral):
+        return self._mayor_o_igual(umbral + 1)
+
+    def __le__(self, umbral):
+        return not self._mayor_o_igual(umbral + 1)
+
+
+class _Guion:
+    """
+    Fuente de azar que reproduce una secuencia de elecciones (``prefijo``) y
+    hace de ``Dados`` de los jugadores. Un dado fuera del guion se agrega con
+    el rango completo; un robo fuera del guion lanza ``_Eleccion``.
+    """
+
+    __slots__ = ("elecciones", "pos")
+
+    def __init__(self):
+        self.elecciones = []
+        self.pos = 0
+
+    def empezar(self, prefijo: tuple):
+        self.elecciones[:] = prefijo
+        self.pos = 0
+
+    def tirar(self) -> _Dado:
+        pos = self.pos
+        if pos == len(self.elecciones):
+            self.elecciones.append(((1, CARAS_DADO), 1.0))
+        self.pos = pos + 1
+        return _Dado(pos, *self.elecciones[pos][0])
+
+    def robar(self, resto: list, quedan: int) -> int:
+        """Clase de la próxima carta robada de un mazo con ``resto[clase]`` copias."""
+        pos = self.pos
+        if pos == len(self.elecciones):
+            raise _Eleccion(pos, tuple((c, n / quedan) for c, n in enumerate(resto) if n))
+        self.pos = pos + 1
+        return self.elecciones[pos][0]
+
+    def barajada(self, secuencia) -> list:
+        # El mazo restante es un multiconjunto: el orden lo deciden los robos
+        return list(secuencia)
+
+
+class _JugadorExacto(Jugador):
+    """``Jugador`` cuyo mazo restante es un conteo por clase de carta y cuyos robos salen del guion."""
+
+    __slots__ = ("clases", "resto", "quedan")
+
+    def __init__(self, nombre: str, clases: list, conteo: list, guion: _Guion):
+        super().__init__(nombre, [], {}, guion)
+        self.clases = clases
+        self.resto = list(conteo)
+        self.quedan = sum(conteo)
+
+    @property
+    def mazo(self) -> list:
+        return [carta for carta, n in zip(self.clases, self.resto) for _ in range(n)]
+
+    def cartas_en_mazo(self) -> int:
+        return self.quedan
+
+    def robar(self, cantidad=1):
+        for _ in range(cantidad):
+            if self.quedan:
+                c = self.dados.robar(self.resto, self.quedan)
+                self.resto[c] -= 1
+                self.quedan -= 1
+                self.mano[self._cursor] = self.clases[c]
+                self._cursor += 1
+
+    def sin_cartas(self):
+        return not self.quedan and not self.mano
+
+
+class ResultadoExacto:
+    """
+    Resultado de ``resolver_enfrentamiento``.
+
+    Atributos:
+        probabilidades (tuple): Probabilidad de cada resultado de ``GANADORES``.
+            Si la búsqueda no terminó es la cota inferior.
+        sin_resolver (float): Probabilidad de los estados que no entraron en la
+            tabla (0 si el resultado es exacto).
+        estados (int): Estados expandidos en la tabla de transposición.
+    """
+
+    def __init__(self, probabilidades, sin_resolver: float, estados: int):
+        self.probabilidades = tuple(probabilidades)
+        self.sin_resolver = sin_resolver
+        self.estados = estados
+
+    @property
+    def exacto(self) -> bool:
+        return self.sin_resolver == 0
+
+    def cotas(self) -> list:
+        """(inferior, superior) de cada resultado de ``GANADORES``."""
+        return [(p, min(1.0, p + self.sin_resolver)) for p in self.probabilidades]
+
+    def __repr__(self):
+        partes = ", ".join(
+            f"{g}: {100 * p:.4f}%" if self.exacto else f"{g}: {100 * p:.4f}-{100 * q:.4f}%"
+            for g, (p, q) in zip(GANADORES, self.cotas())
+        )
+        return f"ResultadoExacto({partes}, estados={self.estados})"
+
+
+class SolucionadorExacto:
+    """
+    Calcula las probabilidades exactas de victoria, derrota y empate de un
+    enfrentamiento bajo la política de ``simular_partida``.
+
+    Un estado son los contadores de ambos jugadores (vida, defensa, estados,
+    esquiva, suerte), su mano, su mazo restante, a quién le toca y el avance
+    del turno. Las jugadas se ejecutan con las mismas funciones del simulador
+    sobre jugadores cuyo azar sale de un guion, y cada robo y cada dado se
+    ramifican en los resultados que las reglas distinguen.
+
+    Estados equivalentes se unen antes de buscarlos en la tabla:
+
+    - Cartas con el mismo comportamiento (nivel, tipo, categoría y programa)
+      son la misma clase.
+    - El mazo restante es un conteo por clase: barajar y robar de a una carta
+      al azar es lo mismo que robar del multiconjunto.
+    - La mano conserva el orden de robo, del que depende el desempate de la
+      política, pero se ordena por nivel (estable) cuando eso no cambia ninguna
+      elección: la carta jugada es la primera de mayor nivel y el esquive, el
+      primero de la mano, así que basta con que los esquives tengan un solo nivel.
+
+    La probabilidad se propaga hacia adelante desde el inicio, expandiendo
+    primero el estado que acumula más probabilidad (ver ``resolver``). Cuando la
+    tabla llega a ``max_estados``, los estados nuevos quedan sin expandir y su
+    probabilidad se informa aparte: el resultado da cotas en lugar de valores
+    exactos, y como se expandió antes lo más probable, las cotas se estrechan a
+    medida que crece ``max_estados``.
+
+    Args:
+        mazo1, mazo2: Arreglos de ids de carta de cada jugador.
+        max_estados (int): Tope de estados en la tabla de transposición.
+    """
+
+    def __init__(self, mazo1, mazo2, max_estados: int = MAX_ESTADOS):
+        self.max_estados = max_estados
+        catalogo = obtener_catalogo()
+        clases = {}
+        representantes = []
+        conteos = []
+        for mazo in (mazo1, mazo2):
+            conteo = {}
+            for carta in catalogo.cartas_de(mazo):
+                clave = (
+                    carta.nivel, carta.tipo, carta.categoria, carta.codigo_principal,
+                    carta.programa if carta.programa is not None else carta.codigos,
+                )
+                if clave not in clases:
+                    clases[clave] = len(representantes)
+                    representantes.append(carta)
+                c = clases[clave]
+                conteo[c] = conteo.get(c, 0) + 1
+            conteos.append(conteo)
+        self._clase = {carta.id: i for i, carta in enumerate(representantes)}
+        self._nivel = [carta.nivel for carta in representantes]
+        self._esquive = [carta.codigo_principal in CODIGOS_ESQUIVE for carta in representantes]
+
+        self._guion = _Guion()
+        self._j1, self._j2 = (
+            _JugadorExacto(nombre, representantes, [conteo.get(c, 0) for c in range(len(representantes))], self._guion)
+            for nombre, conteo in zip(GANADORES, conteos)
+        )
+        self.inicial = self._estado_de(FASE_REPARTO, True, 0)
+        # Estado -> sucesores con su probabilidad (ver _expandir)
+        self.tabla = {}
+
+    # -- Estados ------------------------------------------------------------
+    def _mano_canonica(self, mano: tuple) -> tuple:
+        niveles_esquive = {self._nivel[c] for c in mano if self._esquive[c]}
+        if len(niveles_esquive) > 1:
+            return mano
+        return tuple(sorted(mano, key=lambda c: -self._nivel[c]))
+
+    def _estado_jugador(self, j: _JugadorExacto) -> tuple:
+        clase = self._clase
+        return (
+            j.vida, j.defensa, j.sangrado, j.fuego, j.congelado, j.paralizado, j.esquiva,
+            j.suerte_turnos, self._mano_canonica(tuple(clase[c.id] for c in j.mano.values())),
+            tuple(j.resto),
+        )
+
+    def _estado_de(self, fase: int, mueve_j1: bool, progreso) -> tuple:
+        return fase, mueve_j1, progreso, self._estado_jugador(self._j1), self._estado_jugador(self._j2)
+
+    @staticmethod
+    def _cargar(j: _JugadorExacto, estado: tuple):
+        (j.vida, j.defensa, j.sangrado, j.fuego, j.congelado, j.paralizado, j.esquiva,
+         j.suerte_turnos, mano, resto) = estado
+        j.mano.clear()
+        for i, c in enumerate(mano):
+            j.mano[i] = j.clases[c]
+        j._cursor = len(mano)
+        j.resto[:] = resto
+        j.quedan = sum(resto)
+        j.descartadas.clear()
+
+    # -- Transiciones -------------------------------------------------------
+    def _paso(self, estado: tuple) -> tuple:
+        """Ejecuta un paso desde ``estado`` con el azar del guion y devuelve el estado siguiente."""
+        fase, mueve_j1, progreso, e1, e2 = estado
+        j1, j2 = self._j1, self._j2
+        self._cargar(j1, e1)
+        self._cargar(j2, e2)
+        actual, oponente = (j1, j2) if mueve_j1 else (j2, j1)
+
+        if fase == FASE_REPARTO:
+            if progreso < 2 * CARTAS_INICIALES:
+                (j1 if progreso < CARTAS_INICIALES else j2).robar(1)
+                return self._estado_de(FASE_REPARTO, True, progreso + 1)
+            # Sorteo de quién empieza, como en simulador._simular_bloque
+            return self._estado_de(FASE_INICIO, self._guion.tirar() >= 5, None)
+
+        if fase == FASE_INICIO:
+            if not (j1.puede_continuar() and j2.puede_continuar()):
+                if j1.vida > j2.vida:
+                    return _FIN[0]
+                return _FIN[1] if j2.vida > j1.vida else _FIN[2]
+            actual.aplicar_efectos_de_estado()
+            if actual.salta_turno:
+                actual.terminar_turno()
+                return self._estado_de(FASE_INICIO, not mueve_j1, None)
+            return self._estado_de(FASE_JUGAR, mueve_j1, (0, 0, frozenset()))
+
+        # FASE_JUGAR: una carta del turno (ver simular_partida)
+        cartas_jugadas, nivel_total, categorias = progreso
+        pos = carta = None
+        if cartas_jugadas < MAX_CARTAS_TURNO:
+            pos, carta = elegir_carta(actual.mano, nivel_total, categorias)
+        if carta is None:
+            actual.terminar_turno()
+            return self._estado_de(FASE_INICIO, not mueve_j1, None)
+        exito = determinar_exito_carta(carta, actual)[0]
+        if exito:
+            if carta.categoria in CATEGORIAS_ATAQUE:
+                pos_esquive, carta_de_esquive = elegir_esquive(oponente.mano)
+                if carta_de_esquive is not None:
+                    fase_reaccion(carta, carta_de_esquive, actual, oponente, None, pos, pos_esquive,
+                                  registrar_eventos=False)
+                    return self._estado_de(FASE_JUGAR, mueve_j1, progreso)
+            aplicar_carta(carta, actual, oponente)
+            progreso = (cartas_jugadas + 1, nivel_total + carta.nivel, categorias | {carta.categoria})
+        actual.descartar(pos)
+        return self._estado_de(FASE_JUGAR, mueve_j1, progreso)
+
+    def _expandir(self, estado: tuple) -> list:
+        """
+        Sucesores de ``estado`` con su probabilidad. Cada resultado de azar que
+        decide algo en el paso se ramifica volviendo a ejecutarlo con el guion
+        correspondiente; los guiones que llevan al mismo estado se suman.
+        """
+        guion = self._guion
+        sucesores = {}
+        pendientes = [()]
+        while pendientes:
+            prefijo = pendientes.pop()
+            guion.empezar(prefijo)
+            try:
+                siguiente = self._paso(estado)
+            except _Eleccion as e:
+                # Las elecciones posteriores a la reemplazada se vuelven a descubrir
+                base = tuple(guion.elecciones[:e.indice])
+                pendientes.extend(base + (opcion,) for opcion in e.opciones)
+                continue
+            p = 1.0
+            for _, q in guion.elecciones:
+                p *= q
+            sucesores[siguiente] = sucesores.get(siguiente, 0.0) + p
+        return list(sucesores.items())
+
+    # -- Búsqueda -----------------------------------------------------------
+    def resolver(self, estado: tuple = None) -> tuple:
+        """
+        Vector (P1, P2, Empate, sin resolver) de ``estado`` (por defecto, el
+        inicio de la partida).
+
+        Reparte la probabilidad de ``estado`` entre sus sucesores hasta que
+        toda llega a un estado final. Los estados pendientes se atienden de
+        mayor a menor probabilidad acumulada, así los caminos más probables se
+        resuelven primero; la probabilidad que un estado recibe por varios
+        caminos se suma mientras espera, y la que llega a un estado ya
+        expandido sigue con sus sucesores guardados. El grafo de estados no
+        tiene ciclos (cada turno consume cartas del mazo o de la mano, o agota
+        un estado que hace perder el turno), así que el reparto termina.
+        """
+        estado = self.inicial if estado is None else estado
+        if estado in _CODIGO_FIN:
+            return tuple(float(i == _CODIGO_FIN[estado]) for i in range(len(GANADORES))) + (0.0,)
+        tabla = self.tabla
+        resultado = [0.0] * len(GANADORES)
+        sin_resolver = 0.0
+        pendientes = {estado: 1.0}
+        # Cola de prioridad por probabilidad (negada); las entradas viejas de un
+        # estado que siguió sumando se descartan al salir
+        cola = [(-1.0, 0, estado)]
+        orden = 1
+        while cola:
+            _, _, actual = heapq.heappop(cola)
+            masa = pendientes.pop(actual, None)
+            if masa is None:
+                continue
+            sucesores = tabla.get(actual)
+            if sucesores is None:
+                if len(tabla) >= self.max_estados:
+                    sin_resolver += masa
+                    continue
+                sucesores = tabla[actual] = self._expandir(actual)
+            for siguiente, p in sucesores:
+                codigo = _CODIGO_FIN.get(siguiente)
+                if codigo is not None:
+                    resultado[codigo] += masa * p
+                    continue
+                acumulada = pendientes.get(siguiente, 0.0) + masa * p
+                pendientes[siguiente] = acumulada
+                heapq.heappush(cola, (-acumulada, orden, siguiente))
+                orden += 1
+        return (*resultado, sin_resolver)
+
+
+def resolver_enfrentamiento(mazo1, mazo2, max_estados: int = MAX_ESTADOS) -> ResultadoExacto:
+    """
+    Probabilidades exactas de que gane cada jugador, o empaten, en una partida
+    entre ``mazo1`` y ``mazo2`` (ver ``SolucionadorExacto``).
+
+    Con mazos grandes el espacio de estados crece muy rápido: si no entra en
+    ``max_estados`` el resultado trae cotas (``ResultadoExacto.cotas``), tanto
+    más estrechas cuanto más grande sea ``max_estados``.
+    """
+    solucionador = SolucionadorExacto(mazo1, mazo2, max_estados)
+    *probabilidades, sin_resolver = solucionador.resolver()
+    return ResultadoExacto(probabilidades, sin_resolver, len(solucionador.tabla))
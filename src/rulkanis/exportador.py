@@ -0,0 +1,302 @@
+# exportador.py
+# -*- coding: utf-8 -*-
+# Escritura incremental de resultados: las filas de resumen y detalle se vuelcan
+# a disco en bloques de tamaño acotado mientras corre la simulación, así la
+# memoria no crece con el número de partidas.
+
+import csv
+import datetime
+import os
+from typing import TYPE_CHECKING
+
+from rulkanis.logger import COLUMNAS_RESUMEN, COLUMNAS_DETALLE
+
+# pandas se importa al escribir, no al importar el módulo
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Filas que se acumulan por tabla antes de volcarlas (un row group en Parquet)
+FILAS_POR_BLOQUE = 50_000
+# Filas de datos por hoja de Excel (1.048.576 menos el encabezado)
+MAX_FILAS_EXCEL = 1_048_575
+
+TABLAS = {"resumen": COLUMNAS_RESUMEN, "detalle": COLUMNAS_DETALLE}
+# "Dado" de las jugadas de cartas que no tiran dado. En el DataFrame y en Parquet
+# la columna es entera y queda vacía; CSV y Excel escriben este texto.
+SIN_DADO = "-"
+
+
+def _detalle_con_sin_dado(df: "pd.DataFrame") -> "pd.DataFrame":
+    """``df`` de detalle con ``SIN_DADO`` en "Dado" de las jugadas (filas con "Nivel") sin tirada."""
+    sin_dado = df["Dado"].isna() & df["Nivel"].notna()
+    if not sin_dado.any():
+        return df
+    return df.assign(Dado=df["Dado"].astype(object).mask(sin_dado, SIN_DADO))
+
+
+def _fila_con_sin_dado(fila: dict) -> dict:
+    if fila.get("Dado") is None and fila.get("Nivel") is not None:
+        return {**fila, "Dado": SIN_DADO}
+    return fila
+
+
+class EscritorResultados:
+    """
+    Base de los escritores incrementales.
+
+    Recibe filas de las tablas "resumen" y "detalle" con las mismas columnas que
+    los DataFrames de ``simular_varias_partidas``. Las filas se acumulan por
+    tabla y se vuelcan cada ``filas_por_bloque`` filas. Se usa como context
+    manager o llamando a ``cerrar()`` al final.
+    """
+
+    extension = ""
+
+    def __init__(self, filas_por_bloque: int = FILAS_POR_BLOQUE):
+        self.filas_por_bloque = filas_por_bloque
+        self._buffers = {t: [] for t in TABLAS}
+        self.filas_escritas = {t: 0 for t in TABLAS}
+
+    def _rutas_en(self, directorio: str) -> dict:
+        """Crea ``directorio`` y devuelve la ruta ``<tabla>.<ext>`` de cada tabla."""
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        return {t: os.path.join(directorio, f"{t}.{self.extension}") for t in TABLAS}
+
+    def escribir(self, tabla: str, filas):
+        """
+        Agrega filas a una tabla.
+
+        Args:
+            tabla (str): "resumen" o "detalle".
+            filas (list | pd.DataFrame): Filas como dicts (las claves faltantes
+                quedan vacías) o un DataFrame con las columnas de la tabla.
+        """
+        import pandas as pd
+
+        buffer = self._buffers[tabla]
+        if isinstance(filas, pd.DataFrame):
+            self._vaciar(tabla)
+            self._volcar_df(tabla, filas.reindex(columns=TABLAS[tabla]))
+            self.filas_escritas[tabla] += len(filas)
+            return
+        buffer.extend(filas)
+        if len(buffer) >= self.filas_por_bloque:
+            self._vaciar(tabla)
+
+    def _vaciar(self, tabla: str):
+        buffer = self._buffers[tabla]
+        if buffer:
+            self._volcar_filas(tabla, buffer)
+            self.filas_escritas[tabla] += len(buffer)
+            buffer.clear()
+
+    def cerrar(self):
+        """Vuelca las filas pendientes y cierra los archivos."""
+        for tabla in TABLAS:
+            self._vaciar(tabla)
+        self._cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _volcar_filas(self, tabla: str, filas: list):
+        raise NotImplementedError
+
+    def _volcar_df(self, tabla: str, df: "pd.DataFrame"):
+        raise NotImplementedError
+
+    def _cerrar(self):
+        pass
+
+
+class EscritorCSV(EscritorResultados):
+    """
+    Escribe ``resumen.csv`` y ``detalle.csv`` (UTF-8) dentro de ``directorio``,
+    agregando filas al final de cada archivo. "Dado" vale ``SIN_DADO`` en las
+    jugadas sin tirada.
+    """
+
+    extension = "csv"
+
+    def __init__(self, directorio: str, filas_por_bloque: int = FILAS_POR_BLOQUE):
+        super().__init__(filas_por_bloque)
+        self.rutas = self._rutas_en(directorio)
+        self._archivos = {}
+        self._writers = {}
+        for tabla, columnas in TABLAS.items():
+            f = open(self.rutas[tabla], "w", newline="", encoding="utf-8")
+            self._archivos[tabla] = f
+            self._writers[tabla] = csv.DictWriter(f, fieldnames=columnas, extrasaction="ignore")
+            self._writers[tabla].writeheader()
+
+    def _volcar_filas(self, tabla: str, filas: list):
+        if tabla == "detalle":
+            filas = map(_fila_con_sin_dado, filas)
+        self._writers[tabla].writerows(filas)
+
+    def _volcar_df(self, tabla: str, df: "pd.DataFrame"):
+        if tabla == "detalle":
+            df = _detalle_con_sin_dado(df)
+        df.to_csv(self._archivos[tabla], header=False, index=False)
+
+    def _cerrar(self):
+        for f in self._archivos.values():
+            f.close()
+
+
+class EscritorParquet(EscritorResultados):
+    """
+    Escribe ``resumen.parquet`` y ``detalle.parquet`` dentro de ``directorio``,
+    un row group por volcado. Requiere pyarrow.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, directorio: str, filas_por_bloque: int = FILAS_POR_BLOQUE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "La exportación a Parquet requiere pyarrow (pip install pyarrow)"
+            ) from None
+        super().__init__(filas_por_bloque)
+        self.rutas = self._rutas_en(directorio)
+        self._pa = pa
+        entero, texto = pa.int64(), pa.string()
+        tipos = {
+            "Partida": entero, "Turno": entero, "Nivel": entero,
+            "Vida Jugador 1": entero, "Defensa J1": entero,
+            "Vida Jugador 2": entero, "Defensa J2": entero,
+            "Vida J1": entero, "Vida J2": entero, "Dado": entero,
+            "SaltaTurno": pa.bool_(),
+        }
+        self._esquemas = {
+            tabla: pa.schema([(c, tipos.get(c, texto)) for c in columnas])
+            for tabla, columnas in TABLAS.items()
+        }
+        self._writers = {
+            tabla: pq.ParquetWriter(self.rutas[tabla], esquema)
+            for tabla, esquema in self._esquemas.items()
+        }
+
+    def _volcar_filas(self, tabla: str, filas: list):
+        self._writers[tabla].write_table(
+            self._pa.Table.from_pylist(filas, schema=self._esquemas[tabla])
+        )
+
+    def _volcar_df(self, tabla: str, df: "pd.DataFrame"):
+        self._writers[tabla].write_table(
+            self._pa.Table.from_pandas(df, preserve_index=False).cast(self._esquemas[tabla])
+        )
+
+    def _cerrar(self):
+        for w in self._writers.values():
+            w.close()
+
+
+class EscritorExcel(EscritorResultados):
+    """
+    Escribe el libro de resultados con openpyxl en modo ``write_only``: las filas
+    van directo a disco sin armar el libro en memoria.
+
+    El libro tiene la hoja "Resumen" (el resumen final, ver ``escribir_resumen``)
+    y el detalle en "Detalle", que continúa en "Detalle_2", "Detalle_3", … al
+    llenarse cada hoja ("Dado" vale ``SIN_DADO`` en las jugadas sin tirada). El
+    resumen por partida no se escribe en el Excel.
+
+    Si al guardar el archivo está abierto en otro programa (``PermissionError``),
+    se guarda como ``<nombre>_<fecha_hora>.xlsx``; ``ruta`` queda con el archivo
+    efectivamente escrito y ``ruta_alternativa`` en True.
+    """
+
+    extension = "xlsx"
+
+    def __init__(
+        self,
+        ruta: str = "resultados_simulacion.xlsx",
+        filas_por_bloque: int = FILAS_POR_BLOQUE,
+        max_filas_hoja: int = MAX_FILAS_EXCEL,
+    ):
+        from openpyxl import Workbook
+
+        super().__init__(filas_por_bloque)
+        self.ruta = ruta
+        self.ruta_alternativa = False
+        self.max_filas_hoja = max_filas_hoja
+        self._libro = Workbook(write_only=True)
+        self._hoja_resumen = self._libro.create_sheet("Resumen")
+        self._hojas_detalle = 0
+        self._filas_hoja = 0
+        self._nueva_hoja_detalle()
+
+    def _nueva_hoja_detalle(self):
+        self._hojas_detalle += 1
+        nombre = "Detalle" if self._hojas_detalle == 1 else f"Detalle_{self._hojas_detalle}"
+        self._hoja_detalle = self._libro.create_sheet(nombre)
+        self._hoja_detalle.append(COLUMNAS_DETALLE)
+        self._filas_hoja = 0
+
+    def escribir(self, tabla: str, filas):
+        if tabla == "detalle":
+            super().escribir(tabla, filas)
+
+    def escribir_resumen(self, df: "pd.DataFrame"):
+        """Escribe el resumen final en la hoja "Resumen"."""
+        self._hoja_resumen.append(list(df.columns))
+        for fila in _filas_excel(df):
+            self._hoja_resumen.append(fila)
+
+    def _agregar_detalle(self, filas):
+        for fila in filas:
+            if self._filas_hoja >= self.max_filas_hoja:
+                self._nueva_hoja_detalle()
+            self._hoja_detalle.append(fila)
+            self._filas_hoja += 1
+
+    def _volcar_filas(self, tabla: str, filas: list):
+        self._agregar_detalle(
+            [f.get(c) for c in COLUMNAS_DETALLE] for f in map(_fila_con_sin_dado, filas)
+        )
+
+    def _volcar_df(self, tabla: str, df: "pd.DataFrame"):
+        self._agregar_detalle(_filas_excel(_detalle_con_sin_dado(df)))
+
+    def _cerrar(self):
+        try:
+            self._libro.save(self.ruta)
+        except PermissionError:
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            base, ext = os.path.splitext(self.ruta)
+            self.ruta = f"{base}_{ts}{ext}"
+            self.ruta_alternativa = True
+            self._libro.save(self.ruta)
+
+
+def _filas_excel(df: "pd.DataFrame"):
+    """Recorre las filas de ``df`` como listas de valores de Python, con None en los vacíos."""
+    columnas = [
+        df[c].astype(object).where(df[c].notna(), None).tolist() for c in df.columns
+    ]
+    return zip(*columnas)
+
+
+ESCRITORES = {"csv": EscritorCSV, "parquet": EscritorParquet}
+
+
+def abrir_escritor(directorio: str, formato: str = "parquet", **kwargs) -> EscritorResultados:
+    """
+    Crea el escritor incremental para ``formato`` ("csv" o "parquet").
+
+    Raises:
+        ValueError: Si el formato no existe.
+    """
+    try:
+        clase = ESCRITORES[formato]
+    except KeyError:
+        raise ValueError(f"Formato desconocido: '{formato}' (opciones: {', '.join(ESCRITORES)})") from None
+    return clase(directorio, **kwargs)
@@ -1,33 +1,82 @@
-import random
+from .azar import Dados
 from .logger import EventLogger
+from .eventos import EV_SANGRADO, EV_FUEGO_DEFENSA, EV_FUEGO_VIDA, EV_CONGELADO, EV_PARALIZADO
+from .reglas import TURNOS_SUERTE, UMBRAL_AZAR, UMBRAL_AZAR_SUERTE, VIDA_INICIAL
 
 class Jugador:
-    def __init__(self, nombre: str, mazo_cartas: list, origen_set: dict):
+    """
+    Estado de un jugador durante una partida.
+
+    El objeto se crea una vez por mazo y se reutiliza entre partidas con
+    ``reiniciar``: el mazo barajado vive en un buffer propio que se rebaraja en
+    el lugar, robar avanza un cursor y la mano es un dict ``posición -> carta``
+    (en orden de robo) que permite descartar en O(1).
+
+    El azar (barajado y dados) sale de ``dados``; en la simulación ambos
+    jugadores comparten el mismo objeto ``Dados``, que se resiembra por partida.
+    """
+
+    __slots__ = (
+        "nombre", "origen_set", "dados", "_base", "_orden", "_cursor", "mano", "descartadas",
+        "vida", "suerte_turnos", "salta_turno",
+        "defensa", "sangrado", "fuego", "congelado", "paralizado", "esquiva",
+    )
+
+    def __init__(self, nombre: str, mazo_cartas: list, origen_set: dict, dados: Dados = None):
         self.nombre = nombre
-        self.mazo = list(mazo_cartas)
-        random.shuffle(self.mazo)
         self.origen_set = origen_set
-        self.mano: list = []
-        self.vida = 15
-        self.suerte_turnos = 0
+        self.dados = dados if dados is not None else Dados()
+        self._base = mazo_cartas
+        self._orden = list(mazo_cartas)
+        self.mano: dict = {}
         self.descartadas: list = []
-        self.salta_turno: bool = False
-        self.estado = {
-            "defensa": 0,
-            "sangrado": 0,
-            "fuego": 0,
-            "congelado": 0,
-            "paralizado": 0,
-            "esquiva": False
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Deja al jugador listo para una nueva partida con el mazo rebarajado."""
+        self._orden[:] = self.dados.barajada(self._base)
+        self._cursor = 0
+        self.mano.clear()
+        self.descartadas.clear()
+        self.vida = VIDA_INICIAL
+        self.suerte_turnos = 0
+        self.salta_turno = False
+        self.defensa = 0
+        self.sangrado = 0
+        self.fuego = 0
+        self.congelado = 0
+        self.paralizado = 0
+        self.esquiva = False
+
+    @property
+    def mazo(self) -> list:
+        """Cartas que quedan por robar, en orden."""
+        return self._orden[self._cursor:]
+
+    @property
+    def estado(self) -> dict:
+        """Copia de los estados del jugador (solo lectura)."""
+        return {
+            "defensa": self.defensa,
+            "sangrado": self.sangrado,
+            "fuego": self.fuego,
+            "congelado": self.congelado,
+            "paralizado": self.paralizado,
+            "esquiva": self.esquiva,
         }
 
+    def cartas_en_mazo(self) -> int:
+        return len(self._orden) - self._cursor
+
     def robar(self, cantidad=1):
+        orden = self._orden
         for _ in range(cantidad):
-            if self.mazo:
-                self.mano.append(self.mazo.pop(0))
+            if self._cursor < len(orden):
+                self.mano[self._cursor] = orden[self._cursor]
+                self._cursor += 1
 
     def activar_suerte(self):
-        self.suerte_turnos = 4
+        self.suerte_turnos = TURNOS_SUERTE
 
     def tiene_suerte(self):
         return self.suerte_turnos > 0
@@ -36,65 +85,71 @@ class Jugador:
         return self.vida > 0
 
     def sin_cartas(self):
-        return not self.mazo and not self.mano
-    
+        return self._cursor >= len(self._orden) and not self.mano
+
     def puede_continuar(self):
-        return self.esta_vivo() and not self.sin_cartas()
-    
+        return self.vida > 0 and not self.sin_cartas()
+
     def lanzar_dado(self):
-        return random.randint(1, 10)
+        return self.dados.tirar()
 
     def terminar_turno(self):
         self.robar(1)
         self.actualizar_estados()
 
-    def descartar(self, carta):
-        if carta in self.mano:
-            self.mano.remove(carta)
-            self.descartadas.append(carta)
-        else:
-            raise ValueError("Carta no está en la mano")
+    def descartar(self, posicion: int):
+        """Descarta la carta robada en ``posicion`` (clave de ``mano``) y la devuelve."""
+        try:
+            carta = self.mano.pop(posicion)
+        except KeyError:
+            raise ValueError("Carta no está en la mano") from None
+        self.descartadas.append(carta)
+        return carta
 
     def actualizar_estados(self):
         if self.suerte_turnos > 0:
             self.suerte_turnos -= 1
 
-    def aplicar_efectos_de_estado(self, event_logger: EventLogger):
+    def aplicar_efectos_de_estado(self, event_logger: EventLogger = None):
+        """Aplica los estados al inicio del turno. Sin ``event_logger`` no registra eventos."""
         self.salta_turno = False
         # Sangrado
-        if self.estado.get("sangrado",0) > 0:
+        if self.sangrado > 0:
             self.vida -= 1
-            self.estado["sangrado"] -= 1
-            event_logger.log_event("Sangrado: -1 vida")
+            self.sangrado -= 1
+            if event_logger is not None:
+                event_logger.log_event((EV_SANGRADO,))
 
         # Fuego
-        if self.estado.get("fuego",0) > 0:
-            if self.estado["defensa"] > 0:
-                self.estado["defensa"] -= 1
-                event_logger.log_event("Fuego: -1 defensa")
+        if self.fuego > 0:
+            if self.defensa > 0:
+                self.defensa -= 1
+                if event_logger is not None:
+                    event_logger.log_event((EV_FUEGO_DEFENSA,))
             else:
                 self.vida -= 1
-                event_logger.log_event("Fuego: -1 vida")
-            self.estado["fuego"] -= 1
+                if event_logger is not None:
+                    event_logger.log_event((EV_FUEGO_VIDA,))
+            self.fuego -= 1
 
         # Congelar
-        if self.estado.get("congelado",0) > 0:
-            self.estado["congelado"] -= 1
-            event_logger.log_event("Congelado: pierde turno")
+        if self.congelado > 0:
+            self.congelado -= 1
+            if event_logger is not None:
+                event_logger.log_event((EV_CONGELADO,))
             self.salta_turno = True
 
         # Paralizar (siempre chequeamos, no es elif de congelado)
-        if self.estado.get("paralizado", 0) > 0:
+        if self.paralizado > 0:
             # umbral cambia si tiene suerte activada
-            limite = 4 if self.tiene_suerte() else 6
+            limite = UMBRAL_AZAR_SUERTE if self.suerte_turnos > 0 else UMBRAL_AZAR
             d = self.lanzar_dado()
             if d < limite:
-                event_logger.log_event(f"Paralizado: dado {d} (<{limite}), pierde turno")
                 self.salta_turno = True
-            else:
-                event_logger.log_event(f"Paralizado: dado {d} (≥{limite}), puede jugar")
-            self.estado["paralizado"] -= 1
+            if event_logger is not None:
+                event_logger.log_event((EV_PARALIZADO, d, limite, d < limite))
+            self.paralizado -= 1
 
 
     def __str__(self):
-        return f"{self.nombre} (Vida: {self.vida}, Cartas en mazo: {len(self.mazo)})"
\ No newline at end of file
+        return f"{self.nombre} (Vida: {self.vida}, Cartas en mazo: {self.cartas_en_mazo()})"
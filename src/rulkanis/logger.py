@@ -1,12 +1,50 @@
+from array import array
 from .carta import Carta
-from typing import Protocol
+from .eventos import (
+    renderizar_evento,
+    renderizar_eventos,
+    FORMATO_INICIO_TURNO,
+    FORMATO_REACCION,
+    FORMATO_JUGADA,
+)
+from typing import Protocol, TYPE_CHECKING
+
+# numpy y pandas se importan al construir DataFrames o recodificar bloques, así
+# registrar eventos durante la partida no los necesita.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Niveles de registro de simular_varias_partidas, de menor a mayor detalle:
+#   ninguno:  solo se cuentan victorias, sin trabajo por evento
+#   resumen:  además una fila de resumen por partida
+#   turno:    además filas de detalle por turno/jugada (sin texto de eventos)
+#   completo: además los eventos de cada fila
+NIVELES_LOG = {"ninguno": 0, "resumen": 1, "turno": 2, "completo": 3}
+LOG_NINGUNO, LOG_RESUMEN, LOG_TURNO, LOG_COMPLETO = 0, 1, 2, 3
+
+# Columnas de las tablas de resultados, en el orden en que se exportan
+COLUMNAS_RESUMEN = ["Partida", "Ganador", "Vida Jugador 1", "Defensa J1", "Vida Jugador 2", "Defensa J2"]
+COLUMNAS_DETALLE = [
+    "Partida", "Turno", "Jugador", "Fase", "Evento", "SaltaTurno",
+    "Vida J1", "Defensa J1", "Vida J2", "Defensa J2",
+    "Carta", "Nivel", "Tipo", "Dado", "Resultado",
+]
+
+
+def nivel_log(nombre: str) -> int:
+    """Convierte el nombre de un nivel de registro a su valor numérico."""
+    try:
+        return NIVELES_LOG[nombre]
+    except KeyError:
+        raise ValueError(
+            f"Nivel de log desconocido: '{nombre}' (opciones: {', '.join(NIVELES_LOG)})"
+        ) from None
 
 class JugadorProtocol(Protocol):
     nombre: str
     vida: int
-    estado: dict
-    mazo: list
-    mano: list
+    defensa: int
+    mano: dict
     suerte_turnos: int
     descartadas: list
     salta_turno: bool
@@ -19,18 +57,197 @@ class JugadorProtocol(Protocol):
 
 
 class EventLogger:
+    """Acumula eventos estructurados ``(código, *args)``; el texto se genera al leerlos."""
+
     def __init__(self):
         self.events = []
     
-    def log_event(self, event: str):
+    def log_event(self, event: tuple):
         self.events.append(event)
 
+    def vaciar(self) -> tuple:
+        """Devuelve los eventos acumulados y deja el logger vacío para reutilizarlo."""
+        eventos = tuple(self.events)
+        self.events.clear()
+        return eventos
+
     def get_event_log(self, separator: str = " | "):
-        return separator.join(self.events)
+        return separator.join(renderizar_evento(e) for e in self.events)
     
     def print_events(self):
         for event in self.events:
-            print(event)
+            print(renderizar_evento(event))
+
+
+class RegistroDetalle:
+    """
+    Almacén columnar de las filas de detalle.
+
+    Cada columna numérica es un ``array`` tipado que crece al agregar filas y se
+    entrega a pandas como vista NumPy (``np.frombuffer``), sin copiar ni crear un
+    dict por fila. Las columnas de texto (Jugador, Fase, Carta, Tipo, Resultado)
+    se guardan como códigos sobre un diccionario y salen como ``Categorical``.
+    En las columnas nulables (SaltaTurno, Nivel, Dado) -1 marca el valor vacío;
+    "Dado" queda vacío también cuando la carta no tira dado.
+    """
+
+    __slots__ = (
+        "_partida", "_turno", "_vida1", "_defensa1", "_vida2", "_defensa2",
+        "_salta", "_nivel", "_dado", "_codigos", "_diccionarios", "eventos",
+    )
+
+    # Columna -> typecode de ``array``
+    ENTERAS = {
+        "Partida": "i", "Turno": "i",
+        "Vida J1": "h", "Defensa J1": "h", "Vida J2": "h", "Defensa J2": "h",
+    }
+    NULABLES = {"SaltaTurno": "b", "Nivel": "b", "Dado": "b"}
+    CODIFICADAS = ("Jugador", "Fase", "Carta", "Tipo", "Resultado")
+    TIPO_CODIGO = "h"
+
+    def __init__(self):
+        self._partida, self._turno, self._vida1, self._defensa1, self._vida2, self._defensa2 = (
+            array(t) for t in self.ENTERAS.values()
+        )
+        self._salta, self._nivel, self._dado = (array(t) for t in self.NULABLES.values())
+        self._codigos = tuple(array(self.TIPO_CODIGO) for _ in self.CODIFICADAS)
+        self._diccionarios = tuple({} for _ in self.CODIFICADAS)
+        self.eventos: list = []
+
+    def __len__(self):
+        return len(self._partida)
+
+    def _columnas(self) -> dict:
+        return dict(
+            zip(
+                (*self.ENTERAS, *self.NULABLES),
+                (
+                    self._partida, self._turno, self._vida1, self._defensa1, self._vida2,
+                    self._defensa2, self._salta, self._nivel, self._dado,
+                ),
+            )
+        )
+
+    def agregar(
+        self,
+        partida: int,
+        turno: int,
+        jugador: str,
+        fase,
+        evento,
+        salta_turno,
+        j1: JugadorProtocol,
+        j2: JugadorProtocol,
+        carta: str = None,
+        nivel: int = None,
+        tipo: str = None,
+        dado=None,
+        resultado: str = None,
+    ):
+        """
+        Agrega una fila. Los valores ``None`` quedan vacíos; ``dado`` que no sea
+        entero (p. ej. "-") también.
+        """
+        self._partida.append(partida)
+        self._turno.append(turno)
+        self._vida1.append(j1.vida)
+        self._defensa1.append(j1.defensa)
+        self._vida2.append(j2.vida)
+        self._defensa2.append(j2.defensa)
+        self._salta.append(-1 if salta_turno is None else salta_turno)
+        self._nivel.append(-1 if nivel is None else nivel)
+        self._dado.append(dado if dado.__class__ is int else -1)
+        self.eventos.append(evento)
+
+        cod_jugador, cod_fase, cod_carta, cod_tipo, cod_resultado = self._codigos
+        dic_jugador, dic_fase, dic_carta, dic_tipo, dic_resultado = self._diccionarios
+        cod_jugador.append(dic_jugador.setdefault(jugador, len(dic_jugador)))
+        cod_fase.append(-1 if fase is None else dic_fase.setdefault(fase, len(dic_fase)))
+        cod_carta.append(-1 if carta is None else dic_carta.setdefault(carta, len(dic_carta)))
+        cod_tipo.append(-1 if tipo is None else dic_tipo.setdefault(tipo, len(dic_tipo)))
+        cod_resultado.append(
+            -1 if resultado is None else dic_resultado.setdefault(resultado, len(dic_resultado))
+        )
+
+    def extender(self, otro: "RegistroDetalle"):
+        """Agrega al final todas las filas de ``otro``, recodificando sus textos."""
+        import numpy as np
+
+        for destino, origen in zip(self._columnas().values(), otro._columnas().values()):
+            destino.extend(origen)
+        self.eventos.extend(otro.eventos)
+        for codigos, dic, cod_otro, dic_otro in zip(
+            self._codigos, self._diccionarios, otro._codigos, otro._diccionarios
+        ):
+            mapa = [dic.setdefault(valor, len(dic)) for valor in dic_otro]
+            if mapa == list(range(len(mapa))):
+                codigos.extend(cod_otro)
+                continue
+            mapa = np.array(mapa + [-1], dtype=self.TIPO_CODIGO)
+            # El código -1 (vacío) indexa el último elemento del mapa, que es -1
+            codigos.frombytes(mapa[np.frombuffer(cod_otro, dtype=self.TIPO_CODIGO)].tobytes())
+
+    def recortar(self, ultima_partida: int):
+        """Descarta las filas de las partidas posteriores a ``ultima_partida``."""
+        import numpy as np
+
+        partidas = np.frombuffer(self._partida, dtype=self._partida.typecode)
+        n = int(np.searchsorted(partidas, ultima_partida, side="right"))
+        del partidas
+        for columna in (*self._columnas().values(), *self._codigos):
+            del columna[n:]
+        del self.eventos[n:]
+
+    def a_dataframe(self, renderizar: bool = True) -> "pd.DataFrame":
+        """
+        Construye el DataFrame de detalle con las columnas de ``COLUMNAS_DETALLE``.
+
+        Las columnas numéricas son vistas sobre los buffers del registro, así que
+        el registro no debe recibir más filas mientras el DataFrame esté vivo.
+
+        Args:
+            renderizar (bool): Si es True, "Evento" se convierte a texto con
+                ``renderizar_eventos``; si no, conserva las tuplas estructuradas.
+        """
+        import numpy as np
+        import pandas as pd
+
+        datos = {}
+        for nombre, columna in self._columnas().items():
+            valores = np.frombuffer(columna, dtype=columna.typecode)
+            if nombre == "SaltaTurno":
+                valores = pd.arrays.BooleanArray(valores == 1, valores < 0)
+            elif nombre in self.NULABLES:
+                valores = pd.arrays.IntegerArray(valores, valores < 0)
+            datos[nombre] = valores
+        for nombre, codigos, dic in zip(self.CODIFICADAS, self._codigos, self._diccionarios):
+            datos[nombre] = pd.Categorical.from_codes(
+                np.frombuffer(codigos, dtype=self.TIPO_CODIGO), categories=list(dic)
+            )
+        if renderizar:
+            jugadores = datos["Jugador"]
+            datos["Evento"] = [renderizar_eventos(e, j) for e, j in zip(self.eventos, jugadores)]
+        else:
+            datos["Evento"] = self.eventos
+        return pd.DataFrame(datos, columns=COLUMNAS_DETALLE, copy=False)
+
+    def __reduce__(self):
+        # Pickle compacto para devolver bloques desde los procesos del pool
+        return _registro_desde_estado, (
+            tuple(self._columnas().values()), self._codigos, self._diccionarios, self.eventos,
+        )
+
+
+def _registro_desde_estado(columnas, codigos, diccionarios, eventos) -> RegistroDetalle:
+    registro = RegistroDetalle.__new__(RegistroDetalle)
+    (
+        registro._partida, registro._turno, registro._vida1, registro._defensa1,
+        registro._vida2, registro._defensa2, registro._salta, registro._nivel, registro._dado,
+    ) = columnas
+    registro._codigos = codigos
+    registro._diccionarios = diccionarios
+    registro.eventos = eventos
+    return registro
 
 
 class Logger:
@@ -42,6 +259,7 @@ class Logger:
         fase: str,
         j1: JugadorProtocol,
         j2: JugadorProtocol,
+        detalle: RegistroDetalle = None,
     ):
         self.partida = partida
         self.turno = turno
@@ -50,7 +268,7 @@ class Logger:
         self.j1 = j1
         self.j2 = j2
         self.evento: EventLogger = EventLogger()
-        self.detalle: list = []
+        self.detalle: RegistroDetalle = detalle if detalle is not None else RegistroDetalle()
 
 
     def actualizar_campos(self, campos: dict):
@@ -61,58 +279,22 @@ class Logger:
                 raise KeyError(f"El campo '{key}' no existe en la clase Logger.")
 
     def log_inicio_turno(self, saltar: bool):
-        
-        self.detalle.append(
-            {
-                "Partida": self.partida,
-                "Turno": self.turno,
-                "Jugador": self.jugador,
-                "Fase": "InicioTurno",
-                "Evento": self.evento.get_event_log(separator="; ") or "—",
-                "SaltaTurno": saltar,
-                "Vida J1": self.j1.vida,
-                "Defensa J1": self.j1.estado["defensa"],
-                "Vida J2": self.j2.vida,
-                "Defensa J2": self.j2.estado["defensa"]
-            }
+        self.detalle.agregar(
+            self.partida, self.turno, self.jugador, "InicioTurno",
+            (FORMATO_INICIO_TURNO, self.evento.vaciar()), saltar, self.j1, self.j2,
         )
-        self.evento = EventLogger()  # Reiniciar el evento para el siguiente turno
 
     def log_reaccion(self, resultado: str, carta: Carta):
-        self.detalle.append(
-            {
-                "Partida": self.partida,
-                "Turno": self.turno,
-                "Jugador": self.jugador,
-                "Carta": carta.nombre,
-                "Fase": "Reaccion",
-                "Resultado": resultado,
-                "Evento": self.evento.get_event_log(),
-                "Vida J1": self.j1.vida,
-                "Defensa J1": self.j1.estado["defensa"],
-                "Vida J2": self.j2.vida,
-                "Defensa J2": self.j2.estado["defensa"]
-            }
+        self.detalle.agregar(
+            self.partida, self.turno, self.jugador, "Reaccion",
+            (FORMATO_REACCION, self.evento.vaciar()), None, self.j1, self.j2,
+            carta=carta.nombre, resultado=resultado,
         )
-        self.evento = EventLogger()  # Reiniciar el evento para el siguiente turno
 
     def log_fin_jugada(self, carta: Carta, dado: int, resultado: str):
-        
-        self.detalle.append(
-            {
-                "Partida": self.partida,
-                "Turno": self.turno,
-                "Jugador": self.jugador,
-                "Carta": carta.nombre,
-                "Nivel": carta.nivel,
-                "Tipo": carta.tipo,
-                "Dado": dado,
-                "Resultado": resultado,
-                "Evento": " | " + self.evento.get_event_log(separator=" & "),
-                "Vida J1": self.j1.vida,
-                "Defensa J1": self.j1.estado["defensa"],
-                "Vida J2": self.j2.vida,
-                "Defensa J2": self.j2.estado["defensa"]
-            }
+        self.detalle.agregar(
+            self.partida, self.turno, self.jugador, None,
+            (FORMATO_JUGADA, self.evento.vaciar()), None, self.j1, self.j2,
+            carta=carta.nombre, nivel=carta.nivel, tipo=carta.tipo, dado=dado,
+            resultado=resultado,
         )
-        self.evento = EventLogger()  # Reiniciar el evento para el siguiente turno
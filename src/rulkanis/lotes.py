@@ -0,0 +1,299 @@
+# lotes.py
+# -*- coding: utf-8 -*-
+# Corridas por lotes sin interacción: lee un archivo de trabajos (TOML o JSON)
+# con muchos enfrentamientos y los juega todos en un mismo proceso, con el
+# catálogo de cartas y el pool de procesos compartidos entre trabajos.
+#
+#   python -m rulkanis.lotes trabajos.toml [-o resultados] [--workers 4]
+#
+# Ejemplo de archivo de trabajos:
+#
+#   [por_defecto]                 # valores de todos los trabajos
+#   repeticiones = 10000
+#   motor = "clasico"             # "clasico" o "vectorizado"
+#   workers = 4
+#   formato = "parquet"           # "parquet", "csv", "excel" o "ninguno"
+#   nivel_log = "ninguno"
+#   seed = 1
+#   limite = 3600                 # segundos por trabajo; se resume lo ya jugado
+#   checkpoint = true             # puntos de control en <salida>/<nombre>.checkpoint
+#
+#   [[trabajos]]
+#   nombre = "karsuk_vs_aleatorio"
+#   repeticiones = 50000          # cualquier valor de por_defecto se puede cambiar
+#   jugador1 = { sets = ["Karsuk Jairuk", "Karsuk Jairuk", "Uke Gajur", "Uke Gajur", "Exilte Naor"], extras = ["BVG", 122] }
+#   jugador2 = { aleatorio = 7 }  # mazo de construir_mazo_random con esa semilla
+#
+# ``sets`` es la lista del set de cada pieza en el orden de ``mazo.PIEZAS`` o un
+# dict pieza -> set; ``extras`` son ids o nomenclaturas de cartas del catálogo.
+# En JSON el archivo tiene la misma estructura.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.logger import NIVELES_LOG
+from rulkanis.mazo import PIEZAS, construir_mazo_equipamiento, construir_mazo_random
+from rulkanis.simulador import simular_varias_partidas
+from rulkanis.torneo import SETS
+
+DIRECTORIO_SALIDA = "resultados_lotes"
+ARCHIVO_RESUMEN = "resumen_trabajos.csv"
+FORMATOS = ("parquet", "csv", "excel", "ninguno")
+MOTORES = ("clasico", "vectorizado")
+# Nombre de trabajo: se usa como nombre de archivo dentro de la salida, así que
+# no puede tener separadores de ruta ni empezar con "."
+PATRON_NOMBRE = re.compile(r"\w[\w.\- ]*")
+# Opciones de un trabajo y su valor si no están ni en el trabajo ni en por_defecto
+OPCIONES = {
+    "repeticiones": 1000,
+    "motor": "clasico",
+    "workers": 1,
+    "formato": "ninguno",
+    "nivel_log": "ninguno",
+    "seed": None,
+    "precision": None,
+    "confianza": 0.95,
+    "limite": None,
+    "checkpoint": False,
+}
+
+
+def cargar_trabajos(ruta: str) -> dict:
+    """Lee un archivo de trabajos en TOML (``.toml``) o JSON (cualquier otra extensión)."""
+    if ruta.endswith(".toml"):
+        with open(ruta, "rb") as f:
+            return tomllib.load(f)
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def mazo_de_especificacion(espec: dict) -> tuple:
+    """
+    Arma el mazo de un jugador de un archivo de trabajos.
+
+    Args:
+        espec (dict): ``{"aleatorio": semilla}`` para un mazo de
+            ``construir_mazo_random``, o ``{"sets": ..., "extras": [...]}``
+            para el mazo de ``construir_mazo_equipamiento``.
+
+    Returns:
+        tuple: (mazo, origen).
+
+    Raises:
+        ValueError: Si la especificación nombra una pieza, set o carta que no existe.
+    """
+    if "aleatorio" in espec:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return construir_mazo_random("Lote", seed=espec["aleatorio"])
+    if "sets" not in espec:
+        raise ValueError("El mazo necesita 'sets' o 'aleatorio'")
+    sets = espec["sets"]
+    if isinstance(sets, dict):
+        faltan = [p for p in PIEZAS if p not in sets]
+        sobran = [p for p in sets if p not in PIEZAS]
+        if faltan or sobran:
+            raise ValueError(f"Piezas faltantes {faltan} o desconocidas {sobran} en 'sets'")
+        origen = {p: sets[p] for p in PIEZAS}
+    else:
+        if len(sets) != len(PIEZAS):
+            raise ValueError(f"'sets' debe tener un set por pieza ({', '.join(PIEZAS)})")
+        origen = dict(zip(PIEZAS, sets))
+    for nombre in origen.values():
+        if nombre not in SETS:
+            raise ValueError(f"Set desconocido: '{nombre}'")
+
+    catalogo = obtener_catalogo()
+    extras = []
+    for carta in espec.get("extras", ()):
+        if isinstance(carta, str):
+            if carta not in catalogo.por_nomenclatura:
+                raise ValueError(f"Carta desconocida: '{carta}'")
+            extras.append(catalogo.por_nomenclatura[carta])
+        elif not isinstance(carta, int) or isinstance(carta, bool):
+            raise ValueError(f"Carta inválida: {carta!r}")
+        elif 0 <= carta < len(catalogo):
+            extras.append(carta)
+        else:
+            raise ValueError(f"Id de carta fuera del catálogo: {carta}")
+    return construir_mazo_equipamiento(origen, extras), origen
+
+
+def preparar_trabajos(config: dict) -> list:
+    """
+    Valida la configuración y arma los mazos de todos los trabajos antes de
+    jugar ninguno, así un error en el archivo aparece al empezar y no a mitad
+    de la corrida. Cada ``nombre`` debe ser único y cumplir ``PATRON_NOMBRE``,
+    porque nombra los archivos del trabajo dentro de la salida.
+
+    Returns:
+        list: Un dict por trabajo con "nombre", "mazos" (los dos pares
+        (mazo, origen)) y las opciones de ``OPCIONES`` ya resueltas.
+
+    Raises:
+        ValueError: Si falta un dato, hay opciones desconocidas o valores inválidos.
+    """
+    por_defecto = config.get("por_defecto", {})
+    desconocidas = set(por_defecto) - set(OPCIONES)
+    if desconocidas:
+        raise ValueError(f"Opciones desconocidas en por_defecto: {sorted(desconocidas)}")
+    trabajos = []
+    nombres = set()
+    for n, trabajo in enumerate(config.get("trabajos", ()), 1):
+        nombre = str(trabajo.get("nombre", f"trabajo_{n}"))
+        try:
+            if nombre in nombres:
+                raise ValueError("nombre repetido")
+            if not PATRON_NOMBRE.fullmatch(nombre):
+                raise ValueError(
+                    "el nombre debe empezar con letra o número y tener solo letras, "
+                    "números, '_', '-', '.' y espacios"
+                )
+            desconocidas = set(trabajo) - set(OPCIONES) - {"nombre", "jugador1", "jugador2"}
+            if desconocidas:
+                raise ValueError(f"opciones desconocidas {sorted(desconocidas)}")
+            opciones = {**OPCIONES, **por_defecto, **trabajo}
+            if opciones["formato"] not in FORMATOS:
+                raise ValueError(f"formato '{opciones['formato']}' (opciones: {', '.join(FORMATOS)})")
+            if opciones["motor"] not in MOTORES:
+                raise ValueError(f"motor '{opciones['motor']}' (opciones: {', '.join(MOTORES)})")
+            if opciones["nivel_log"] not in NIVELES_LOG:
+                raise ValueError(f"nivel_log '{opciones['nivel_log']}'")
+            if opciones["checkpoint"] and opciones["seed"] is None:
+                raise ValueError("checkpoint requiere una seed fija para poder reanudar")
+            if opciones["seed"] is None:
+                # Semilla al azar, pero anotada en el resumen para poder repetir el trabajo
+                opciones["seed"] = np.random.SeedSequence().entropy
+            mazos = tuple(
+                mazo_de_especificacion(trabajo[j]) for j in ("jugador1", "jugador2")
+            )
+        except KeyError as e:
+            raise ValueError(f"Trabajo '{nombre}': falta {e}") from None
+        except ValueError as e:
+            raise ValueError(f"Trabajo '{nombre}': {e}") from None
+        nombres.add(nombre)
+        trabajos.append({
+            "nombre": nombre,
+            "mazos": mazos,
+            **{k: opciones[k] for k in OPCIONES},
+        })
+    if not trabajos:
+        raise ValueError("El archivo no tiene trabajos")
+    return trabajos
+
+
+def _jugar_trabajo(trabajo: dict, salida: str, pool) -> pd.DataFrame:
+    (mazo1, origen1), (mazo2, origen2) = trabajo["mazos"]
+    formato = trabajo["formato"]
+    write_excel = (
+        os.path.join(salida, f"{trabajo['nombre']}.xlsx") if formato == "excel" else False
+    )
+    directorio = (
+        os.path.join(salida, trabajo["nombre"]) if formato in ("parquet", "csv") else None
+    )
+    resumen_final, _, _ = simular_varias_partidas(
+        mazo1, origen1, mazo2, origen2, trabajo["repeticiones"],
+        write_excel=write_excel,
+        workers=trabajo["workers"],
+        seed=trabajo["seed"],
+        motor=trabajo["motor"],
+        nivel_log=trabajo["nivel_log"],
+        salida=directorio,
+        formato=formato if directorio else "parquet",
+        precision=trabajo["precision"],
+        confianza=trabajo["confianza"],
+        limite=trabajo["limite"],
+        checkpoint=(
+            os.path.join(salida, f"{trabajo['nombre']}.checkpoint") if trabajo["checkpoint"] else None
+        ),
+        resume=True,
+        pool=pool if trabajo["workers"] > 1 else None,
+    )
+    return resumen_final
+
+
+def correr_trabajos(trabajos: list, salida: str = DIRECTORIO_SALIDA, workers: int = None) -> pd.DataFrame:
+    """
+    Juega los ``trabajos`` (ver ``preparar_trabajos``) uno tras otro en este
+    proceso. Todos comparten un pool de ``workers`` procesos (por defecto el
+    mayor ``workers`` de los trabajos), que se crea una sola vez; cada trabajo
+    reparte sus partidas en él según su propio ``workers``.
+
+    Si un trabajo falla se anota el error y se sigue con el siguiente. Al
+    terminar cada trabajo se reescribe ``ARCHIVO_RESUMEN`` en ``salida``, así una
+    corrida interrumpida conserva lo ya jugado. Los trabajos con ``checkpoint``
+    guardan además puntos de control, y al volver a correr el mismo archivo
+    continúan donde quedaron.
+
+    Returns:
+        pd.DataFrame: Las filas de ``df_resumen_final`` de cada trabajo, con el
+        nombre del trabajo, su semilla, los segundos que tomó y el error si falló.
+    """
+    os.makedirs(salida, exist_ok=True)
+    workers = workers or max(t["workers"] for t in trabajos)
+    filas = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for n, trabajo in enumerate(trabajos, 1):
+            print(f"[{n}/{len(trabajos)}] {trabajo['nombre']}: "
+                  f"{trabajo['repeticiones']} partidas, motor {trabajo['motor']}")
+            trabajo = {**trabajo, "workers": min(trabajo["workers"], workers)}
+            t0 = time.perf_counter()
+            try:
+                df = _jugar_trabajo(trabajo, salida, pool)
+                error = ""
+            except Exception as e:
+                df = pd.DataFrame([{}])
+                error = f"{type(e).__name__}: {e}"
+                print(f"  Error: {error}", file=sys.stderr)
+            df.insert(0, "Trabajo", trabajo["nombre"])
+            df["Semilla"] = str(trabajo["seed"])
+            df["Segundos"] = round(time.perf_counter() - t0, 3)
+            df["Error"] = error
+            filas.append(df)
+            pd.concat(filas, ignore_index=True).to_csv(
+                os.path.join(salida, ARCHIVO_RESUMEN), index=False
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return pd.concat(filas, ignore_index=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m rulkanis.lotes",
+        description="Juega sin interacción los enfrentamientos de un archivo de trabajos",
+    )
+    parser.add_argument("archivo", help="archivo de trabajos (.toml o .json)")
+    parser.add_argument("-o", "--salida", default=DIRECTORIO_SALIDA,
+                        help="directorio de resultados (por defecto %(default)s)")
+    parser.add_argument("--workers", type=int,
+                        help="procesos del pool compartido (por defecto el mayor de los trabajos)")
+    args = parser.parse_args(argv)
+
+    try:
+        trabajos = preparar_trabajos(cargar_trabajos(args.archivo))
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        print(f"Error en '{args.archivo}': {e}", file=sys.stderr)
+        return 2
+    resumen = correr_trabajos(trabajos, args.salida, args.workers)
+    fallidos = resumen.loc[resumen["Error"] != "", "Trabajo"].unique()
+    print(f"\n{len(trabajos) - len(fallidos)}/{len(trabajos)} trabajos terminados. "
+          f"Resumen en '{os.path.join(args.salida, ARCHIVO_RESUMEN)}'")
+    return 1 if len(fallidos) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
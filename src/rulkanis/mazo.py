@@ -1,19 +1,28 @@
-import random
-import numpy as np
-from rulkanis.datos_rulkanis import cartas_accion, distribucion_equipamiento, equipamiento_sets_nominales
-from rulkanis.carta import Carta
+import hashlib
+import json
+from functools import lru_cache
+from rulkanis.azar import Dados
+from rulkanis.datos_rulkanis import distribucion_equipamiento, equipamiento_sets_nominales
+from rulkanis.catalogo import obtener_catalogo, nuevo_mazo, TIPO_ID
+
+# Piezas de equipamiento, en el orden en que se arma el mazo
+PIEZAS = ("ARMA", "BOTAS", "CASCO", "PECHERA", "GUANTES")
+# Nombres de los sets de equipamiento en orden estable
+SETS = tuple(equipamiento_sets_nominales)
+# Cartas extra de un mazo aleatorio: nivel -> cantidad (distintas entre sí)
+DISTRIBUCION_EXTRAS = {1: 2, 2: 2, 3: 2, 4: 2, 5: 2}
 
 
 def construir_lista_cartas():
     """
-    Construye una lista de objetos de tipo Carta a partir de una lista de diccionarios predefinida
-    llamada 'cartas_accion'.
+    Devuelve la lista de cartas del catálogo, construidas a partir de la lista de
+    diccionarios predefinida llamada 'cartas_accion'.
 
     Retorna:
-        list: Una lista de objetos Carta, donde cada objeto se crea utilizando los valores de las
-        claves 'nombre', 'nomenclatura' y 'nivel' de cada diccionario en 'cartas_accion'.
+        list: Las cartas del catálogo en orden de id. Son objetos compartidos e
+        inmutables, con su programa ya compilado.
     """
-    return [Carta(c["nombre"], c["nomenclatura"], c["nivel"]) for c in cartas_accion]
+    return list(obtener_catalogo().cartas)
 
 
 # ---------------------------------------------------------------------------
@@ -49,12 +58,13 @@ def seleccionar_pieza_equipamiento(pieza: str, sets_disponibles: dict):
             print("Entrada inválida.")
 
 
-def elegir_cartas_por_nivel(cartas_disponibles: list, nivel: int, cantidad: int):
-    opciones = [carta for carta in cartas_disponibles if carta.nivel == nivel]
+def elegir_cartas_por_nivel(nivel: int, cantidad: int):
+    catalogo = obtener_catalogo()
+    opciones = catalogo.por_nivel.get(nivel, ())
     seleccion: list = []
     print(f"\nCartas disponibles de nivel {nivel}:")
-    for i, carta in enumerate(opciones):
-        print(f"  {i+1}. {carta}")
+    for i, id_carta in enumerate(opciones):
+        print(f"  {i+1}. {catalogo[id_carta]}")
     while len(seleccion) < cantidad:
         try:
             idx = int(input("Elige carta: ")) - 1
@@ -67,24 +77,22 @@ def elegir_cartas_por_nivel(cartas_disponibles: list, nivel: int, cantidad: int)
 
 def construir_mazo_combinado(nombre_jugador):
     print(f"\n--- {nombre_jugador.upper()} ---")
-    todas = construir_lista_cartas()
-    mazo = []
+    catalogo = obtener_catalogo()
+    mazo = nuevo_mazo()
     origen = {}
 
     # Mapeo para que coincida con las claves de distribución
 
-    for parte in ["ARMA", "BOTAS", "CASCO", "PECHERA", "GUANTES"]:
-        set_name, noms = seleccionar_pieza_equipamiento(parte, equipamiento_sets_nominales)
+    for parte in PIEZAS:
+        set_name, _ = seleccionar_pieza_equipamiento(parte, equipamiento_sets_nominales)
         origen[parte] = set_name
 
-        # Filtramos las cartas de ese set
-        disp = [c for c in todas if c.nomenclatura in noms]
-
         # Obtenemos la distribución correcta usando la clave plural
         dist = distribucion_equipamiento.get(parte, {})
 
         for nivel, cantidad in dist.items():
-            cand = [c for c in disp if c.nivel == nivel and c]
+            # Cartas del set para esta pieza y nivel (índice precalculado)
+            cand = catalogo.por_pieza[(set_name, parte, nivel)]
             elegidos = cand[:cantidad]
             mazo.extend(elegidos)
 
@@ -92,18 +100,40 @@ def construir_mazo_combinado(nombre_jugador):
     print("\n--- Selección de 10 cartas adicionales ---")
     extras = {1:2, 2:2, 3:2, 4:2, 5:2}  # nivel: cantidad
     for nivel, cantidad in extras.items():
-        mazo.extend(elegir_cartas_por_nivel(todas, nivel, cantidad))
+        mazo.extend(elegir_cartas_por_nivel(nivel, cantidad))
 
     print(f"\nResumen del mazo de {nombre_jugador} (total {len(mazo)} cartas):")
-    for c in mazo:
+    for c in catalogo.cartas_de(mazo):
         print(" -", c)
 
     return mazo, origen
 
 
+def construir_mazo_equipamiento(origen: dict, extras=()):
+    """
+    Arma sin interacción el mazo de una combinación de equipamiento, con las
+    mismas cartas por pieza que ``construir_mazo_combinado``.
+
+    Args:
+        origen (dict): Set elegido para cada pieza de ``PIEZAS``.
+        extras (iterable): Ids de cartas adicionales; por defecto ninguna, así
+            los mazos solo difieren en el equipamiento.
+
+    Returns:
+        array: Ids de las cartas del mazo.
+    """
+    catalogo = obtener_catalogo()
+    mazo = nuevo_mazo()
+    for parte in PIEZAS:
+        for nivel, cantidad in distribucion_equipamiento.get(parte, {}).items():
+            mazo.extend(catalogo.por_pieza[(origen[parte], parte, nivel)][:cantidad])
+    mazo.extend(extras)
+    return mazo
+
+
 # ---------------------------------------------------------------------------
 #  Construccion de mazo aleatorio
-def seleccionar_pieza_random(pieza: str, sets_disponibles: dict):
+def seleccionar_pieza_random(pieza: str, sets_disponibles: dict, dados: Dados = None):
     """
     Selecciona aleatoriamente un conjunto disponible y devuelve la pieza correspondiente.
 
@@ -111,6 +141,7 @@ def seleccionar_pieza_random(pieza: str, sets_disponibles: dict):
         pieza (str): El nombre de la pieza a buscar. Se convierte a mayúsculas para la búsqueda.
         sets_disponibles (dict): Un diccionario donde las claves son los nombres de los conjuntos
             y los valores son diccionarios que contienen las piezas disponibles en cada conjunto.
+        dados (Dados): Fuente de azar; por defecto una nueva sin semilla.
 
     Returns:
         tuple: Una tupla que contiene:
@@ -122,76 +153,188 @@ def seleccionar_pieza_random(pieza: str, sets_disponibles: dict):
         IndexError: Si no hay conjuntos disponibles en el diccionario.
     """
 
-    random_set = random.choice(list(sets_disponibles.keys()))
+    dados = dados or Dados()
+    random_set = dados.elegir(list(sets_disponibles.keys()))
     return random_set, sets_disponibles[random_set][pieza.upper()]
 
 
-def elegir_cartas_por_nivel_random(cartas_disponibles: list, nivel: int, cantidad: int):
+def elegir_cartas_por_nivel_random(nivel: int, cantidad: int, dados: Dados = None):
     """
     Selecciona una cantidad específica de cartas al azar de un nivel dado.
 
     Args:
-        cartas_disponibles (list): Lista de cartas disponibles para seleccionar.
         nivel (int): Nivel de las cartas que se desean seleccionar.
         cantidad (int): Cantidad de cartas a seleccionar.
+        dados (Dados): Fuente de azar; por defecto una nueva sin semilla.
 
     Returns:
-        list: Una lista con las cartas seleccionadas al azar que cumplen con el nivel especificado.
+        list: Una lista con los ids de las cartas seleccionadas al azar que cumplen
+        con el nivel especificado.
 
     Raises:
         ValueError: Si la cantidad solicitada es mayor que el número de cartas disponibles del nivel especificado.
     """
-    opciones = [carta for carta in cartas_disponibles if carta.nivel == nivel]
-    seleccion: list = random.sample(opciones, cantidad)
+    opciones = obtener_catalogo().por_nivel.get(nivel, ())
+    seleccion: list = (dados or Dados()).muestra(opciones, cantidad)
     return seleccion
 
-def construir_mazo_random(nombre_jugador, seed: int = None):
+def construir_mazo_random(nombre_jugador, seed: int = None, dados: Dados = None):
+    """
+    Arma un mazo con un set al azar para cada pieza y 10 cartas extra al azar.
+
+    Args:
+        nombre_jugador (str): Nombre que se muestra en el resumen impreso.
+        seed (int): Semilla para reproducir el mazo; se ignora si se pasa ``dados``.
+        dados (Dados): Fuente de azar a usar en lugar de una nueva con ``seed``.
 
-    # Fijar la semilla para reproducibilidad
-    random.seed(seed)
-    np.random.seed(seed)
+    Returns:
+        tuple: (mazo, origen) con los ids de las cartas y el set de cada pieza.
+    """
+    # Generador propio: no toca el estado global de random ni de numpy
+    dados = dados or Dados(seed)
 
-    todas_cartas = construir_lista_cartas()
-    mazo = []
+    catalogo = obtener_catalogo()
+    mazo = nuevo_mazo()
     set_jugador = {}
 
     # Mapeo para que coincida con las claves de distribución
 
-    for parte in ["ARMA", "BOTAS", "CASCO", "PECHERA", "GUANTES"]:
-        nombre_set, nomenclaturas_disponibles = seleccionar_pieza_random(
-            parte, equipamiento_sets_nominales
+    for parte in PIEZAS:
+        nombre_set, _ = seleccionar_pieza_random(
+            parte, equipamiento_sets_nominales, dados
         )
         set_jugador[parte] = nombre_set
 
-        # Filtramos las cartas de ese set
-        disponibles = [
-            carta
-            for carta in todas_cartas
-            if carta.nomenclatura in nomenclaturas_disponibles
-        ]
-
         # Obtenemos la distribucion de cantidad de cartas por nivel para la pieza escogida
         distribucion_cartas_pieza = distribucion_equipamiento.get(parte, {})
 
         for nivel, cantidad in distribucion_cartas_pieza.items():
-            cartas_pieza = [
-                carta
-                for carta in disponibles
-                if carta.nivel == nivel and carta
-            ]
+            cartas_pieza = catalogo.por_pieza[(nombre_set, parte, nivel)]
             try:
-                elegidos = np.random.choice(cartas_pieza, cantidad)
+                elegidos = dados.gen.choice(cartas_pieza, cantidad)
             except ValueError as e: 
-                elegidos = np.random.choice(todas_cartas, cantidad)
-            mazo.extend(elegidos)
+                elegidos = dados.gen.choice(len(catalogo), cantidad)
+            mazo.extend(int(i) for i in elegidos)
         
     # Agregamos 10 cartas extras aleatorias
-    distribucion_extras = {1:2, 2:2, 3:2, 4:2, 5:2}  # nivel: cantidad
-    for nivel, cantidad in distribucion_extras.items():
-        mazo.extend(elegir_cartas_por_nivel_random(todas_cartas, nivel, cantidad))
+    for nivel, cantidad in DISTRIBUCION_EXTRAS.items():
+        mazo.extend(elegir_cartas_por_nivel_random(nivel, cantidad, dados))
 
     print(f"\nResumen del mazo de {nombre_jugador} (total {len(mazo)} cartas):")
-    for c in mazo:
+    for c in catalogo.cartas_de(mazo):
         print(" -", c)
     
     return mazo, set_jugador
+
+
+@lru_cache(maxsize=None)
+def _tablas_random():
+    """
+    Candidatos de ``construir_mazos_random`` como arreglos indexables por set.
+
+    Returns:
+        tuple: (piezas, extras). ``piezas`` tiene, por pieza de ``PIEZAS``, una
+        terna (cantidad, tabla, cuenta) por nivel: ``tabla[s, :cuenta[s]]`` son
+        los ids candidatos con el set ``s``. ``extras`` tiene un par (ids,
+        cantidad) por nivel de ``DISTRIBUCION_EXTRAS``.
+    """
+    import numpy as np
+
+    catalogo = obtener_catalogo()
+    todas = tuple(range(len(catalogo)))
+    piezas = []
+    for parte in PIEZAS:
+        niveles = []
+        for nivel, cantidad in distribucion_equipamiento.get(parte, {}).items():
+            # Sin cartas del set para la pieza y nivel, construir_mazo_random sortea del catálogo entero
+            opciones = [catalogo.por_pieza.get((s, parte, nivel)) or todas for s in SETS]
+            tabla = np.zeros((len(SETS), max(map(len, opciones))), dtype=np.int64)
+            for s, ids in enumerate(opciones):
+                tabla[s, :len(ids)] = ids
+            niveles.append((cantidad, tabla, np.array([len(ids) for ids in opciones])))
+        piezas.append(niveles)
+    extras = [
+        (np.array(catalogo.por_nivel.get(nivel, ()), dtype=np.int64), cantidad)
+        for nivel, cantidad in DISTRIBUCION_EXTRAS.items()
+    ]
+    return piezas, extras
+
+
+def construir_mazos_random(cantidad: int, seed: int = None, dados: Dados = None, huellas: bool = True):
+    """
+    Arma ``cantidad`` mazos al azar de una vez, con las mismas reglas (y la
+    misma distribución) que ``construir_mazo_random`` pero sin imprimir nada:
+    un set al azar por pieza, sus cartas por nivel sorteadas con reposición
+    entre las del set, y las extras de ``DISTRIBUCION_EXTRAS`` distintas entre
+    sí. Con la misma semilla no sale la misma secuencia de mazos que llamando
+    ``construir_mazo_random`` varias veces.
+
+    Args:
+        cantidad (int): Número de mazos.
+        seed (int): Semilla para reproducir los mazos; se ignora si se pasa ``dados``.
+        dados (Dados): Fuente de azar a usar en lugar de una nueva con ``seed``.
+        huellas (bool): Si es False no se calculan las huellas (es la parte
+            más lenta).
+
+    Returns:
+        tuple: (mazos, sets, huellas).
+            - mazos (np.ndarray): Matriz ``cantidad × largo`` de ids (tipo
+              ``TIPO_ID``); cada fila tiene las cartas en el orden de
+              ``construir_mazo_random`` y ``nuevo_mazo(mazos[i])`` es el mazo.
+            - sets (np.ndarray): Matriz ``cantidad × len(PIEZAS)`` con el índice
+              en ``SETS`` del set de cada pieza (``torneo.origen_de`` da el origen).
+            - huellas (list): ``huella_mazo`` de cada mazo, para descartar
+              repetidos o buscar resultados guardados; None si ``huellas`` es False.
+
+    Raises:
+        ValueError: Si un nivel no tiene suficientes cartas para las extras.
+    """
+    import numpy as np
+
+    piezas, extras = _tablas_random()
+    gen = (dados or Dados(seed)).gen
+    sets = gen.integers(len(SETS), size=(cantidad, len(PIEZAS)), dtype=np.int8)
+    columnas = []
+    for p, niveles in enumerate(piezas):
+        s = sets[:, p]
+        for cant, tabla, cuenta in niveles:
+            elegidas = (gen.random((cantidad, cant)) * cuenta[s][:, None]).astype(np.int64)
+            columnas.append(tabla[s[:, None], elegidas])
+    for ids, cant in extras:
+        if cant > len(ids):
+            raise ValueError(f"No hay {cant} cartas distintas de un nivel para las extras")
+        # Los ``cant`` menores de una permutación al azar: una muestra sin reposición por fila
+        elegidas = np.argpartition(gen.random((cantidad, len(ids))), cant - 1, axis=1)[:, :cant]
+        columnas.append(ids[elegidas])
+    mazos = np.concatenate(columnas, axis=1).astype(TIPO_ID)
+
+    if not huellas:
+        return mazos, sets, None
+    origenes = {}
+    lista = []
+    for cartas, fila in zip(np.sort(mazos, axis=1).tolist(), sets.tolist()):
+        clave = tuple(fila)
+        if clave not in origenes:
+            origenes[clave] = _origen_json(dict(zip(PIEZAS, (SETS[i] for i in fila))))
+        lista.append(_huella(cartas, origenes[clave]))
+    return mazos, sets, lista
+
+
+# ---------------------------------------------------------------------------
+#  Huellas
+def _origen_json(origen: dict) -> str:
+    return json.dumps(sorted((origen or {}).items()))
+
+
+def _huella(cartas_ordenadas, origen_json: str) -> str:
+    # Mismo texto que json.dumps({"cartas": [...], "origen": [...]}), armado a mano
+    texto = '{"cartas": [' + ", ".join(map(str, cartas_ordenadas)) + '], "origen": ' + origen_json + "}"
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def huella_mazo(mazo, origen: dict) -> str:
+    """
+    Huella canónica de un mazo: el multiconjunto de cartas (sin importar el
+    orden) y los sets de equipamiento de ``origen``.
+    """
+    return _huella(sorted(int(i) for i in mazo), _origen_json(origen))
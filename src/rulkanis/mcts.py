@@ -0,0 +1,288 @@
+# mcts.py
+# -*- coding: utf-8 -*-
+# Política de juego por búsqueda de árbol Monte Carlo (MCTS) para elegir qué
+# carta jugar en cada paso del turno, en lugar de la regla voraz de
+# simulador.elegir_carta. Comparar ambas con la misma semilla mide cuánto del
+# porcentaje de victorias de un mazo se debe a esa regla.
+
+import math
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from rulkanis.azar import Dados
+from rulkanis.estadistica import GANADORES, intervalo_wilson
+from rulkanis.estado_partida import EstadoPartida
+from rulkanis.jugador import Jugador
+from rulkanis.reglas import (
+    aplicar_carta,
+    determinar_exito_carta,
+    CATEGORIAS_ATAQUE,
+    MAX_CARTAS_TURNO,
+    MAX_NIVEL_TURNO,
+)
+from rulkanis.simulador import (
+    contar_victorias,
+    elegir_carta,
+    elegir_esquive,
+    fase_reaccion,
+    simular_partida,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Partidas simuladas (rollouts) por decisión por defecto
+SIMULACIONES = 200
+# Constante de exploración de UCB1 (recompensas entre 0 y 1)
+EXPLORACION = math.sqrt(2)
+# Acción de terminar el turno sin jugar más cartas
+PASAR = None
+
+
+def acciones_legales(mano: dict, cartas_jugadas: int, nivel_total: int, categorias) -> list:
+    """
+    Acciones posibles en este paso del turno: el id de cada carta distinta de
+    ``mano`` que cabe en el nivel que queda y cuya categoría no se jugó (en
+    orden de robo), más ``PASAR``. Vacía si ya no se puede jugar ninguna carta.
+    """
+    if cartas_jugadas >= MAX_CARTAS_TURNO:
+        return []
+    ids = {}
+    for carta in mano.values():
+        if nivel_total + carta.nivel <= MAX_NIVEL_TURNO and carta.categoria not in categorias:
+            ids.setdefault(carta.id)
+    return [*ids, PASAR] if ids else []
+
+
+def _posicion(mano: dict, id_carta: int) -> int:
+    """Posición en ``mano`` de la primera carta robada con ``id_carta``."""
+    for pos, carta in mano.items():
+        if carta.id == id_carta:
+            return pos
+    raise ValueError(f"Carta {id_carta} no está en la mano")
+
+
+def _jugar_carta(actual: Jugador, oponente: Jugador, pos: int, carta,
+                 cartas_jugadas: int, nivel_total: int, categorias) -> tuple:
+    """
+    Juega ``carta`` como un paso del bucle de ``simular_partida`` (sin
+    registros) y devuelve el avance del turno ``(cartas_jugadas, nivel_total,
+    categorias)`` actualizado.
+    """
+    if determinar_exito_carta(carta, actual)[0]:
+        if carta.categoria in CATEGORIAS_ATAQUE:
+            pos_esquive, carta_de_esquive = elegir_esquive(oponente.mano)
+            if carta_de_esquive is not None:
+                fase_reaccion(carta, carta_de_esquive, actual, oponente, None, pos, pos_esquive,
+                              registrar_eventos=False)
+                return cartas_jugadas, nivel_total, categorias
+        aplicar_carta(carta, actual, oponente)
+        cartas_jugadas += 1
+        nivel_total += carta.nivel
+        categorias = categorias | {carta.categoria}
+    actual.descartar(pos)
+    return cartas_jugadas, nivel_total, categorias
+
+
+def _terminar_partida(actual: Jugador, oponente: Jugador, cartas_jugadas: int, nivel_total: int,
+                      categorias, voraz: bool):
+    """
+    Termina el turno de ``actual`` (con ``elegir_carta`` si ``voraz``) y juega
+    el resto de la partida con ``elegir_carta`` para ambos jugadores.
+    """
+    while voraz and cartas_jugadas < MAX_CARTAS_TURNO:
+        pos, carta = elegir_carta(actual.mano, nivel_total, categorias)
+        if carta is None:
+            break
+        cartas_jugadas, nivel_total, categorias = _jugar_carta(
+            actual, oponente, pos, carta, cartas_jugadas, nivel_total, categorias
+        )
+    actual.terminar_turno()
+    simular_partida(0, actual, oponente, oponente, actual, "ninguno")
+
+
+class _Nodo:
+    """Nodo del árbol: visitas, recompensa acumulada e hijos por acción."""
+
+    __slots__ = ("visitas", "valor", "hijos")
+
+    def __init__(self):
+        self.visitas = 0
+        self.valor = 0.0
+        self.hijos = {}
+
+    def ucb(self, log_visitas: float, exploracion: float) -> float:
+        return self.valor / self.visitas + exploracion * math.sqrt(log_visitas / self.visitas)
+
+
+class PoliticaMCTS:
+    """
+    Política de juego (ver ``simulador.simular_partida``) que elige cada carta
+    con una búsqueda de árbol Monte Carlo.
+
+    El árbol cubre las decisiones que quedan en el turno del jugador (qué carta
+    jugar o ``PASAR``) y es de lazo abierto: los nodos son secuencias de
+    acciones, no estados, así que los dados y los robos de cada simulación
+    pueden llevar a estados distintos bajo el mismo nodo, y en cada uno solo se
+    consideran las acciones legales. Cada simulación:
+
+    1. Parte de una foto (``EstadoPartida``) determinizada: el orden del mazo
+       propio y la mano y el mazo del rival, que el jugador no ve, se sortean
+       de nuevo.
+    2. Baja por el árbol con UCB1 hasta agregar un nodo nuevo.
+    3. Termina el turno y la partida con ``elegir_carta`` para ambos jugadores.
+    4. Suma la recompensa (1 victoria, 0.5 empate, 0 derrota) en el camino.
+
+    Se juega la acción más visitada. El azar de la búsqueda sale de un ``Dados``
+    propio, sembrado en ``empezar`` con la semilla de la corrida, el número de
+    partida y el jugador: no consume el azar de la partida, y con un
+    presupuesto de ``simulaciones`` la corrida es reproducible con cualquier
+    número de workers. Con ``segundos`` depende de la velocidad de la máquina.
+
+    Args:
+        simulaciones (int): Simulaciones por decisión (None: solo por tiempo).
+        segundos (float): Tiempo máximo por decisión (None: solo por simulaciones).
+        exploracion (float): Constante de exploración de UCB1.
+
+    Atributos:
+        decisiones (int): Decisiones tomadas con búsqueda.
+        rollouts (int): Simulaciones jugadas en total.
+
+    Raises:
+        ValueError: Si no hay presupuesto (``simulaciones`` y ``segundos`` None).
+    """
+
+    def __init__(self, simulaciones: int = SIMULACIONES, segundos: float = None,
+                 exploracion: float = EXPLORACION):
+        if simulaciones is None and segundos is None:
+            raise ValueError("Hace falta un presupuesto: simulaciones o segundos")
+        self.simulaciones = simulaciones
+        self.segundos = segundos
+        self.exploracion = exploracion
+        self.dados = Dados(0)
+        self.decisiones = 0
+        self.rollouts = 0
+        # Jugadores de trabajo donde se cargan las fotos; se crean al primer uso
+        self._trabajo = None
+
+    def empezar(self, semilla, partida: int, indice: int):
+        """Siembra el azar de la búsqueda para la partida ``partida`` del jugador ``indice``."""
+        import numpy as np
+
+        self.dados.sembrar(np.random.SeedSequence(semilla, spawn_key=(partida, 1 + indice)))
+
+    def __call__(self, actual: Jugador, oponente: Jugador, cartas_jugadas: int, nivel_total: int,
+                 categorias_jugadas) -> tuple:
+        acciones = acciones_legales(actual.mano, cartas_jugadas, nivel_total, categorias_jugadas)
+        if not acciones:
+            return None, None
+        raiz = self.buscar(EstadoPartida.desde_jugadores(
+            actual, oponente, actual, cartas_jugadas, nivel_total, categorias_jugadas
+        ))
+        mejor = max(acciones, key=lambda a: raiz.hijos[a].visitas if a in raiz.hijos else -1)
+        if mejor is PASAR:
+            return None, None
+        pos = _posicion(actual.mano, mejor)
+        return pos, actual.mano[pos]
+
+    def buscar(self, estado: EstadoPartida) -> _Nodo:
+        """Corre la búsqueda desde ``estado`` con el presupuesto de una decisión y devuelve la raíz."""
+        if self._trabajo is None:
+            self._trabajo = tuple(Jugador(nombre, [], {}, self.dados) for nombre in GANADORES[:2])
+        raiz = _Nodo()
+        limite = None if self.segundos is None else perf_counter() + self.segundos
+        n = 0
+        while (self.simulaciones is None or n < self.simulaciones) and (
+            limite is None or perf_counter() < limite
+        ):
+            self._simular(raiz, estado.determinizar(self.dados, estado.mueve))
+            n += 1
+        self.decisiones += 1
+        self.rollouts += n
+        return raiz
+
+    def _simular(self, raiz: _Nodo, estado: EstadoPartida):
+        actual, oponente = estado.cargar(*self._trabajo)
+        cartas, nivel, categorias = estado.cartas_jugadas, estado.nivel_total, estado.categorias
+        camino = [raiz]
+        nodo = raiz
+        voraz = True
+        while True:
+            acciones = acciones_legales(actual.mano, cartas, nivel, categorias)
+            if not acciones:
+                break
+            nuevas = [a for a in acciones if a not in nodo.hijos]
+            if nuevas:
+                accion = nuevas[0] if len(nuevas) == 1 else self.dados.elegir(nuevas)
+                nodo.hijos[accion] = _Nodo()
+            else:
+                log_visitas = math.log(sum(nodo.hijos[a].visitas for a in acciones))
+                accion = max(acciones, key=lambda a: nodo.hijos[a].ucb(log_visitas, self.exploracion))
+            nodo = nodo.hijos[accion]
+            camino.append(nodo)
+            if accion is PASAR:
+                voraz = False
+                break
+            pos = _posicion(actual.mano, accion)
+            cartas, nivel, categorias = _jugar_carta(
+                actual, oponente, pos, actual.mano[pos], cartas, nivel, categorias
+            )
+            if nuevas:
+                break
+        _terminar_partida(actual, oponente, cartas, nivel, categorias, voraz)
+
+        if actual.vida > oponente.vida:
+            recompensa = 1.0
+        else:
+            recompensa = 0.5 if actual.vida == oponente.vida else 0.0
+        for nodo in camino:
+            nodo.visitas += 1
+            nodo.valor += recompensa
+
+    def __repr__(self):
+        return (
+            f"PoliticaMCTS(simulaciones={self.simulaciones}, segundos={self.segundos}, "
+            f"exploracion={self.exploracion:g})"
+        )
+
+
+def comparar_politicas(
+    mazo1,
+    origen1,
+    mazo2,
+    origen2,
+    repeticiones: int,
+    seed: int,
+    politica=None,
+    workers: int = 1,
+    confianza: float = 0.95,
+) -> "pd.DataFrame":
+    """
+    Juega el enfrentamiento dos veces, con el jugador 1 usando ``elegir_carta``
+    y luego ``politica`` (por defecto ``PoliticaMCTS()``); el jugador 2 usa
+    siempre ``elegir_carta``. Ambas corridas usan la misma ``seed``: mismos
+    mazos barajados y mismo sorteo de quién empieza en cada partida, así la
+    diferencia se debe a la política y no al azar.
+
+    Returns:
+        pd.DataFrame: Una fila por política con el porcentaje de cada resultado
+        de ``GANADORES``, el intervalo de confianza de Wilson de las victorias
+        del jugador 1 y las partidas jugadas.
+    """
+    import pandas as pd
+
+    politica = PoliticaMCTS() if politica is None else politica
+    filas = []
+    for nombre, politicas in (("elegir_carta", None), (repr(politica), (politica, None))):
+        conteo = contar_victorias(
+            mazo1, origen1, mazo2, origen2, repeticiones, seed, workers=workers, politicas=politicas
+        )
+        inferior, superior = intervalo_wilson(int(conteo[0]), repeticiones, confianza)
+        filas.append({
+            "Política": nombre,
+            **{g: round(100 * int(n) / repeticiones, 2) for g, n in zip(GANADORES, conteo)},
+            "IC inferior": round(100 * inferior, 2),
+            "IC superior": round(100 * superior, 2),
+            "Partidas": repeticiones,
+        })
+    return pd.DataFrame(filas)
@@ -0,0 +1,321 @@
+# motor_vectorizado.py
+# -*- coding: utf-8 -*-
+# Motor por lotes: avanza K partidas a la vez, un turno por iteración, con el
+# estado de todas las partidas en arreglos NumPy (struct-of-arrays).
+
+import numpy as np
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.estadistica import GANADORES
+from rulkanis.datos_rulkanis import nomenclaturas as _nomenclaturas
+from rulkanis.reglas import (
+    EFECTOS,
+    CARAS_DADO,
+    UMBRAL_AZAR,
+    UMBRAL_AZAR_SUERTE,
+    DANO_INICIAL_ESTADO,
+    VIDA_INICIAL,
+    CARTAS_INICIALES,
+    MAX_CARTAS_TURNO,
+    MAX_NIVEL_TURNO,
+    CATEGORIAS_ATAQUE,
+    CODIGOS_ESQUIVE,
+)
+
+# Códigos de operación del motor (índice = opcode)
+OPERACIONES = (
+    "nada", "dano", "sangrado", "fuego", "defensa", "vida", "paralizar",
+    "congelar", "limpieza", "suerte", "esquiva", "robar",
+)
+_OP = {nombre: i for i, nombre in enumerate(OPERACIONES)}
+
+# Operaciones que dejan un estado temporal en el objetivo: (arreglo, daño inmediato)
+_ESTADOS_OBJETIVO = {
+    _OP["sangrado"]: ("sangrado", DANO_INICIAL_ESTADO),
+    _OP["fuego"]: ("fuego", DANO_INICIAL_ESTADO),
+    _OP["paralizar"]: ("paralizado", 0),
+    _OP["congelar"]: ("congelado", 0),
+}
+
+_CATEGORIAS = sorted({n["categoria"] for n in _nomenclaturas}) + [None]
+_BIT_CATEGORIA = {c: 1 << i for i, c in enumerate(_CATEGORIAS)}
+
+_TABLA_CATALOGO = None
+
+
+class TablaCartas:
+    """
+    Atributos de un conjunto de cartas en forma de arreglos, indexados por la
+    posición de la carta en el conjunto (el id, si es el catálogo completo).
+
+    Cada carta se traduce a un programa de hasta ``S`` pasos (uno por código de
+    su nomenclatura) con opcode, valor y si el paso lanza dado, tomados de
+    ``reglas.EFECTOS``.
+    """
+
+    def __init__(self, cartas: list):
+        self.cartas = cartas
+        codigos = [carta.codigos for carta in cartas]
+        pasos = max(len(cs) for cs in codigos)
+        n = len(cartas)
+
+        self.nivel = np.array([c.nivel for c in cartas], dtype=np.int16)
+        self.bit_categoria = np.array(
+            [_BIT_CATEGORIA.get(c.categoria, _BIT_CATEGORIA[None]) for c in cartas],
+            dtype=np.int32,
+        )
+        self.azar = np.array([c.tipo == "AZAR" for c in cartas], dtype=bool)
+        self.ataque = np.array([c.categoria in CATEGORIAS_ATAQUE for c in cartas], dtype=bool)
+        self.esquive = np.array(
+            [c.codigo_principal in CODIGOS_ESQUIVE for c in cartas], dtype=bool
+        )
+
+        self.op = np.zeros((n, pasos), dtype=np.int8)
+        self.valor = np.zeros((n, pasos), dtype=np.int16)
+        self.op_azar = np.zeros((n, pasos), dtype=bool)
+        for i, cs in enumerate(codigos):
+            for s, codigo in enumerate(cs):
+                if codigo in EFECTOS:
+                    operacion, valor, azar = EFECTOS[codigo]
+                    self.op[i, s] = _OP[operacion]
+                    self.valor[i, s] = valor
+                    self.op_azar[i, s] = azar
+
+    @classmethod
+    def desde_catalogo(cls):
+        """Tabla sobre todo el catálogo: el índice de carta es su id."""
+        global _TABLA_CATALOGO
+        if _TABLA_CATALOGO is None:
+            _TABLA_CATALOGO = cls(obtener_catalogo().cartas)
+        return _TABLA_CATALOGO
+
+
+class EstadoLote:
+    """
+    Estado de K partidas simultáneas. Todos los arreglos por jugador tienen forma
+    ``(K, 2)``; las manos se guardan como máscara sobre las posiciones del mazo
+    barajado de cada partida, así el orden de la mano es el orden de robo.
+    """
+
+    def __init__(self, tabla: TablaCartas, mazo1: np.ndarray, mazo2: np.ndarray,
+                 k: int, rng: np.random.Generator):
+        self.tabla = tabla
+        self.rng = rng
+        self.k = k
+        largo = max(len(mazo1), len(mazo2))
+        self.largo = np.array([len(mazo1), len(mazo2)], dtype=np.int16)
+
+        self.vida = np.full((k, 2), VIDA_INICIAL, dtype=np.int16)
+        self.defensa = np.zeros((k, 2), dtype=np.int16)
+        self.sangrado = np.zeros((k, 2), dtype=np.int8)
+        self.fuego = np.zeros((k, 2), dtype=np.int8)
+        self.congelado = np.zeros((k, 2), dtype=np.int8)
+        self.paralizado = np.zeros((k, 2), dtype=np.int8)
+        self.suerte = np.zeros((k, 2), dtype=np.int8)
+        self.esquiva = np.zeros((k, 2), dtype=bool)
+
+        # Mazos barajados por partida (posiciones sobrantes con la carta 0, nunca se roban)
+        self.orden = np.zeros((k, 2, largo), dtype=np.int16)
+        for p, mazo in enumerate((mazo1, mazo2)):
+            perm = np.argsort(rng.random((k, len(mazo))), axis=1)
+            self.orden[:, p, : len(mazo)] = mazo[perm]
+        self.cursor = np.zeros((k, 2), dtype=np.int16)
+        self.en_mano = np.zeros((k, 2, largo), dtype=bool)
+
+        todas = np.arange(k)
+        for p in (0, 1):
+            for _ in range(CARTAS_INICIALES):
+                self.robar(todas, np.full(k, p))
+
+        # Empieza Jugador 1 con dado >= 5, igual que simular_varias_partidas
+        self.actual = np.where(self.dados(k) >= 5, 0, 1).astype(np.int8)
+        self.activa = np.ones(k, dtype=bool)
+
+    # -- primitivas -----------------------------------------------------------
+    def dados(self, n: int) -> np.ndarray:
+        return self.rng.integers(1, CARAS_DADO + 1, size=n)
+
+    def umbral(self, g, p) -> np.ndarray:
+        return np.where(self.suerte[g, p] > 0, UMBRAL_AZAR_SUERTE, UMBRAL_AZAR)
+
+    def robar(self, g, p):
+        quedan = self.cursor[g, p] < self.largo[p]
+        g, p = g[quedan], p[quedan]
+        self.en_mano[g, p, self.cursor[g, p]] = True
+        self.cursor[g, p] += 1
+
+    def aplicar_dano(self, g, p, cantidad):
+        esq = self.esquiva[g, p]
+        self.esquiva[g[esq], p[esq]] = False
+        g, p, cantidad = g[~esq], p[~esq], np.broadcast_to(cantidad, esq.shape)[~esq]
+        defensa = self.defensa[g, p]
+        absorbido = np.minimum(defensa, cantidad)
+        self.defensa[g, p] = defensa - absorbido
+        self.vida[g, p] -= (cantidad - absorbido).astype(self.vida.dtype)
+
+    def aplicar_cartas(self, g, actor, objetivo, cartas):
+        """Ejecuta paso a paso el programa de ``cartas[i]`` en la partida ``g[i]``."""
+        t = self.tabla
+        for s in range(t.op.shape[1]):
+            ops = t.op[cartas, s]
+            for op in np.unique(ops):
+                if op == _OP["nada"]:
+                    continue
+                sel = ops == op
+                gs, act, obj, cs = g[sel], actor[sel], objetivo[sel], cartas[sel]
+                valor = t.valor[cs, s]
+                azar = t.op_azar[cs, s]
+                if azar.any():
+                    ok = ~azar
+                    ok[azar] = self.dados(int(azar.sum())) >= UMBRAL_AZAR
+                    gs, act, obj, valor = gs[ok], act[ok], obj[ok], valor[ok]
+
+                if op == _OP["dano"]:
+                    self.aplicar_dano(gs, obj, valor)
+                elif op in _ESTADOS_OBJETIVO:
+                    nombre, dano = _ESTADOS_OBJETIVO[op]
+                    getattr(self, nombre)[gs, obj] = valor
+                    if dano:
+                        self.aplicar_dano(gs, obj, dano)
+                elif op == _OP["defensa"]:
+                    self.defensa[gs, act] += valor
+                elif op == _OP["vida"]:
+                    self.vida[gs, act] += valor
+                elif op == _OP["limpieza"]:
+                    for nombre in ("sangrado", "fuego", "paralizado", "congelado"):
+                        getattr(self, nombre)[gs, act] = 0
+                elif op == _OP["suerte"]:
+                    self.suerte[gs, act] = valor
+                elif op == _OP["esquiva"]:
+                    self.esquiva[gs, act] = True
+                elif op == _OP["robar"]:
+                    self.robar(gs, act)
+                    self.robar(gs, obj)
+
+    # -- fases del turno ------------------------------------------------------
+    def efectos_de_estado(self, g, a) -> np.ndarray:
+        """Equivalente vectorizado de ``Jugador.aplicar_efectos_de_estado``."""
+        m = self.sangrado[g, a] > 0
+        gm, am = g[m], a[m]
+        self.vida[gm, am] -= 1
+        self.sangrado[gm, am] -= 1
+
+        m = self.fuego[g, a] > 0
+        gm, am = g[m], a[m]
+        con_def = self.defensa[gm, am] > 0
+        self.defensa[gm[con_def], am[con_def]] -= 1
+        self.vida[gm[~con_def], am[~con_def]] -= 1
+        self.fuego[gm, am] -= 1
+
+        salta = self.congelado[g, a] > 0
+        self.congelado[g[salta], a[salta]] -= 1
+
+        m = self.paralizado[g, a] > 0
+        if m.any():
+            gm, am = g[m], a[m]
+            salta[m] |= self.dados(len(gm)) < self.umbral(gm, am)
+            self.paralizado[gm, am] -= 1
+        return salta
+
+    def fase_cartas(self, g, a, o):
+        """Juega cartas con la política voraz (mayor nivel primero) hasta agotar opciones."""
+        t = self.tabla
+        n = len(g)
+        nivel_total = np.zeros(n, dtype=np.int16)
+        categorias = np.zeros(n, dtype=np.int32)
+        jugadas = np.zeros(n, dtype=np.int8)
+        idx = np.arange(n)
+
+        while idx.size:
+            gg, aa, oo = g[idx], a[idx], o[idx]
+            mano = self.en_mano[gg, aa]
+            cartas = self.orden[gg, aa]
+            niv = t.nivel[cartas]
+            elegible = (
+                mano
+                & (nivel_total[idx, None] + niv <= MAX_NIVEL_TURNO)
+                & ((categorias[idx, None] & t.bit_categoria[cartas]) == 0)
+            )
+            hay = elegible.any(axis=1)
+            if not hay.all():
+                idx, gg, aa, oo = idx[hay], gg[hay], aa[hay], oo[hay]
+                elegible, cartas, niv = elegible[hay], cartas[hay], niv[hay]
+                if not idx.size:
+                    break
+
+            filas = np.arange(len(idx))
+            pos = np.argmax(np.where(elegible, niv, -1), axis=1)
+            carta = cartas[filas, pos]
+
+            # Resolver AZAR / CERTERO
+            exito = np.ones(len(idx), dtype=bool)
+            azar = t.azar[carta]
+            if azar.any():
+                exito[azar] = self.dados(int(azar.sum())) >= self.umbral(gg[azar], aa[azar])
+
+            # Reacción: el oponente esquiva con su primera carta EA/EC en mano
+            reaccion = np.zeros(len(idx), dtype=bool)
+            ataque = np.flatnonzero(exito & t.ataque[carta])
+            if ataque.size:
+                cartas_op = self.orden[gg[ataque], oo[ataque]]
+                esquive = self.en_mano[gg[ataque], oo[ataque]] & t.esquive[cartas_op]
+                tiene = esquive.any(axis=1)
+                if tiene.any():
+                    r = ataque[tiene]
+                    pos_esq = np.argmax(esquive[tiene], axis=1)
+                    carta_esq = cartas_op[tiene][np.arange(len(r)), pos_esq]
+                    self.aplicar_cartas(gg[r], oo[r], aa[r], carta_esq)
+                    self.en_mano[gg[r], oo[r], pos_esq] = False
+                    reaccion[r] = True
+
+            aplica = exito & ~reaccion
+            if aplica.any():
+                self.aplicar_cartas(gg[aplica], aa[aplica], oo[aplica], carta[aplica])
+                ia = idx[aplica]
+                nivel_total[ia] += t.nivel[carta[aplica]]
+                categorias[ia] |= t.bit_categoria[carta[aplica]]
+                jugadas[ia] += 1
+
+            # Descartar siempre la carta elegida
+            self.en_mano[gg, aa, pos] = False
+            idx = idx[jugadas[idx] < MAX_CARTAS_TURNO]
+
+    def jugar_turno(self):
+        g = np.flatnonzero(self.activa)
+        a = self.actual[g].astype(np.intp)
+        o = 1 - a
+
+        salta = self.efectos_de_estado(g, a)
+        juega = ~salta
+        self.fase_cartas(g[juega], a[juega], o[juega])
+
+        # terminar_turno: robar 1 y descontar suerte
+        self.robar(g, a)
+        suerte = self.suerte[g, a]
+        self.suerte[g, a] = np.where(suerte > 0, suerte - 1, 0)
+        self.actual[g] = o
+
+        con_cartas = (self.cursor[g] < self.largo) | self.en_mano[g].any(axis=2)
+        sigue = ((self.vida[g] > 0) & con_cartas).all(axis=1)
+        self.activa[g] = sigue
+
+    def simular(self, max_turnos: int = 10_000):
+        turnos = 0
+        while self.activa.any() and turnos < max_turnos:
+            self.jugar_turno()
+            turnos += 1
+        v1, v2 = self.vida[:, 0], self.vida[:, 1]
+        return np.where(v1 > v2, 0, np.where(v2 > v1, 1, 2)).astype(np.int8)
+
+
+def simular_lote(tabla: TablaCartas, mazo1: np.ndarray, mazo2: np.ndarray,
+                 k: int, semilla) -> dict:
+    """
+    Simula ``k`` partidas en paralelo de datos y devuelve sus resultados finales.
+
+    Returns:
+        dict: arreglos ``ganador`` (0, 1 o 2 según ``GANADORES``), ``vida`` y
+        ``defensa`` con forma ``(k, 2)``.
+    """
+    estado = EstadoLote(tabla, mazo1, mazo2, k, np.random.default_rng(semilla))
+    ganador = estado.simular()
+    return {"ganador": ganador, "vida": estado.vida, "defensa": estado.defensa}
@@ -0,0 +1,222 @@
+# optimizador.py
+# -*- coding: utf-8 -*-
+# Optimizador genético de mazos: busca, dentro de los mazos que puede armar
+# construir_mazo_random (un set por pieza, cartas de ese set por nivel y las
+# cartas extra), el que más gana contra un grupo de rivales.
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rulkanis.azar import Dados
+from rulkanis.catalogo import obtener_catalogo, nuevo_mazo
+from rulkanis.datos_rulkanis import distribucion_equipamiento
+from rulkanis.estadistica import CODIGO_GANADOR
+from rulkanis.mazo import PIEZAS, SETS, DISTRIBUCION_EXTRAS, huella_mazo
+from rulkanis.simulador import contar_victorias
+from rulkanis.torneo import origen_de
+
+# Un mazo legal:
+#   sets: índice en SETS del set de cada pieza de PIEZAS.
+#   cartas: id de la carta de cada ranura de RANURAS.
+#   extras: ids de las cartas extra, agrupadas por nivel como en DISTRIBUCION_EXTRAS.
+Genoma = namedtuple("Genoma", ("sets", "cartas", "extras"))
+
+# (índice de pieza, nivel) de cada carta de equipamiento, en el orden de construir_mazo_random
+RANURAS = tuple(
+    (p, nivel)
+    for p, pieza in enumerate(PIEZAS)
+    for nivel, cantidad in distribucion_equipamiento.get(pieza, {}).items()
+    for _ in range(cantidad)
+)
+# Nivel de cada posición de ``Genoma.extras``
+NIVELES_EXTRAS = tuple(nivel for nivel, cantidad in DISTRIBUCION_EXTRAS.items() for _ in range(cantidad))
+
+
+def _opciones_ranura(sets: tuple, ranura: int) -> tuple:
+    p, nivel = RANURAS[ranura]
+    return obtener_catalogo().por_pieza[(SETS[sets[p]], PIEZAS[p], nivel)]
+
+
+def _extras_aleatorios(dados: Dados, nivel: int) -> list:
+    return dados.muestra(obtener_catalogo().por_nivel.get(nivel, ()), DISTRIBUCION_EXTRAS[nivel])
+
+
+def genoma_aleatorio(dados: Dados) -> Genoma:
+    """Mazo legal al azar, con las mismas reglas que ``construir_mazo_random``."""
+    sets = tuple(int(dados.gen.integers(len(SETS))) for _ in PIEZAS)
+    cartas = tuple(dados.elegir(_opciones_ranura(sets, r)) for r in range(len(RANURAS)))
+    extras = tuple(i for nivel in DISTRIBUCION_EXTRAS for i in _extras_aleatorios(dados, nivel))
+    return Genoma(sets, cartas, extras)
+
+
+def mazo_de(genoma: Genoma) -> tuple:
+    """(mazo, origen) de un genoma, como los devuelve ``construir_mazo_random``."""
+    return nuevo_mazo(genoma.cartas + genoma.extras), origen_de(genoma.sets)
+
+
+def mutar(genoma: Genoma, dados: Dados, probabilidad: float) -> Genoma:
+    """
+    Copia de ``genoma`` en la que, cada una con ``probabilidad``: una pieza
+    cambia de set (y se vuelven a sortear sus cartas), una carta de
+    equipamiento se cambia por otra de su ranura y una extra por otra del mismo
+    nivel que no esté ya entre las extras.
+    """
+    azar = dados.gen.random
+    sets = list(genoma.sets)
+    cartas = list(genoma.cartas)
+    for p in range(len(PIEZAS)):
+        if azar() < probabilidad:
+            sets[p] = int(dados.gen.integers(len(SETS)))
+            for r, (pieza, _) in enumerate(RANURAS):
+                if pieza == p:
+                    cartas[r] = dados.elegir(_opciones_ranura(sets, r))
+    for r in range(len(RANURAS)):
+        if azar() < probabilidad:
+            cartas[r] = dados.elegir(_opciones_ranura(sets, r))
+    extras = list(genoma.extras)
+    for k, nivel in enumerate(NIVELES_EXTRAS):
+        if azar() < probabilidad:
+            opciones = [i for i in obtener_catalogo().por_nivel.get(nivel, ()) if i not in extras]
+            if opciones:
+                extras[k] = dados.elegir(opciones)
+    return Genoma(tuple(sets), tuple(cartas), tuple(extras))
+
+
+def cruzar(a: Genoma, b: Genoma, dados: Dados) -> Genoma:
+    """
+    Hijo de ``a`` y ``b``: cada pieza (su set con sus cartas) y cada grupo de
+    extras de un nivel sale entero de uno de los dos padres, así el hijo
+    siempre es legal.
+    """
+    de_a = [dados.gen.random() < 0.5 for _ in PIEZAS]
+    sets = tuple(x if de_a[p] else y for p, (x, y) in enumerate(zip(a.sets, b.sets)))
+    cartas = tuple(
+        x if de_a[p] else y for (p, _), x, y in zip(RANURAS, a.cartas, b.cartas)
+    )
+    extras = []
+    inicio = 0
+    for cantidad in DISTRIBUCION_EXTRAS.values():
+        padre = a if dados.gen.random() < 0.5 else b
+        extras.extend(padre.extras[inicio:inicio + cantidad])
+        inicio += cantidad
+    return Genoma(sets, cartas, tuple(extras))
+
+
+def huella_genoma(genoma: Genoma) -> str:
+    """Huella del mazo del genoma (ver ``mazo.huella_mazo``)."""
+    return huella_mazo(*mazo_de(genoma))
+
+
+def _evaluar(genoma: Genoma, rivales: list, repeticiones: int, seed: int, motor: str) -> tuple:
+    """(victorias, partidas) de ``genoma`` contra todos los ``rivales``."""
+    mazo, origen = mazo_de(genoma)
+    victorias = 0
+    for mazo_rival, origen_rival in rivales:
+        conteo = contar_victorias(mazo, origen, mazo_rival, origen_rival, repeticiones, seed, motor)
+        victorias += int(conteo[CODIGO_GANADOR["Jugador 1"]])
+    return victorias, repeticiones * len(rivales)
+
+
+def _seleccionar(poblacion: list, aptitud: list, dados: Dados, tam: int = 3) -> Genoma:
+    """Selección por torneo: el más apto de ``tam`` individuos al azar."""
+    elegidos = dados.gen.integers(len(poblacion), size=tam)
+    return poblacion[max(elegidos.tolist(), key=lambda i: aptitud[i])]
+
+
+def optimizar_mazo(
+    rivales: list,
+    generaciones: int = 20,
+    poblacion: int = 32,
+    repeticiones: int = 500,
+    elite: int = 2,
+    prob_mutacion: float = 0.1,
+    workers: int = None,
+    seed: int = 0,
+    motor: str = "clasico",
+    aptitudes: dict = None,
+):
+    """
+    Busca el mazo con mayor porcentaje de victorias contra ``rivales`` con un
+    algoritmo genético.
+
+    La aptitud de un mazo es su fracción de victorias jugando ``repeticiones``
+    partidas contra cada rival. Todas las evaluaciones usan la misma ``seed``,
+    así las diferencias entre candidatos no se mezclan con diferencias de azar,
+    y se guardan por huella de mazo: un candidato repetido no se vuelve a
+    simular. Las evaluaciones nuevas de cada generación se reparten en un pool
+    de procesos; el resultado no depende de ``workers``.
+
+    Args:
+        rivales (list): Pares (mazo, origen) contra los que se evalúa.
+        generaciones (int): Generaciones a evolucionar.
+        poblacion (int): Individuos por generación.
+        repeticiones (int): Partidas contra cada rival por evaluación.
+        elite (int): Mejores individuos que pasan sin cambios a la siguiente generación.
+        prob_mutacion (float): Probabilidad de mutar cada pieza, carta y extra.
+        workers (int): Procesos; por defecto ``os.cpu_count()``.
+        seed (int): Semilla del algoritmo y de las partidas.
+        motor (str): "clasico" o "vectorizado" (ver ``simular_varias_partidas``).
+        aptitudes (dict): Huella -> (victorias, partidas) de evaluaciones
+            previas con los mismos rivales, repeticiones, seed y motor; se
+            completa con las nuevas.
+
+    Returns:
+        tuple: (mejor, porcentaje, historial): el ``Genoma`` más apto (ver
+        ``mazo_de``), su porcentaje de victorias y un DataFrame con el mejor
+        y el promedio de cada generación y cuántas evaluaciones se simularon.
+    """
+    if not rivales:
+        raise ValueError("Se necesita al menos un rival")
+    rivales = [(nuevo_mazo(m), dict(o or {})) for m, o in rivales]
+    workers = workers or os.cpu_count() or 1
+    aptitudes = {} if aptitudes is None else aptitudes
+    dados = Dados(seed)
+    individuos = [genoma_aleatorio(dados) for _ in range(poblacion)]
+    mejor, mejor_aptitud = None, -1.0
+    historial = []
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for generacion in range(1, generaciones + 1):
+            huellas = [huella_genoma(g) for g in individuos]
+            nuevos = {}
+            for h, g in zip(huellas, individuos):
+                if h not in aptitudes:
+                    nuevos.setdefault(h, g)
+            argumentos = (list(nuevos.values()), *(
+                [x] * len(nuevos) for x in (rivales, repeticiones, seed, motor)
+            ))
+            resultados = pool.map(_evaluar, *argumentos) if pool else map(_evaluar, *argumentos)
+            aptitudes.update(zip(nuevos, resultados))
+
+            aptitud = [aptitudes[h][0] / aptitudes[h][1] for h in huellas]
+            orden = sorted(range(len(individuos)), key=lambda i: -aptitud[i])
+            if aptitud[orden[0]] > mejor_aptitud:
+                mejor, mejor_aptitud = individuos[orden[0]], aptitud[orden[0]]
+            historial.append({
+                "Generación": generacion,
+                "Mejor": round(100 * aptitud[orden[0]], 2),
+                "Promedio": round(100 * float(np.mean(aptitud)), 2),
+                "Evaluaciones": len(nuevos),
+            })
+            if generacion == generaciones:
+                break
+
+            siguiente = [individuos[i] for i in orden[:elite]]
+            while len(siguiente) < poblacion:
+                hijo = cruzar(
+                    _seleccionar(individuos, aptitud, dados),
+                    _seleccionar(individuos, aptitud, dados),
+                    dados,
+                )
+                siguiente.append(mutar(hijo, dados, prob_mutacion))
+            individuos = siguiente
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return mejor, 100 * mejor_aptitud, pd.DataFrame(historial)
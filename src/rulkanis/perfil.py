@@ -0,0 +1,107 @@
+# perfil.py
+# -*- coding: utf-8 -*-
+# Instrumentación opcional por fases del bucle de juego y de la exportación.
+# Las funciones reciben ``perfil=None`` y solo miden si se les pasa un
+# Perfilador, así desactivado cuesta una comparación con None.
+
+import contextlib
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from rulkanis.azar import Dados
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Perfilador:
+    """
+    Tiempo acumulado y llamadas por fase, más contadores de eventos.
+
+    Las fases se miden por separado y pueden anidarse (p. ej. "reaccion"
+    incluye las "reglas.*" de la carta de esquive), así que sus tiempos no
+    siempre suman el total.
+
+    Atributos:
+        tiempos (dict): fase -> segundos acumulados.
+        llamadas (dict): fase -> veces que se midió.
+        contadores (dict): nombre -> cantidad (turnos, cartas jugadas, dados, …).
+    """
+
+    __slots__ = ("tiempos", "llamadas", "contadores")
+
+    def __init__(self):
+        self.tiempos = {}
+        self.llamadas = {}
+        self.contadores = {}
+
+    def sumar(self, fase: str, t0: float):
+        """Suma a ``fase`` el tiempo transcurrido desde ``t0`` (``perf_counter``)."""
+        self.tiempos[fase] = self.tiempos.get(fase, 0.0) + perf_counter() - t0
+        self.llamadas[fase] = self.llamadas.get(fase, 0) + 1
+
+    def contar(self, nombre: str, cantidad: int = 1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    @contextlib.contextmanager
+    def medir(self, fase: str):
+        """Context manager que mide el bloque como una llamada de ``fase``."""
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar(fase, t0)
+
+    def combinar(self, otro: "Perfilador"):
+        """Acumula las mediciones de ``otro`` (p. ej. de un bloque simulado en otro proceso)."""
+        for fase, segundos in otro.tiempos.items():
+            self.tiempos[fase] = self.tiempos.get(fase, 0.0) + segundos
+            self.llamadas[fase] = self.llamadas.get(fase, 0) + otro.llamadas[fase]
+        for nombre, cantidad in otro.contadores.items():
+            self.contar(nombre, cantidad)
+
+    def tabla(self) -> "pd.DataFrame":
+        """
+        Informe con una fila por fase (segundos, llamadas y microsegundos por
+        llamada, de mayor a menor tiempo) y una por contador.
+        """
+        import pandas as pd
+
+        fases = sorted(self.tiempos, key=self.tiempos.get, reverse=True)
+        filas = [
+            {
+                "Tipo": "fase",
+                "Nombre": fase,
+                "Segundos": round(self.tiempos[fase], 6),
+                "Cantidad": self.llamadas[fase],
+                "us por llamada": round(1e6 * self.tiempos[fase] / self.llamadas[fase], 3),
+            }
+            for fase in fases
+        ]
+        filas += [
+            {"Tipo": "contador", "Nombre": nombre, "Cantidad": cantidad}
+            for nombre, cantidad in sorted(self.contadores.items())
+        ]
+        return pd.DataFrame(filas, columns=["Tipo", "Nombre", "Segundos", "Cantidad", "us por llamada"])
+
+    def __repr__(self):
+        return f"Perfilador({len(self.tiempos)} fases, {len(self.contadores)} contadores)"
+
+
+def medir(perfil: Perfilador, fase: str):
+    """``perfil.medir(fase)``, o un context manager vacío si ``perfil`` es None."""
+    return contextlib.nullcontext() if perfil is None else perfil.medir(fase)
+
+
+class DadosContados(Dados):
+    """``Dados`` que cuenta las tiradas; misma secuencia de resultados que ``Dados``."""
+
+    __slots__ = ("tiradas",)
+
+    def __init__(self, semilla=None):
+        self.tiradas = 0
+        super().__init__(semilla)
+
+    def tirar(self) -> int:
+        self.tiradas += 1
+        return Dados.tirar(self)
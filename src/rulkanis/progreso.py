@@ -0,0 +1,166 @@
+# progreso.py
+# -*- coding: utf-8 -*-
+# Avance de corridas largas: un informe con frecuencia limitada (partidas/s,
+# tiempo restante y porcentajes parciales) y corridas en segundo plano que se
+# pueden consultar y cancelar sin bloquear, p. ej., una celda de Jupyter.
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from rulkanis.estadistica import GANADORES
+
+# Segundos mínimos entre dos líneas del informe
+INTERVALO_PROGRESO = 1.0
+
+
+def _formato_tiempo(segundos: float) -> str:
+    segundos = int(segundos)
+    return f"{segundos // 3600}:{segundos // 60 % 60:02d}:{segundos % 60:02d}"
+
+
+class ReporteProgreso:
+    """
+    Informe de avance para el argumento ``progreso`` de ``simular_varias_partidas``
+    e ``iter_partidas``: escribe a lo sumo una línea cada ``intervalo`` segundos
+    con las partidas jugadas, el ritmo, el tiempo restante estimado y el
+    porcentaje de cada resultado.
+
+    Args:
+        total (int): Partidas previstas (para el porcentaje y el tiempo restante).
+        intervalo (float): Segundos mínimos entre líneas.
+        archivo: Dónde escribir; por defecto ``sys.stdout``.
+        en_linea (bool): Reescribir siempre la misma línea (con ``\\r``). Por
+            defecto sí en una terminal o en Jupyter, y no al escribir a un archivo.
+    """
+
+    def __init__(self, total: int, intervalo: float = INTERVALO_PROGRESO, archivo=None,
+                 en_linea: bool = None):
+        self.total = total
+        self.intervalo = intervalo
+        self.archivo = archivo or sys.stdout
+        if en_linea is None:
+            en_linea = "ipykernel" in sys.modules or getattr(self.archivo, "isatty", lambda: False)()
+        self.en_linea = en_linea
+        self.partidas = 0
+        self.conteo = None
+        self._t0 = perf_counter()
+        self._ultimo = float("-inf")
+        self._escritas = None  # partidas de la última línea escrita
+
+    def __call__(self, partidas: int, conteo):
+        self.partidas = partidas
+        self.conteo = [int(x) for x in conteo]
+        ahora = perf_counter()
+        if ahora - self._ultimo >= self.intervalo or partidas >= self.total:
+            self._ultimo = ahora
+            self._escribir(self.linea(ahora))
+
+    def linea(self, ahora: float = None) -> str:
+        """Texto del estado actual."""
+        segundos = (ahora or perf_counter()) - self._t0
+        ritmo = self.partidas / segundos if segundos > 0 else 0.0
+        partes = [f"{self.partidas:,}/{self.total:,} ({100 * self.partidas / max(self.total, 1):.1f}%)",
+                  f"{ritmo:,.0f} partidas/s"]
+        if ritmo > 0 and self.partidas < self.total:
+            partes.append(f"faltan {_formato_tiempo((self.total - self.partidas) / ritmo)}")
+        if self.partidas and self.conteo:
+            partes.append(" ".join(
+                f"{nombre} {100 * n / self.partidas:.1f}%" for nombre, n in zip(GANADORES, self.conteo)
+            ))
+        return " · ".join(partes)
+
+    def _escribir(self, texto: str):
+        if self.en_linea:
+            self.archivo.write("\r" + texto)
+        else:
+            self.archivo.write(texto + "\n")
+        self.archivo.flush()
+        self._escritas = self.partidas
+
+    def terminar(self):
+        """Escribe la línea final (aunque la corrida haya terminado antes de ``total``)."""
+        if self.partidas and self._escritas != self.partidas:
+            self._escribir(self.linea())
+        if self.en_linea and self._escritas is not None:
+            self.archivo.write("\n")
+            self.archivo.flush()
+
+
+class CorridaEnSegundoPlano:
+    """
+    ``simular_varias_partidas`` corriendo en un hilo aparte (ver
+    ``simular_en_segundo_plano``). Se puede consultar el avance, cancelar
+    (se resume lo ya jugado) o esperar el resultado.
+
+    Atributos:
+        total (int): Partidas pedidas.
+        partidas (int): Partidas jugadas hasta el momento.
+        conteo (list): Partidas por resultado, en el orden de ``GANADORES``.
+        futuro (concurrent.futures.Future): Resultado de ``simular_varias_partidas``.
+    """
+
+    def __init__(self, argumentos: tuple, opciones: dict):
+        self.total = argumentos[4]
+        self.partidas = 0
+        self.conteo = [0] * len(GANADORES)
+        self._cancelar = threading.Event()
+        self._progreso = opciones.pop("progreso", None)
+        if self._progreso is True:
+            self._progreso = ReporteProgreso(self.total)
+        opciones.setdefault("write_excel", False)
+        from rulkanis.simulador import simular_varias_partidas  # simulador importa este módulo
+
+        hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rulkanis")
+        self.futuro = hilo.submit(
+            simular_varias_partidas, *argumentos,
+            progreso=self._avanzar, cancelar=self._cancelar, **opciones,
+        )
+        hilo.shutdown(wait=False)
+        if isinstance(self._progreso, ReporteProgreso):
+            self.futuro.add_done_callback(lambda _: self._progreso.terminar())
+
+    def _avanzar(self, partidas: int, conteo):
+        self.partidas = partidas
+        self.conteo = [int(x) for x in conteo]
+        if self._progreso:
+            self._progreso(partidas, conteo)
+
+    def cancelar(self):
+        """Pide terminar tras el bloque en curso; ``resultado()`` resume lo jugado."""
+        self._cancelar.set()
+
+    def hecha(self) -> bool:
+        return self.futuro.done()
+
+    def resultado(self, timeout: float = None):
+        """Espera y devuelve lo mismo que ``simular_varias_partidas``."""
+        return self.futuro.result(timeout)
+
+    def porcentajes(self) -> dict:
+        """Porcentaje parcial de cada resultado."""
+        return {
+            nombre: 100 * n / self.partidas if self.partidas else float("nan")
+            for nombre, n in zip(GANADORES, self.conteo)
+        }
+
+    def __repr__(self):
+        estado = "terminada" if self.hecha() else (
+            "cancelando" if self._cancelar.is_set() else "jugando"
+        )
+        parciales = ", ".join(f"{k} {v:.1f}%" for k, v in self.porcentajes().items())
+        return f"<CorridaEnSegundoPlano {estado}: {self.partidas:,}/{self.total:,} partidas; {parciales}>"
+
+
+def simular_en_segundo_plano(mazo1, origen1, mazo2, origen2, repeticiones: int, **opciones):
+    """
+    Lanza ``simular_varias_partidas`` en un hilo y vuelve enseguida, así una
+    celda de Jupyter no queda bloqueada. Las opciones son las de
+    ``simular_varias_partidas`` (``write_excel`` es False por defecto; un
+    ``progreso`` propio se sigue llamando).
+
+    Returns:
+        CorridaEnSegundoPlano: Para consultar el avance, cancelar o esperar el resultado.
+    """
+    return CorridaEnSegundoPlano((mazo1, origen1, mazo2, origen2, repeticiones), opciones)
@@ -0,0 +1,179 @@
+# punto_control.py
+# -*- coding: utf-8 -*-
+# Puntos de control de simulaciones largas: el estado agregado de una corrida de
+# simular_varias_partidas (partidas contadas, conteo por resultado, parada) y
+# las filas de resumen y detalle jugadas desde el punto anterior se guardan en
+# disco de forma atómica, así una corrida interrumpida se reanuda donde quedó.
+#
+# Cada partida usa una semilla derivada de la semilla de la corrida y de su
+# número (ver azar.secuencia_partida), así que la posición del generador es
+# solo la próxima partida a jugar: reanudar desde ahí juega exactamente las
+# mismas partidas que una corrida sin cortes.
+
+import glob
+import json
+import os
+import pickle
+import time
+
+# Estado agregado de la corrida dentro del directorio del punto de control
+ARCHIVO_ESTADO = "estado.npz"
+# Filas jugadas entre dos puntos de control: parte_00001.pkl, parte_00002.pkl, …
+PATRON_PARTE = "parte_{:05d}.pkl"
+# Segundos entre puntos de control por defecto
+SEGUNDOS_CHECKPOINT = 60.0
+# Paradas tras las cuales la corrida está completa y no se juega nada más
+PARADAS_FINALES = ("repeticiones", "precisión alcanzada")
+
+
+class PuntoControl:
+    """
+    Puntos de control de una corrida en ``directorio``.
+
+    ``ARCHIVO_ESTADO`` guarda los parámetros de la corrida, las partidas
+    contadas, el conteo por resultado, si se alcanzó la precisión, el motivo de
+    la última parada y cuántas partes de filas son válidas. Cada parte guarda
+    los bloques ``(resumen, detalle)`` jugados desde el punto anterior; las
+    partes se escriben antes que el estado, así un corte entre ambas deja una
+    parte de más que se ignora al reanudar.
+
+    Atributos:
+        directorio (str): Carpeta del punto de control.
+        meta (dict): Parámetros de la corrida (mazos, semilla, motor, …); al
+            reanudar deben coincidir con los de la corrida nueva.
+        partidas (int): Partidas contadas en el último punto guardado.
+        conteo (list): Partidas por resultado en ese punto.
+        detenida (bool): Si la precisión objetivo ya se había alcanzado.
+        parada (str): Motivo de la última parada guardada (None si nunca paró).
+        partes (int): Partes de filas válidas.
+    """
+
+    def __init__(self, directorio: str, cada_partidas: int = None,
+                 cada_segundos: float = SEGUNDOS_CHECKPOINT):
+        """
+        Args:
+            directorio (str): Carpeta donde guardar el estado; se crea si no existe.
+            cada_partidas (int): Guardar cada tantas partidas (None: solo por tiempo).
+            cada_segundos (float): Guardar cada tantos segundos (None: solo por partidas).
+        """
+        self.directorio = directorio
+        self.cada_partidas = cada_partidas
+        self.cada_segundos = cada_segundos
+        self.ruta = os.path.join(directorio, ARCHIVO_ESTADO)
+        self.meta = None
+        self.partidas = 0
+        self.conteo = None
+        self.detenida = False
+        self.parada = None
+        self.partes = 0
+        self._bloques = []
+        self._ultimas_partidas = 0
+        self._ultima_hora = time.monotonic()
+
+    def existe(self) -> bool:
+        return os.path.exists(self.ruta)
+
+    def cargar(self):
+        """Lee el estado guardado (ver ``existe``)."""
+        import numpy as np
+
+        with np.load(self.ruta) as datos:
+            estado = json.loads(str(datos["estado"]))
+            self.conteo = datos["conteo"].tolist()
+        self.meta = estado["meta"]
+        self.partidas = estado["partidas"]
+        self.detenida = estado["detenida"]
+        self.parada = estado["parada"]
+        self.partes = estado["partes"]
+        self._ultimas_partidas = self.partidas
+
+    def iniciar(self, meta: dict):
+        """
+        Fija los parámetros de la corrida. Si se cargó un estado, comprueba que
+        coincidan con los guardados; si no, borra las partes de una corrida
+        anterior que nunca llegó a guardar su estado.
+
+        Raises:
+            ValueError: Si algún parámetro difiere del estado cargado.
+        """
+        meta = json.loads(json.dumps(meta, default=int))
+        if self.meta is not None:
+            distintos = sorted(k for k in meta if meta[k] != self.meta.get(k))
+            if distintos:
+                raise ValueError(
+                    f"El punto de control de '{self.directorio}' es de otra corrida "
+                    f"(difiere {', '.join(distintos)})"
+                )
+        else:
+            os.makedirs(self.directorio, exist_ok=True)
+            self.meta = meta
+        validas = {os.path.join(self.directorio, PATRON_PARTE.format(n)) for n in range(1, self.partes + 1)}
+        for ruta in glob.glob(os.path.join(self.directorio, "parte_*.pkl")):
+            if ruta not in validas:
+                os.remove(ruta)
+
+    @property
+    def terminada(self) -> bool:
+        """True si la corrida guardada ya jugó todo lo que tenía que jugar."""
+        return self.parada in PARADAS_FINALES
+
+    def restaurar(self, seguimiento):
+        """Deja ``seguimiento`` (``SeguimientoVictorias``) como en el último punto guardado."""
+        if self.conteo is not None:
+            seguimiento.conteo[:] = self.conteo
+        seguimiento.partidas = self.partidas
+        seguimiento.detenida = self.detenida
+
+    def bloques_guardados(self):
+        """Recorre, en orden de partida, los bloques ``(resumen, detalle)`` de las partes válidas."""
+        for n in range(1, self.partes + 1):
+            with open(os.path.join(self.directorio, PATRON_PARTE.format(n)), "rb") as f:
+                yield from pickle.load(f)
+
+    def agregar(self, resumen, detalle):
+        """Anota las filas de un bloque para la próxima parte (si hay filas)."""
+        if resumen is not None or detalle is not None:
+            self._bloques.append((resumen, detalle))
+
+    def toca(self, partidas: int) -> bool:
+        """Si corresponde guardar tras llegar a ``partidas`` partidas contadas."""
+        if self.cada_partidas is not None and partidas - self._ultimas_partidas >= self.cada_partidas:
+            return True
+        return self.cada_segundos is not None and time.monotonic() - self._ultima_hora >= self.cada_segundos
+
+    def guardar(self, seguimiento, parada: str = None):
+        """
+        Escribe la parte con los bloques anotados y luego el estado de
+        ``seguimiento``; ``parada`` es el motivo si la corrida terminó o se cortó.
+        """
+        import numpy as np
+
+        # Escritura atómica (temporal + os.replace): un corte a mitad del
+        # guardado no pierde el archivo previo
+        if self._bloques:
+            ruta = os.path.join(self.directorio, PATRON_PARTE.format(self.partes + 1))
+            with open(ruta + ".tmp", "wb") as f:
+                pickle.dump(self._bloques, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(ruta + ".tmp", ruta)
+            self.partes += 1
+            self._bloques = []
+        self.partidas = seguimiento.partidas
+        self.conteo = seguimiento.conteo.tolist()
+        self.detenida = seguimiento.detenida
+        self.parada = parada
+        estado = {
+            "meta": self.meta,
+            "partidas": self.partidas,
+            "detenida": self.detenida,
+            "parada": parada,
+            "partes": self.partes,
+        }
+        temporal = self.ruta + ".tmp.npz"
+        np.savez(temporal, estado=np.asarray(json.dumps(estado, ensure_ascii=False)),
+                 conteo=np.asarray(self.conteo, dtype=np.int64))
+        os.replace(temporal, self.ruta)
+        self._ultimas_partidas = self.partidas
+        self._ultima_hora = time.monotonic()
+
+    def __repr__(self):
+        return f"PuntoControl('{self.directorio}', {self.partidas} partidas, {self.partes} partes)"
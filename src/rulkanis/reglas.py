@@ -1,11 +1,69 @@
 # reglas.py
 # Implementación de reglas y handlers para Rulkanis
-import random
+from time import perf_counter
+from typing import TYPE_CHECKING
 from rulkanis.datos_rulkanis import nomenclaturas as _nomenclaturas
-from rulkanis.jugador import Jugador
 from rulkanis.carta import Carta
+from rulkanis.eventos import (
+    INDICE_CODIGO,
+    EV_CARTA,
+    EV_DANO_ESQUIVADO,
+    EV_DANO_DEFENSA,
+    EV_DANO_VIDA,
+    EV_ATAQUE,
+    EV_ESTADO_APLICADO,
+    EV_ESTADO_FALLIDO,
+    EV_DEFENSA,
+    EV_VIDA,
+    EV_LIMPIEZA,
+    EV_SUERTE,
+    EV_ESQUIVA,
+    EV_ROBAR,
+)
+
+if TYPE_CHECKING:
+    # jugador y azar importan los parámetros de este módulo
+    from rulkanis.jugador import Jugador
+
+# ---------------------------------------------------------------------------
+#  Parámetros de las reglas
+CARAS_DADO = 10
+UMBRAL_AZAR = 6          # dado mínimo para aplicar una acción AZAR
+UMBRAL_AZAR_SUERTE = 4   # dado mínimo con Bufo Suerte activo
+TURNOS_SANGRADO = 3
+TURNOS_FUEGO = 3
+TURNOS_PARALIZADO = 2
+TURNOS_CONGELADO = 1
+TURNOS_SUERTE = 4
+DANO_INICIAL_ESTADO = 1  # daño inmediato al aplicar sangrado o fuego
+VIDA_INICIAL = 15        # vida con la que empieza cada Jugador
+CARTAS_INICIALES = 5
+MAX_CARTAS_TURNO = 3
+MAX_NIVEL_TURNO = 10
+CATEGORIAS_ATAQUE = ("ataque", "sangrado", "fuego")
+CODIGOS_ESQUIVE = ("EA", "EC")
+
+# Efecto declarativo de cada código: (operación, valor, azar).
+# Las instrucciones de abajo y el motor vectorizado se construyen a partir de esta tabla.
+EFECTOS = {
+    'AL': ('dano', 1, False), 'AN': ('dano', 2, False), 'AC': ('dano', 3, False),
+    'SA': ('sangrado', TURNOS_SANGRADO, True), 'SC': ('sangrado', TURNOS_SANGRADO, False),
+    'FA': ('fuego', TURNOS_FUEGO, True), 'FC': ('fuego', TURNOS_FUEGO, False),
+    'BD': ('defensa', 1, False), 'BDN': ('defensa', 2, False), 'BDF': ('defensa', 3, False),
+    'BVP': ('vida', 1, False), 'BVM': ('vida', 2, False), 'BVG': ('vida', 3, False),
+    'PA': ('paralizar', TURNOS_PARALIZADO, True), 'PC': ('paralizar', TURNOS_PARALIZADO, False),
+    'CA': ('congelar', TURNOS_CONGELADO, True), 'CC': ('congelar', TURNOS_CONGELADO, False),
+    'BLA': ('limpieza', 0, False), 'BS': ('suerte', TURNOS_SUERTE, False),
+    'EA': ('esquiva', 0, True), 'EC': ('esquiva', 0, False),
+    'RC': ('robar', 1, False),
+}
+
+
+def umbral_dado(jugador: "Jugador") -> int:
+    """Dado mínimo para que una carta AZAR tenga éxito."""
+    return UMBRAL_AZAR_SUERTE if jugador.tiene_suerte() else UMBRAL_AZAR
 
-def determinar_exito_carta(carta: Carta, actual: Jugador):
+def determinar_exito_carta(carta: Carta, actual: "Jugador"):
     """
     Determina si una carta tiene éxito o falla al ser jugada por un jugador.
 
@@ -14,201 +72,174 @@ def determinar_exito_carta(carta: Carta, actual: Jugador):
         actual (Jugador): El jugador que está jugando la carta.
 
     Returns:
-        None: La función no retorna un valor, pero registra un evento con el resultado
-        de la evaluación de la carta (éxito o fallo) y, si aplica, el valor del dado lanzado.
+        tuple: (exito, evento, resultado, dado). ``evento`` es el evento estructurado
+        ``EV_CARTA`` con el resultado de la evaluación y, si aplica, el dado lanzado.
 
     Notas:
         - Si la carta es de tipo "AZAR", se lanza un dado para determinar el éxito.
         - El límite para el éxito del dado depende de si el jugador tiene suerte.
-        - El evento generado incluye el nombre de la carta, el resultado (éxito o fallo),
-          y el valor del dado si corresponde.
     """
-    exito = True
-    dado = "-"
     if carta.tipo == "AZAR":
         d = actual.lanzar_dado()
-        limite = 4 if actual.tiene_suerte() else 6
-        exito = d >= limite
-        dado = d
-
-    resultado = "Éxito" if exito else "Fallo"
-    evento = f"{carta.nombre} ({resultado}"
-    if dado != "-":
-        evento += f", dado={dado}"
-    evento += ")"
-
-    return exito, evento, resultado, dado
+        exito = d >= umbral_dado(actual)
+        return exito, (EV_CARTA, carta.id, exito, d), "Éxito" if exito else "Fallo", d
+    return True, (EV_CARTA, carta.id, True, 0), "Éxito", "-"
 
-# Aplica daño considerando esquiva y defensa
-def aplicar_dano(jugador: Jugador, cantidad: int):
+# Aplica daño considerando esquiva y defensa.
+# Devuelve el resultado como evento estructurado (EV_DANO_*).
+def aplicar_dano(jugador: "Jugador", cantidad: int):
     # Esquiva
-    if jugador.estado.get('esquiva', False):
-        jugador.estado['esquiva'] = False
-        return "Daño esquivado"
+    if jugador.esquiva:
+        jugador.esquiva = False
+        return (EV_DANO_ESQUIVADO,)
     # Defensa
-    def_val = jugador.estado.get('defensa', 0)
+    def_val = jugador.defensa
     if def_val >= cantidad:
-        jugador.estado['defensa'] = def_val - cantidad
-        return f"{cantidad} absorbido por defensa (defensa ahora {jugador.estado['defensa']})"
+        jugador.defensa = def_val - cantidad
+        return (EV_DANO_DEFENSA, cantidad, jugador.defensa)
     # Resto a vida
     restante = cantidad - def_val
-    jugador.estado['defensa'] = 0
+    jugador.defensa = 0
     jugador.vida -= restante
-    return f"{def_val} absorbido, {restante} a vida (vida ahora {jugador.vida})"
-
-# Handlers de acciones específicas
-def accion_AL(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    evento = aplicar_dano(oponente, 1)
-    eventos.append(f"Ataque Ligero: {evento}")
-
-def accion_AN(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    evento = aplicar_dano(oponente, 2)
-    eventos.append(f"Ataque Normal: {evento}")
-
-def accion_AC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    evento = aplicar_dano(oponente, 3)
-    eventos.append(f"Ataque Crítico: {evento}")
-
-def accion_SA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    d = actual.lanzar_dado()
-    if d >= 6:
-        oponente.estado['sangrado'] = 3
-        evento = aplicar_dano(oponente, 1)
-        eventos.append(f"Sangrado Azar: aplicado (dado={d}, 1×3 turnos)")
-    else:
-        eventos.append(f"Sangrado Azar: fallido (dado={d})")
-
-
-def accion_SC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    oponente.estado['sangrado'] = 3
-    evento = aplicar_dano(oponente, 1)
-    eventos.append("Sangrado Certero: aplicado (1×3 turnos)")
-
-
-def accion_FA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    d = actual.lanzar_dado()
-    if d >= 6:
-        oponente.estado['fuego'] = 3
-        evento = aplicar_dano(oponente, 1)
-        eventos.append(f"Fuego Azar: aplicado (dado={d}, 1×3 turnos)")
-    else:
-        eventos.append(f"Fuego Azar: fallido (dado={d})")
-
-
-def accion_FC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    oponente.estado['fuego'] = 3
-    evento = aplicar_dano(oponente, 1)
-    eventos.append("Fuego Certero: aplicado (1×3 turnos)")
-
-
-def accion_BD(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.estado['defensa'] += 1
-    eventos.append("Bufo Defensa: +1 defensa")
-
-
-def accion_BDN(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.estado['defensa'] += 2
-    eventos.append("Bufo Defensa Normal: +2 defensa")
-
-
-def accion_BDF(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.estado['defensa'] += 3
-    eventos.append("Bufo Defensa Fuerte: +3 defensa")
-
-
-def accion_BVP(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.vida += 1
-    eventos.append(f"Bufo Vida Pequeño: +1 vida (vida ahora {actual.vida})")
-
-
-def accion_BVM(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.vida += 2
-    eventos.append(f"Bufo Vida Mediano: +2 vida (vida ahora {actual.vida})")
-
-
-def accion_BVG(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.vida += 3
-    eventos.append(f"Bufo Vida Grande: +3 vida (vida ahora {actual.vida})")
-
-
-def accion_PA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    d = actual.lanzar_dado()
-    if d >= 6:
-        oponente.estado['paralizado'] = 2
-        eventos.append(f"Paralizar Azar: aplicado (dado={d}, 2 turnos)")
-    else:
-        eventos.append(f"Paralizar Azar: fallido (dado={d})")
-
-
-def accion_PC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    oponente.estado['paralizado'] = 2
-    eventos.append("Paralizar Certero: aplicado (2 turnos)")
-
+    return (EV_DANO_VIDA, def_val, restante, jugador.vida)
+
+# ---------------------------------------------------------------------------
+#  Instrucciones
+# Cada código se compila a una instrucción ``(handler, args)``. Los handlers son
+# genéricos por tipo de efecto y reciben sus parámetros (daño, turnos, umbral del
+# dado, índice del código para el evento) ya resueltos, de modo que jugar una
+# carta no requiere trabajo con strings. Si ``eventos`` es None no se registra
+# ningún evento.
+
+# Atributo de Jugador que deja cada efecto temporal y su daño inmediato
+_ESTADOS_TEMPORALES = {
+    'sangrado': ('sangrado', DANO_INICIAL_ESTADO),
+    'fuego': ('fuego', DANO_INICIAL_ESTADO),
+    'paralizar': ('paralizado', 0),
+    'congelar': ('congelado', 0),
+}
 
-def accion_CA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    d = actual.lanzar_dado()
-    if d >= 6:
-        oponente.estado['congelado'] = 1
-        eventos.append(f"Congelar Azar: aplicado (dado={d}, salta turno)")
-    else:
-        eventos.append(f"Congelar Azar: fallido (dado={d})")
 
+def _dano(actual: "Jugador", oponente: "Jugador", eventos, ic: int, cantidad: int):
+    resultado = aplicar_dano(oponente, cantidad)
+    if eventos is not None:
+        eventos.append((EV_ATAQUE, ic) + resultado)
 
-def accion_CC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    oponente.estado['congelado'] = 1
-    eventos.append("Congelar Certero: aplicado (salta turno)")
 
+def _estado_temporal(actual: "Jugador", oponente: "Jugador", eventos, ic: int,
+                     clave: str, turnos: int, dano: int, umbral):
+    d = 0
+    if umbral is not None:
+        d = actual.lanzar_dado()
+        if d < umbral:
+            if eventos is not None:
+                eventos.append((EV_ESTADO_FALLIDO, ic, d))
+            return
+    setattr(oponente, clave, turnos)
+    if dano:
+        aplicar_dano(oponente, dano)
+    if eventos is not None:
+        eventos.append((EV_ESTADO_APLICADO, ic, d, dano, turnos))
 
-def accion_BLA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    for s in ['sangrado', 'fuego', 'paralizado', 'congelado']:
-        actual.estado[s] = 0
-    eventos.append("Limpieza: estados negativos eliminados")
 
+def _defensa(actual: "Jugador", oponente: "Jugador", eventos, ic: int, cantidad: int):
+    actual.defensa += cantidad
+    if eventos is not None:
+        eventos.append((EV_DEFENSA, ic, cantidad))
 
-def accion_BS(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.suerte_turnos = 4
-    eventos.append("Bufo Suerte: activado (4 turnos, limite=4)")
 
+def _vida(actual: "Jugador", oponente: "Jugador", eventos, ic: int, cantidad: int):
+    actual.vida += cantidad
+    if eventos is not None:
+        eventos.append((EV_VIDA, ic, cantidad, actual.vida))
 
-def accion_EA(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    d = actual.lanzar_dado()
-    if d >= 6:
-        actual.estado['esquiva'] = True
-        eventos.append(f"Esquivar Azar: activado (dado={d})")
-    else:
-        eventos.append(f"Esquivar Azar: fallido (dado={d})")
 
+def _limpieza(actual: "Jugador", oponente: "Jugador", eventos, ic: int):
+    actual.sangrado = 0
+    actual.fuego = 0
+    actual.paralizado = 0
+    actual.congelado = 0
+    if eventos is not None:
+        eventos.append((EV_LIMPIEZA, ic))
 
-def accion_EC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.estado['esquiva'] = True
-    eventos.append("Esquivar Certero: activado")
 
+def _suerte(actual: "Jugador", oponente: "Jugador", eventos, ic: int, turnos: int):
+    actual.suerte_turnos = turnos
+    if eventos is not None:
+        eventos.append((EV_SUERTE, ic, turnos, UMBRAL_AZAR_SUERTE))
 
-def accion_RC(carta: Carta, actual: Jugador, oponente: Jugador, eventos: list):
-    actual.robar(1)
-    oponente.robar(1)
-    eventos.append("Robo Carta: ambos roban 1 carta")
 
-# Mapeo de códigos a handlers
-HANDLERS = {
-    'AL': accion_AL, 'AN': accion_AN, 'AC': accion_AC,
-    'SA': accion_SA, 'SC': accion_SC,
-    'FA': accion_FA, 'FC': accion_FC,
-    'BD': accion_BD, 'BDN': accion_BDN, 'BDF': accion_BDF,
-    'BVP': accion_BVP, 'BVM': accion_BVM, 'BVG': accion_BVG,
-    'PA': accion_PA, 'PC': accion_PC,
-    'CA': accion_CA, 'CC': accion_CC,
-    'BLA': accion_BLA, 'BS': accion_BS,
-    'EA': accion_EA, 'EC': accion_EC,
-    'RC': accion_RC
-}
+def _esquiva(actual: "Jugador", oponente: "Jugador", eventos, ic: int, umbral):
+    d = 0
+    activada = True
+    if umbral is not None:
+        d = actual.lanzar_dado()
+        activada = d >= umbral
+    if activada:
+        actual.esquiva = True
+    if eventos is not None:
+        eventos.append((EV_ESQUIVA, ic, d, activada))
+
+
+def _robar(actual: "Jugador", oponente: "Jugador", eventos, ic: int, cantidad: int):
+    actual.robar(cantidad)
+    oponente.robar(cantidad)
+    if eventos is not None:
+        eventos.append((EV_ROBAR, ic, cantidad))
+
+
+def _compilar_instruccion(codigo: str) -> tuple:
+    """Traduce un código de ``EFECTOS`` a su instrucción ``(handler, args)``."""
+    operacion, valor, azar = EFECTOS[codigo]
+    ic = INDICE_CODIGO[codigo]
+    umbral = UMBRAL_AZAR if azar else None
+    if operacion == 'dano':
+        return _dano, (ic, valor)
+    if operacion in _ESTADOS_TEMPORALES:
+        clave, dano = _ESTADOS_TEMPORALES[operacion]
+        return _estado_temporal, (ic, clave, valor, dano, umbral)
+    if operacion == 'defensa':
+        return _defensa, (ic, valor)
+    if operacion == 'vida':
+        return _vida, (ic, valor)
+    if operacion == 'limpieza':
+        return _limpieza, (ic,)
+    if operacion == 'suerte':
+        return _suerte, (ic, valor)
+    if operacion == 'esquiva':
+        return _esquiva, (ic, umbral)
+    if operacion == 'robar':
+        return _robar, (ic, valor)
+    raise ValueError(f"Operación desconocida: '{operacion}'")
+
+
+# Mapeo de códigos a instrucciones compiladas
+INSTRUCCIONES = {codigo: _compilar_instruccion(codigo) for codigo in EFECTOS}
+
+
+def compilar_programa(codigos: tuple) -> tuple:
+    """
+    Compila los códigos de una carta a su programa: una tupla inmutable de
+    instrucciones ``(handler, args)``, una por cada código reconocido.
+    """
+    return tuple(INSTRUCCIONES[c] for c in codigos if c in INSTRUCCIONES)
 
 
-# Aplica todos los handlers de una carta combinada
+# Aplica todas las instrucciones de una carta combinada.
+# Con ``perfil`` (ver rulkanis.perfil) mide cada handler como fase "reglas.<handler>".
 def aplicar_carta(
-    carta: Carta, jugador_actual: Jugador, jugador_oponente: Jugador, eventos: list
+    carta: Carta, jugador_actual: "Jugador", jugador_oponente: "Jugador", eventos: list = None,
+    perfil=None,
 ):
-    for code in carta.nomenclatura.split('+'):
-        accion = HANDLERS.get(code.strip().upper())
-        if accion:
-            accion(carta, jugador_actual, jugador_oponente, eventos)
+    programa = carta.programa
+    if programa is None:
+        # Carta creada fuera del catálogo: se compila al vuelo
+        programa = compilar_programa(carta.codigos)
+    if perfil is None:
+        for accion, args in programa:
+            accion(jugador_actual, jugador_oponente, eventos, *args)
+        return
+    for accion, args in programa:
+        t0 = perf_counter()
+        accion(jugador_actual, jugador_oponente, eventos, *args)
+        perfil.sumar("reglas." + accion.__name__.lstrip("_"), t0)
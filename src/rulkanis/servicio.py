@@ -0,0 +1,437 @@
+# servicio.py
+# -*- coding: utf-8 -*-
+# Servicio local HTTP/JSON de simulación: recibe enfrentamientos, los encola por
+# prioridad y los juega con simular_varias_partidas sobre un pool de procesos
+# compartido y ya iniciado, así varios notebooks o scripts no compiten por los
+# núcleos ni pagan cada uno el arranque. Solo escucha en la interfaz local.
+#
+#   python -m rulkanis.servicio [--puerto 8765] [--workers 4]
+#
+#   POST /trabajos            encola un trabajo; responde {"id": ...}
+#   GET  /trabajos            estado de todos los trabajos
+#   GET  /trabajos/<id>       estado, avance y resultado de un trabajo
+#   GET  /trabajos/<id>/avance  avance en vivo, una línea JSON por bloque
+#                               jugado (application/x-ndjson) hasta terminar
+#   DELETE /trabajos/<id>     cancela el trabajo; si ya empezó, se resume lo jugado
+#
+# El cuerpo de POST /trabajos es un trabajo como los de ``rulkanis.lotes``
+# (jugador1, jugador2, repeticiones, motor, workers, seed, precision,
+# confianza, limite) más "prioridad" (entero; mayor se juega antes, por
+# defecto 0). Sin "workers" el trabajo usa todos los procesos del servicio:
+#
+#   curl -d '{"jugador1": {"aleatorio": 1}, "jugador2": {"aleatorio": 2},
+#             "repeticiones": 20000, "prioridad": 5}' localhost:8765/trabajos
+#
+# El resultado tiene las filas y columnas de la hoja "Resumen".
+
+import argparse
+import asyncio
+import ipaddress
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.estadistica import GANADORES, intervalo_wilson
+from rulkanis.lotes import preparar_trabajos
+from rulkanis.simulador import simular_varias_partidas
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+# Trabajos que se juegan a la vez; comparten el pool de procesos
+CONCURRENTES = 1
+# Tamaño máximo del cuerpo de una petición
+MAX_CUERPO = 1 << 20
+# Opciones de rulkanis.lotes que el servicio no acepta: no escribe archivos
+# ni guarda el detalle, solo devuelve el resumen
+OPCIONES_EXCLUIDAS = ("formato", "nivel_log")
+
+EN_COLA, JUGANDO, TERMINADO, ERROR, CANCELADO = "en_cola", "jugando", "terminado", "error", "cancelado"
+
+
+class ErrorPeticion(Exception):
+    """Petición inválida; se responde con ``estado`` y el mensaje."""
+
+    def __init__(self, mensaje: str, estado: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _calentar() -> int:
+    """Tarea de arranque de los procesos del pool: importa el motor y arma el catálogo."""
+    import rulkanis.simulador  # noqa: F401
+
+    obtener_catalogo()
+    return os.getpid()
+
+
+class Trabajo:
+    """
+    Un enfrentamiento pedido al servicio.
+
+    Atributos:
+        id (str): Identificador del trabajo.
+        datos (dict): Trabajo validado (ver ``lotes.preparar_trabajos``).
+        prioridad (int): Mayor se juega antes; a igual prioridad, por orden de llegada.
+        estado (str): EN_COLA, JUGANDO, TERMINADO, ERROR o CANCELADO (solo si
+            se canceló antes de empezar; si no, termina con la parada
+            "cancelada" en el resultado).
+        partidas (int): Partidas jugadas hasta el momento.
+        conteo (list): Partidas por resultado, en el orden de ``GANADORES``.
+        resultado (list): Filas del resumen final al terminar.
+        error (str): Mensaje si el trabajo falló.
+        cancelar (threading.Event): Se activa al cancelar el trabajo.
+    """
+
+    def __init__(self, id: str, datos: dict, prioridad: int):
+        self.id = id
+        self.datos = datos
+        self.prioridad = prioridad
+        self.estado = EN_COLA
+        self.partidas = 0
+        self.conteo = [0] * len(GANADORES)
+        self.resultado = None
+        self.error = None
+        self.creado = time.time()
+        self.inicio = None
+        self.fin = None
+        self.cancelar = threading.Event()
+        self._cambio = asyncio.Event()
+
+    @property
+    def cambio(self) -> asyncio.Event:
+        """Evento que se activa en el próximo cambio de estado o avance."""
+        return self._cambio
+
+    def avisar(self):
+        """Despierta a quienes esperan un cambio (se llama desde el bucle de eventos)."""
+        self._cambio.set()
+        self._cambio = asyncio.Event()
+
+    def avance(self) -> dict:
+        """Estado actual con los porcentajes parciales y sus intervalos de Wilson."""
+        parcial = {}
+        for jugador, exitos in zip(GANADORES, self.conteo):
+            inferior, superior = intervalo_wilson(exitos, self.partidas, self.datos["confianza"])
+            parcial[jugador] = {
+                "Victorias": exitos,
+                "Porcentaje": round(100 * exitos / self.partidas, 2) if self.partidas else None,
+                "IC inferior": round(100 * inferior, 2),
+                "IC superior": round(100 * superior, 2),
+            }
+        return {
+            "id": self.id,
+            "nombre": self.datos["nombre"],
+            "estado": self.estado,
+            "prioridad": self.prioridad,
+            "partidas": self.partidas,
+            "repeticiones": self.datos["repeticiones"],
+            "seed": str(self.datos["seed"]),
+            "parcial": parcial,
+            "segundos": round((self.fin or time.time()) - self.inicio, 3) if self.inicio else None,
+            "error": self.error,
+        }
+
+    def informe(self) -> dict:
+        """``avance()`` más el resultado final con las columnas de la hoja "Resumen"."""
+        return {**self.avance(), "resultado": self.resultado}
+
+
+class ServicioSimulacion:
+    """
+    Cola de trabajos con prioridad jugados sobre un pool de procesos compartido.
+
+    Los trabajos se juegan en hilos (hasta ``concurrentes`` a la vez) que llaman
+    a ``simular_varias_partidas`` con el pool del servicio; cada trabajo usa
+    como máximo ``workers`` procesos a la vez.
+
+    Args:
+        workers (int): Procesos del pool; por defecto ``os.cpu_count()``.
+        concurrentes (int): Trabajos jugados a la vez.
+    """
+
+    def __init__(self, workers: int = None, concurrentes: int = CONCURRENTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrentes = concurrentes
+        self.trabajos = {}
+        self._cola = None
+        self._ids = itertools.count(1)
+        self._llegada = itertools.count()
+        self._pool = None
+        self._hilos = None
+        self._tareas = []
+
+    async def iniciar(self):
+        """Crea y calienta el pool de procesos y arranca los consumidores de la cola."""
+        self._cola = asyncio.PriorityQueue()
+        self._hilos = ThreadPoolExecutor(max_workers=self.concurrentes)
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            calentados = [self._pool.submit(_calentar) for _ in range(self.workers)]
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in calentados))
+        self._tareas = [asyncio.create_task(self._consumir()) for _ in range(self.concurrentes)]
+
+    async def detener(self):
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._hilos.shutdown(wait=False, cancel_futures=True)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def encolar(self, pedido: dict) -> Trabajo:
+        """
+        Valida un pedido y lo encola.
+
+        Raises:
+            ErrorPeticion: Si el pedido no es un trabajo válido.
+        """
+        if not isinstance(pedido, dict):
+            raise ErrorPeticion("El cuerpo debe ser un objeto JSON")
+        pedido = dict(pedido)
+        prioridad = pedido.pop("prioridad", 0)
+        if not isinstance(prioridad, int):
+            raise ErrorPeticion("'prioridad' debe ser un entero")
+        excluidas = [k for k in OPCIONES_EXCLUIDAS if k in pedido]
+        if excluidas:
+            raise ErrorPeticion(f"El servicio no acepta {excluidas}: solo devuelve el resumen")
+        id = str(next(self._ids))
+        pedido.setdefault("nombre", f"trabajo_{id}")
+        try:
+            (datos,) = preparar_trabajos({"trabajos": [pedido]})
+        except ValueError as e:
+            raise ErrorPeticion(str(e)) from None
+        # Sin "workers" el trabajo usa todo el pool compartido, ya calentado
+        datos["workers"] = min(datos["workers"] if "workers" in pedido else self.workers, self.workers)
+        trabajo = Trabajo(id, datos, prioridad)
+        self.trabajos[id] = trabajo
+        self._cola.put_nowait((-prioridad, next(self._llegada), trabajo))
+        return trabajo
+
+    def cancelar(self, trabajo: Trabajo):
+        """
+        Cancela un trabajo: si está en cola no se juega; si se está jugando
+        termina tras el bloque en curso con lo ya jugado.
+        """
+        trabajo.cancelar.set()
+        if trabajo.estado == EN_COLA:
+            trabajo.estado = CANCELADO
+            trabajo.fin = time.time()
+            trabajo.avisar()
+
+    async def _consumir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, trabajo = await self._cola.get()
+            if trabajo.estado == CANCELADO:
+                continue
+            trabajo.estado = JUGANDO
+            trabajo.inicio = time.time()
+            trabajo.avisar()
+            try:
+                resultado = await loop.run_in_executor(self._hilos, self._jugar, trabajo, loop)
+                trabajo.resultado = json.loads(resultado.to_json(orient="records", force_ascii=False))
+                trabajo.estado = TERMINADO
+            except Exception as e:
+                trabajo.error = f"{type(e).__name__}: {e}"
+                trabajo.estado = ERROR
+            trabajo.fin = time.time()
+            trabajo.avisar()
+
+    def _jugar(self, trabajo: Trabajo, loop):
+        """Juega el trabajo (en un hilo) y publica el avance en el bucle de eventos."""
+        datos = trabajo.datos
+        (mazo1, origen1), (mazo2, origen2) = datos["mazos"]
+
+        def progreso(partidas, conteo):
+            trabajo.partidas = partidas
+            trabajo.conteo = [int(x) for x in conteo]
+            loop.call_soon_threadsafe(trabajo.avisar)
+
+        resumen_final, _, _ = simular_varias_partidas(
+            mazo1, origen1, mazo2, origen2, datos["repeticiones"],
+            write_excel=False,
+            workers=datos["workers"],
+            seed=datos["seed"],
+            motor=datos["motor"],
+            nivel_log="ninguno",
+            precision=datos["precision"],
+            confianza=datos["confianza"],
+            pool=self._pool if datos["workers"] > 1 else None,
+            progreso=progreso,
+            cancelar=trabajo.cancelar,
+            limite=datos["limite"],
+        )
+        return resumen_final
+
+    # -----------------------------------------------------------------------
+    #  HTTP
+    async def atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atiende una conexión: una petición HTTP/1.1 y se cierra."""
+        try:
+            try:
+                metodo, ruta, cuerpo = await _leer_peticion(lector)
+                await self._responder(metodo, ruta, cuerpo, escritor)
+            except ErrorPeticion as e:
+                _escribir_json(escritor, e.estado, {"error": str(e)})
+            await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, metodo: str, ruta: str, cuerpo: bytes, escritor):
+        partes = [p for p in ruta.split("?")[0].split("/") if p]
+        if partes[:1] != ["trabajos"] or len(partes) > 3:
+            raise ErrorPeticion("Ruta desconocida", HTTPStatus.NOT_FOUND)
+        if len(partes) == 1:
+            if metodo == "POST":
+                try:
+                    pedido = json.loads(cuerpo or b"null")
+                except ValueError as e:
+                    raise ErrorPeticion(f"JSON inválido: {e}") from None
+                trabajo = self.encolar(pedido)
+                _escribir_json(escritor, HTTPStatus.ACCEPTED, trabajo.avance())
+            elif metodo == "GET":
+                _escribir_json(escritor, HTTPStatus.OK, [t.avance() for t in self.trabajos.values()])
+            else:
+                raise ErrorPeticion("Método no permitido", HTTPStatus.METHOD_NOT_ALLOWED)
+            return
+
+        trabajo = self.trabajos.get(partes[1])
+        if trabajo is None:
+            raise ErrorPeticion("Trabajo desconocido", HTTPStatus.NOT_FOUND)
+        if metodo == "DELETE" and len(partes) == 2:
+            self.cancelar(trabajo)
+            _escribir_json(escritor, HTTPStatus.OK, trabajo.avance())
+            return
+        if metodo != "GET":
+            raise ErrorPeticion("Método no permitido", HTTPStatus.METHOD_NOT_ALLOWED)
+        if len(partes) == 2:
+            _escribir_json(escritor, HTTPStatus.OK, trabajo.informe())
+        elif partes[2] == "avance":
+            await self._transmitir_avance(trabajo, escritor)
+        else:
+            raise ErrorPeticion("Ruta desconocida", HTTPStatus.NOT_FOUND)
+
+    async def _transmitir_avance(self, trabajo: Trabajo, escritor):
+        """Una línea JSON por cambio de estado o bloque jugado; la última trae el resultado."""
+        escritor.write(_encabezado(HTTPStatus.OK, "application/x-ndjson"))
+        while trabajo.estado in (EN_COLA, JUGANDO):
+            # Tomar el evento antes de escribir, así no se pierde un aviso durante drain()
+            cambio = trabajo.cambio
+            escritor.write(_linea_json(trabajo.avance()))
+            await escritor.drain()
+            await cambio.wait()
+        escritor.write(_linea_json(trabajo.informe()))
+
+
+async def _leer_peticion(lector: asyncio.StreamReader) -> tuple:
+    """Lee la línea de petición, los encabezados y el cuerpo (con Content-Length)."""
+    linea = (await lector.readline()).decode("latin-1").split()
+    if len(linea) != 3:
+        raise ErrorPeticion("Petición HTTP inválida")
+    metodo, ruta, _ = linea
+    largo = 0
+    while True:
+        encabezado = (await lector.readline()).decode("latin-1").strip()
+        if not encabezado:
+            break
+        nombre, _, valor = encabezado.partition(":")
+        if nombre.strip().lower() == "content-length":
+            try:
+                largo = int(valor)
+            except ValueError:
+                raise ErrorPeticion("Content-Length inválido") from None
+            if largo < 0:
+                raise ErrorPeticion("Content-Length inválido")
+    if largo > MAX_CUERPO:
+        raise ErrorPeticion("Cuerpo demasiado grande", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    cuerpo = await lector.readexactly(largo) if largo else b""
+    return metodo.upper(), ruta, cuerpo
+
+
+def _encabezado(estado: HTTPStatus, tipo: str, largo: int = None) -> bytes:
+    lineas = [
+        f"HTTP/1.1 {estado.value} {estado.phrase}",
+        f"Content-Type: {tipo}",
+        "Connection: close",
+    ]
+    if largo is not None:
+        lineas.append(f"Content-Length: {largo}")
+    return ("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1")
+
+
+def _linea_json(datos) -> bytes:
+    return (json.dumps(datos, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _escribir_json(escritor, estado: HTTPStatus, datos):
+    cuerpo = _linea_json(datos)
+    escritor.write(_encabezado(estado, "application/json; charset=utf-8", len(cuerpo)) + cuerpo)
+
+
+def _es_local(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def servir(host: str = HOST, puerto: int = PUERTO, workers: int = None,
+                 concurrentes: int = CONCURRENTES, listo: asyncio.Event = None):
+    """
+    Corre el servicio hasta que se cancele la tarea.
+
+    Args:
+        host (str): Dirección local donde escuchar.
+        puerto (int): Puerto; 0 elige uno libre.
+        workers (int): Procesos del pool compartido.
+        concurrentes (int): Trabajos jugados a la vez.
+        listo (asyncio.Event): Si se pasa, se activa cuando el servicio ya
+            acepta conexiones.
+
+    Raises:
+        ValueError: Si ``host`` no es una dirección local.
+    """
+    if not _es_local(host):
+        raise ValueError(f"El servicio solo escucha en direcciones locales, no en '{host}'")
+    servicio = ServicioSimulacion(workers, concurrentes)
+    await servicio.iniciar()
+    servidor = await asyncio.start_server(servicio.atender, host, puerto)
+    try:
+        direccion = servidor.sockets[0].getsockname()
+        print(f"Servicio de simulación en http://{direccion[0]}:{direccion[1]} "
+              f"({servicio.workers} procesos)", flush=True)
+        if listo is not None:
+            listo.set()
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servicio.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rulkanis.servicio", description="Servicio local de simulación Rulkanis"
+    )
+    parser.add_argument("--host", default=HOST, help="dirección local (por defecto %(default)s)")
+    parser.add_argument("--puerto", type=int, default=PUERTO, help="por defecto %(default)s")
+    parser.add_argument("--workers", type=int, help="procesos del pool (por defecto os.cpu_count())")
+    parser.add_argument("--concurrentes", type=int, default=CONCURRENTES,
+                        help="trabajos jugados a la vez (por defecto %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.workers, args.concurrentes))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
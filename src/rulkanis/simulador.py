@@ -1,233 +1,1043 @@
-# simulador.py
-# -*- coding: utf-8 -*-
-
-import random
-import datetime
-import pandas as pd
-from rulkanis.datos_rulkanis import cartas_accion, distribucion_equipamiento, equipamiento_sets_nominales
-from rulkanis.reglas import determinar_exito_carta, aplicar_carta
-from rulkanis.carta import Carta
-from rulkanis.jugador import Jugador
-from rulkanis.logger import Logger, EventLogger
-from rulkanis.mazo import construir_mazo_combinado
-
-
-def fase_reaccion(
-    carta_jugada: Carta,
-    carta_de_esquive: Carta,
-    jugador_actual: Jugador,
-    jugador_oponente: Jugador,
-    logger: Logger,
-):
-
-    eventos_reaccion = []
-    aplicar_carta(
-        carta=carta_de_esquive,
-        jugador_actual=jugador_oponente,
-        jugador_oponente=jugador_actual,
-        eventos=eventos_reaccion,
-    )
-    logger.evento.log_event(
-        f"REACCIÓN: {jugador_oponente.nombre} juega {carta_de_esquive.nombre} → {eventos_reaccion[0]}"
-    )
-    logger.actualizar_campos({'jugador': jugador_oponente.nombre})
-    logger.log_reaccion(
-        resultado="Esquivado" if jugador_oponente.estado["esquiva"] else "Fallido",
-        carta=carta_de_esquive
-    )
-    # oponente descarta la carta de esquive
-    jugador_oponente.descartar(carta_de_esquive)
-    # jugador activate descarta la carta atacante
-    jugador_actual.descartar(carta_jugada)
-
-
-def simular_partida(
-    partida: int,
-    j1: Jugador,
-    j2: Jugador,
-    jugador_actual: Jugador,
-    jugador_oponente: Jugador,
-):
-    logger = Logger(
-        partida=partida,
-        turno=0,
-        jugador=jugador_actual.nombre,
-        fase="",
-        j1=j1,
-        j2=j2,
-    )
-    resumen = []
-
-    turno = 0
-    while j1.puede_continuar() and j2.puede_continuar():
-        turno += 1
-        print(f"\nTurno {turno} - {jugador_actual.nombre}")
-
-        jugador_actual.aplicar_efectos_de_estado(logger.evento)
-        logger.evento.print_events()
-
-        logger.actualizar_campos(
-            {
-                "turno": turno,
-                "jugador": jugador_actual.nombre,
-                "fase": "InicioTurno"
-            }
-        )
-
-        # — LOGEAR inicio de turno, incluso si salta —
-        logger.log_inicio_turno(saltar=jugador_actual.salta_turno)
-
-        if jugador_actual.salta_turno:
-            print(f"{jugador_actual.nombre} pierde el turno")
-            jugador_actual.terminar_turno()
-            jugador_actual, jugador_oponente = jugador_oponente, jugador_actual
-            continue
-
-        # --- INICIO de jugadas ---
-        cartas_jugadas: list = []
-        nivel_total = 0
-        categorias_jugadas = set()
-
-        while len(cartas_jugadas) < 3:
-            # 1) Filtrar mano por coste (nivel) y categoría
-            cartas_disponibles = [
-                carta for carta in jugador_actual.mano
-                if nivel_total + carta.nivel <= 10
-                and carta.categoria not in categorias_jugadas
-            ]
-            if not cartas_disponibles:
-                break
-
-            # 2) Elegir carta de mayor nivel
-            carta = max(cartas_disponibles, key=lambda carta: carta.nivel)
-
-            # 3) Resolver AZAR / CERTERO
-            exito, evento, resultado, dado = determinar_exito_carta(carta, jugador_actual)
-
-            if exito:
-                if carta.categoria in ("ataque", "sangrado", "fuego"):
-                    carta_de_esquive = next(
-                        (
-                            carta
-                            for carta in jugador_oponente.mano
-                            if carta.accion_principal().upper() in ("EA", "EC")
-                        ),
-                        None,
-                    )
-                    if carta_de_esquive:
-                        fase_reaccion(
-                            carta_jugada=carta,
-                            carta_de_esquive=carta_de_esquive,
-                            jugador_actual=jugador_actual,
-                            jugador_oponente=jugador_oponente,
-                            logger=logger)
-                        continue
-                # # 4) REACCIÓN: Esquivar dañado antes de aplicar la carta                    
-
-                # 5) Si no esquivó, aplicamos la carta normalmente
-                eventos_carta = []
-                aplicar_carta(carta, jugador_actual, jugador_oponente, eventos_carta)
-                for evento in eventos_carta:
-                    logger.evento.log_event(evento)
-
-                nivel_total += carta.nivel
-                categorias_jugadas.add(carta.categoria)
-                cartas_jugadas.append(carta)
-
-                logger.actualizar_campos({'jugador': jugador_actual.nombre})
-                logger.log_fin_jugada(
-                    carta=carta,
-                    dado=dado,
-                    resultado=resultado
-                )
-
-            # 6) Descartar siempre la carta atacante
-            jugador_actual.descartar(carta)
-            # --- FIN de jugadas ---
-
-        jugador_actual.terminar_turno()
-        jugador_actual, jugador_oponente = jugador_oponente, jugador_actual
-
-    if j1.vida > j2.vida:
-        ganador = j1.nombre
-    elif j2.vida > j1.vida:
-        ganador = j2.nombre
-    else:
-        ganador = "Empate"
-
-    resumen.append(
-        {
-            "Partida": partida,
-            "Ganador": ganador,
-            "Vida Jugador 1": j1.vida,
-            "Defensa J1": j1.estado["defensa"],
-            "Vida Jugador 2": j2.vida,
-            "Defensa J2": j2.estado["defensa"],
-        }
-    )
-
-    return resumen, logger.detalle
-
-
-def simular_varias_partidas(mazo1, origen1, mazo2, origen2, repeticiones, write_excel=True):
-    resumen_total = []
-    detalle_total = []
-
-    for partida in range(1, repeticiones+1):
-        j1 = Jugador("Jugador 1", mazo1, origen1)
-        j2 = Jugador("Jugador 2", mazo2, origen2)
-        j1.robar(5)
-        j2.robar(5)
-        
-        actual, oponente = (j1, j2) if random.randint(1,10)>=5 else (j2, j1)
-
-        resumen, detalle = simular_partida(partida, j1, j2, actual, oponente)
-
-        resumen_total.extend(resumen)
-        detalle_total.extend(detalle)
-
-    print(f'len(resumen_total) = {len(resumen_total)}')
-    df_resumen = pd.DataFrame(resumen_total)
-    df_detalle = pd.DataFrame(detalle_total)
-
-    # print(df_det['partida'])
-    conteo = df_resumen["Ganador"].value_counts()
-    total = len(df_resumen)
-
-    resumen_final = []
-    for jugador, origen in [("Jugador 1", origen1), ("Jugador 2", origen2)]:
-        vict = conteo.get(jugador, 0)
-        resumen_final.append({
-            "Jugador": jugador,
-            "Victorias": vict,
-            "Porcentaje": round(100 * vict / total, 2),
-            "Partes seleccionadas": ", ".join(f"{p}: {origen[p]}" for p in origen),
-            "Cartas del mazo": ", ".join(c.nombre for c in (mazo1 if jugador=="Jugador 1" else mazo2))
-        })
-
-    df_resumen_final = pd.DataFrame(resumen_final)
-
-    if write_excel:
-        print("\nGuardando resultados en Excel...")
-        filename = "resultados_simulacion.xlsx"
-        try:
-            with pd.ExcelWriter(filename) as writer:
-                df_resumen_final.to_excel(writer, sheet_name="Resumen", index=False)
-                df_detalle.to_excel(writer, sheet_name="Detalle", index=False)
-            print(f"\nSimulación finalizada. Resultados en '{filename}'")
-        except PermissionError:
-            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            fn2 = f"resultados_simulacion_{ts}.xlsx"
-            with pd.ExcelWriter(fn2) as writer:
-                df_resumen_final.to_excel(writer, sheet_name="Resumen", index=False)
-                df_detalle.to_excel(writer, sheet_name="Detalle", index=False)
-            print(f"\nEl archivo estaba abierto. Guardé resultados en '{fn2}'")
-
-
-if __name__ == "__main__":
-    mazo1, origen1 = construir_mazo_combinado("Jugador 1")
-    mazo2, origen2 = construir_mazo_combinado("Jugador 2")
-    reps = int(input("\n¿Cuántas simulaciones quieres?: "))
-    ask_write = input("¿Guardar resultados en Excel? (S/N): ")
-    write_excel = ask_write.strip().upper() == "S"
-    simular_varias_partidas(mazo1, origen1, mazo2, origen2, reps, write_excel)
+# simulador.py
+# -*- coding: utf-8 -*-
+
+import contextlib
+import time
+from array import array
+from time import perf_counter
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING
+from rulkanis.datos_rulkanis import cartas_accion, distribucion_equipamiento, equipamiento_sets_nominales
+from rulkanis.reglas import (
+    determinar_exito_carta,
+    aplicar_carta,
+    CARTAS_INICIALES,
+    MAX_CARTAS_TURNO,
+    MAX_NIVEL_TURNO,
+    CATEGORIAS_ATAQUE,
+    CODIGOS_ESQUIVE,
+)
+from rulkanis.carta import Carta
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.jugador import Jugador
+from rulkanis.azar import Dados, secuencia_partida
+from rulkanis.logger import (
+    Logger,
+    EventLogger,
+    nivel_log as _nivel_log,
+    LOG_NINGUNO,
+    LOG_RESUMEN,
+    LOG_TURNO,
+    LOG_COMPLETO,
+    COLUMNAS_RESUMEN,
+    RegistroDetalle,
+)
+from rulkanis.eventos import EV_REACCION
+from rulkanis.exportador import abrir_escritor, EscritorExcel
+from rulkanis.mazo import construir_mazo_combinado, huella_mazo
+from rulkanis.estadistica import GANADORES, CODIGO_GANADOR, SeguimientoVictorias
+from rulkanis.perfil import Perfilador, DadosContados, medir as _medir
+from rulkanis.progreso import ReporteProgreso
+from rulkanis.punto_control import PuntoControl, SEGUNDOS_CHECKPOINT
+
+# numpy, pandas y el motor vectorizado se importan donde se usan: jugar partidas
+# con el motor clásico no necesita pandas, y los procesos del pool arrancan
+# sin cargarlo.
+if TYPE_CHECKING:
+    import numpy as np
+
+# Planificación de bloques (ver _tamano_bloque)
+_BLOQUE_SONDEO = 16
+_SEGUNDOS_POR_BLOQUE = 0.5
+# Tope de partidas por bloque en modo de un solo proceso
+_BLOQUE_SERIAL = 1024
+# Libro de resultados de write_excel
+ARCHIVO_EXCEL = "resultados_simulacion.xlsx"
+# Partidas por lote del motor vectorizado
+_TAM_LOTE_VECTORIZADO = 4096
+
+
+def elegir_carta(mano: dict, nivel_total: int, categorias_jugadas) -> tuple:
+    """
+    Política de juego: entre las cartas de ``mano`` que caben en el nivel que
+    queda del turno y cuya categoría no se jugó, la de mayor nivel; con empate,
+    la primera robada.
+
+    Returns:
+        tuple: (posición, carta), o (None, None) si no hay carta jugable.
+    """
+    pos = carta = None
+    for pos_carta, candidata in mano.items():
+        if (
+            nivel_total + candidata.nivel <= MAX_NIVEL_TURNO
+            and candidata.categoria not in categorias_jugadas
+            and (carta is None or candidata.nivel > carta.nivel)
+        ):
+            pos, carta = pos_carta, candidata
+    return pos, carta
+
+
+def elegir_esquive(mano: dict) -> tuple:
+    """Primera carta de esquive (``CODIGOS_ESQUIVE``) de ``mano``: (posición, carta) o (None, None)."""
+    for pos_carta, candidata in mano.items():
+        if candidata.codigo_principal in CODIGOS_ESQUIVE:
+            return pos_carta, candidata
+    return None, None
+
+
+def fase_reaccion(
+    carta_jugada: Carta,
+    carta_de_esquive: Carta,
+    jugador_actual: Jugador,
+    jugador_oponente: Jugador,
+    logger: Logger,
+    pos_jugada: int,
+    pos_esquive: int,
+    registrar_eventos: bool = True,
+    perfil: Perfilador = None,
+):
+    if perfil is not None:
+        t0 = perf_counter()
+        perfil.contar("reacciones")
+    eventos_reaccion = [] if registrar_eventos else None
+    aplicar_carta(
+        carta=carta_de_esquive,
+        jugador_actual=jugador_oponente,
+        jugador_oponente=jugador_actual,
+        eventos=eventos_reaccion,
+        perfil=perfil,
+    )
+    if logger is not None:
+        if eventos_reaccion:
+            logger.evento.log_event((EV_REACCION, carta_de_esquive.id, eventos_reaccion[0]))
+        logger.jugador = jugador_oponente.nombre
+        logger.log_reaccion(
+            resultado="Esquivado" if jugador_oponente.esquiva else "Fallido",
+            carta=carta_de_esquive
+        )
+    # oponente descarta la carta de esquive
+    jugador_oponente.descartar(pos_esquive)
+    # jugador activate descarta la carta atacante
+    jugador_actual.descartar(pos_jugada)
+    if perfil is not None:
+        perfil.sumar("reaccion", t0)
+
+
+def simular_partida(
+    partida: int,
+    j1: Jugador,
+    j2: Jugador,
+    jugador_actual: Jugador,
+    jugador_oponente: Jugador,
+    nivel_log: str = "completo",
+    detalle: RegistroDetalle = None,
+    perfil: Perfilador = None,
+    politicas: tuple = None,
+):
+    """
+    Juega una partida completa entre ``j1`` y ``j2``.
+
+    Con ``nivel_log`` por debajo de "turno" no se crea el ``Logger`` y el detalle
+    devuelto es None; por debajo de "completo" tampoco se registran eventos.
+    Si se pasa ``detalle``, las filas se agregan a ese registro (así un bloque de
+    partidas comparte un único registro columnar). Con ``perfil`` se mide el
+    tiempo de cada fase del turno (ver ``rulkanis.perfil``).
+
+    ``politicas`` es un par (jugador 1, jugador 2) de políticas de juego; None,
+    o None en un lugar, usa ``elegir_carta``. Una política se llama como
+    ``politica(actual, oponente, cartas_jugadas, nivel_total, categorias_jugadas)``
+    y devuelve ``(posición, carta)``, o ``(None, None)`` para terminar el turno;
+    no debe modificar a los jugadores (ver ``rulkanis.mcts``).
+
+    Returns:
+        tuple: (resumen, detalle) con una fila de resumen y el ``RegistroDetalle``.
+    """
+    nivel = _nivel_log(nivel_log)
+    completo = nivel >= LOG_COMPLETO
+    logger = None
+    if nivel >= LOG_TURNO:
+        logger = Logger(
+            partida=partida,
+            turno=0,
+            jugador=jugador_actual.nombre,
+            fase="",
+            j1=j1,
+            j2=j2,
+            detalle=detalle,
+        )
+    event_logger = logger.evento if completo else None
+    eventos = event_logger.events if completo else None
+    resumen = []
+
+    turno = 0
+    while j1.puede_continuar() and j2.puede_continuar():
+        turno += 1
+
+        if perfil is not None:
+            t0 = perf_counter()
+        jugador_actual.aplicar_efectos_de_estado(event_logger)
+        if perfil is not None:
+            perfil.sumar("efectos_estado", t0)
+            t0 = perf_counter()
+
+        if logger is not None:
+            logger.turno = turno
+            logger.jugador = jugador_actual.nombre
+            logger.fase = "InicioTurno"
+
+            # — LOGEAR inicio de turno, incluso si salta —
+            logger.log_inicio_turno(saltar=jugador_actual.salta_turno)
+            if perfil is not None:
+                perfil.sumar("registro", t0)
+
+        if jugador_actual.salta_turno:
+            jugador_actual.terminar_turno()
+            if perfil is not None:
+                perfil.contar("turnos_saltados")
+            jugador_actual, jugador_oponente = jugador_oponente, jugador_actual
+            continue
+
+        # --- INICIO de jugadas ---
+        politica = None if politicas is None else politicas[jugador_actual is j2]
+        cartas_jugadas = 0
+        nivel_total = 0
+        categorias_jugadas = set()
+
+        while cartas_jugadas < MAX_CARTAS_TURNO:
+            # 1) Filtrar mano por coste (nivel) y categoría y
+            # 2) elegir la carta de mayor nivel (la primera robada si hay empate)
+            if perfil is not None:
+                t0 = perf_counter()
+            if politica is None:
+                pos, carta = elegir_carta(jugador_actual.mano, nivel_total, categorias_jugadas)
+            else:
+                pos, carta = politica(
+                    jugador_actual, jugador_oponente, cartas_jugadas, nivel_total, categorias_jugadas
+                )
+            if perfil is not None:
+                perfil.sumar("seleccion_carta", t0)
+            if carta is None:
+                break
+
+            # 3) Resolver AZAR / CERTERO
+            exito, evento, resultado, dado = determinar_exito_carta(carta, jugador_actual)
+            if perfil is not None and not exito:
+                perfil.contar("cartas_fallidas")
+
+            if exito:
+                if carta.categoria in CATEGORIAS_ATAQUE:
+                    pos_esquive, carta_de_esquive = elegir_esquive(jugador_oponente.mano)
+                    if carta_de_esquive:
+                        # 4) REACCIÓN: Esquivar dañado antes de aplicar la carta
+                        fase_reaccion(
+                            carta_jugada=carta,
+                            carta_de_esquive=carta_de_esquive,
+                            jugador_actual=jugador_actual,
+                            jugador_oponente=jugador_oponente,
+                            logger=logger,
+                            pos_jugada=pos,
+                            pos_esquive=pos_esquive,
+                            registrar_eventos=completo,
+                            perfil=perfil)
+                        continue
+
+                # 5) Si no esquivó, aplicamos la carta normalmente
+                aplicar_carta(carta, jugador_actual, jugador_oponente, eventos, perfil)
+
+                nivel_total += carta.nivel
+                categorias_jugadas.add(carta.categoria)
+                cartas_jugadas += 1
+
+                if logger is not None:
+                    if perfil is not None:
+                        t0 = perf_counter()
+                    logger.jugador = jugador_actual.nombre
+                    logger.log_fin_jugada(
+                        carta=carta,
+                        dado=dado,
+                        resultado=resultado
+                    )
+                    if perfil is not None:
+                        perfil.sumar("registro", t0)
+
+            # 6) Descartar siempre la carta atacante
+            jugador_actual.descartar(pos)
+            # --- FIN de jugadas ---
+
+        jugador_actual.terminar_turno()
+        if perfil is not None:
+            perfil.contar("cartas_jugadas", cartas_jugadas)
+        jugador_actual, jugador_oponente = jugador_oponente, jugador_actual
+
+    if perfil is not None:
+        perfil.contar("turnos", turno)
+    if j1.vida > j2.vida:
+        ganador = j1.nombre
+    elif j2.vida > j1.vida:
+        ganador = j2.nombre
+    else:
+        ganador = "Empate"
+
+    resumen.append(
+        {
+            "Partida": partida,
+            "Ganador": ganador,
+            "Vida Jugador 1": j1.vida,
+            "Defensa J1": j1.defensa,
+            "Vida Jugador 2": j2.vida,
+            "Defensa J2": j2.defensa,
+        }
+    )
+
+    return resumen, logger.detalle if logger is not None else None
+
+
+def _simular_bloque(mazo1, origen1, mazo2, origen2, inicio: int, fin: int, semilla: int,
+                    nivel_log: str = "completo", perfil: Perfilador = None,
+                    politicas: tuple = None):
+    """
+    Simula las partidas ``inicio..fin`` (ambas incluidas) en el proceso actual.
+    Las ``politicas`` (ver ``simular_partida``) que tengan un método
+    ``empezar(semilla, partida, indice)`` lo reciben antes de cada partida, para
+    sembrar su propio azar sin tocar el de la partida.
+
+    Returns:
+        tuple: (inicio, ganadores, resumen, detalle, segundos, perfil) donde
+        ``ganadores`` tiene el código (ver ``estadistica.GANADORES``) del
+        resultado de cada partida, ``segundos`` es el tiempo de pared usado por
+        el bloque, que el planificador usa para ajustar el tamaño de los
+        siguientes, y ``perfil`` es el ``Perfilador`` recibido con las
+        mediciones del bloque (None si no se pasó).
+    """
+    t0 = time.perf_counter()
+    nivel = _nivel_log(nivel_log)
+    ganadores = array("b")
+    resumen_bloque = []
+    detalle_bloque = RegistroDetalle() if nivel >= LOG_TURNO else None
+    catalogo = obtener_catalogo()
+    # Los jugadores se crean una vez por bloque y se reinician en cada partida;
+    # comparten los dados, que se resiembran con la semilla de cada partida
+    dados = Dados(semilla) if perfil is None else DadosContados(semilla)
+    j1 = Jugador("Jugador 1", catalogo.cartas_de(mazo1), origen1, dados)
+    j2 = Jugador("Jugador 2", catalogo.cartas_de(mazo2), origen2, dados)
+
+    for partida in range(inicio, fin + 1):
+        dados.sembrar(secuencia_partida(semilla, partida))
+        j1.reiniciar()
+        j2.reiniciar()
+        j1.robar(CARTAS_INICIALES)
+        j2.robar(CARTAS_INICIALES)
+
+        actual, oponente = (j1, j2) if dados.tirar() >= 5 else (j2, j1)
+        if politicas is not None:
+            for indice, politica in enumerate(politicas):
+                empezar = getattr(politica, "empezar", None)
+                if empezar is not None:
+                    empezar(semilla, partida, indice)
+
+        resumen, _ = simular_partida(
+            partida, j1, j2, actual, oponente, nivel_log, detalle_bloque, perfil, politicas
+        )
+
+        ganadores.append(CODIGO_GANADOR[resumen[0]["Ganador"]])
+        if nivel >= LOG_RESUMEN:
+            resumen_bloque.extend(resumen)
+
+    if perfil is not None:
+        perfil.contar("partidas", fin - inicio + 1)
+        perfil.contar("dados", dados.tiradas)
+    return inicio, ganadores, resumen_bloque, detalle_bloque, time.perf_counter() - t0, perfil
+
+
+def reproducir_partida(mazo1, origen1, mazo2, origen2, partida: int, seed: int,
+                       nivel_log: str = "completo", politicas: tuple = None):
+    """
+    Vuelve a jugar sola la partida número ``partida`` de una corrida del motor
+    clásico con semilla ``seed``: sale idéntica a la de la corrida completa.
+
+    Returns:
+        tuple: (resumen, detalle) como en ``simular_partida`` (el resumen queda
+        vacío con nivel "ninguno"); ``detalle`` es un DataFrame, o None si
+        ``nivel_log`` no registra el detalle.
+    """
+    _, _, resumen, detalle, _, _ = _simular_bloque(
+        mazo1, origen1, mazo2, origen2, partida, partida, seed, nivel_log, None, politicas
+    )
+    return resumen, detalle.a_dataframe() if detalle is not None else None
+
+
+def _tamano_bloque(restantes: int, workers: int, seg_por_partida: float | None) -> int:
+    """
+    Calcula el tamaño del próximo bloque de partidas.
+
+    Mientras no hay mediciones se usan bloques pequeños de sondeo. Luego el tamaño
+    apunta a ``_SEGUNDOS_POR_BLOQUE`` según el coste medido por partida, acotado
+    por ``restantes / (2 * workers)`` para que la cola final quede repartida.
+    """
+    if seg_por_partida is None:
+        objetivo = _BLOQUE_SONDEO
+    else:
+        objetivo = int(_SEGUNDOS_POR_BLOQUE / max(seg_por_partida, 1e-9))
+    tope = max(1, -(-restantes // (2 * workers)))
+    return max(1, min(objetivo, tope, restantes))
+
+
+def _abrir_pool(pool: Executor, workers: int):
+    """Context manager con ``pool`` si se pasó (sin cerrarlo al salir) o con un pool nuevo."""
+    if pool is not None:
+        return contextlib.nullcontext(pool)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _iterar_en_paralelo(mazo1, origen1, mazo2, origen2, primera, ultima, semilla, workers,
+                        nivel_log: str = "completo", perfil: Perfilador = None,
+                        pool: Executor = None, politicas: tuple = None):
+    """
+    Reparte las partidas en bloques de tamaño adaptativo sobre un pool de procesos
+    y entrega ``(ganadores, resumen, detalle)`` de cada bloque en orden de partida.
+
+    Solo se retienen los bloques terminados fuera de orden, que están acotados
+    por la cantidad de bloques en vuelo (``2 * workers``). Si el consumidor cierra
+    el generador se cancelan los bloques que aún no empezaron. Con ``perfil``
+    cada bloque se mide en su proceso y se acumula al terminar. ``pool`` es un
+    pool ya abierto a usar en lugar de crear uno.
+    """
+    terminados = {}
+    pendientes = {}
+    siguiente = primera
+    proximo = primera
+    seg_por_partida = None
+
+    with _abrir_pool(pool, workers) as pool:
+        try:
+            while siguiente <= ultima or pendientes:
+                # Mantener el pool con trabajo en cola mientras queden partidas
+                while siguiente <= ultima and len(pendientes) < 2 * workers:
+                    tam = _tamano_bloque(ultima - siguiente + 1, workers, seg_por_partida)
+                    fin = siguiente + tam - 1
+                    futuro = pool.submit(
+                        _simular_bloque, mazo1, origen1, mazo2, origen2, siguiente, fin, semilla,
+                        nivel_log, None if perfil is None else Perfilador(), politicas,
+                    )
+                    pendientes[futuro] = tam
+                    siguiente = fin + 1
+
+                hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    tam = pendientes.pop(futuro)
+                    inicio, ganadores, resumen, detalle, segundos, perfil_bloque = futuro.result()
+                    if perfil is not None:
+                        perfil.combinar(perfil_bloque)
+                    terminados[inicio] = (tam, ganadores, resumen, detalle)
+                    medido = segundos / tam
+                    seg_por_partida = (
+                        medido if seg_por_partida is None else 0.5 * (seg_por_partida + medido)
+                    )
+
+                while proximo in terminados:
+                    tam, ganadores, resumen, detalle = terminados.pop(proximo)
+                    proximo += tam
+                    yield ganadores, resumen, detalle
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+def _iterar_bloques(mazo1, origen1, mazo2, origen2, primera, ultima, semilla, workers,
+                    nivel_log: str = "completo", perfil: Perfilador = None,
+                    pool: Executor = None, politicas: tuple = None):
+    """
+    Simula las partidas ``primera..ultima`` y entrega ``(ganadores, resumen,
+    detalle)`` por bloque, en orden de partida. ``detalle`` es el ``RegistroDetalle`` del bloque (None por
+    debajo de "turno").
+    """
+    if workers > 1 and ultima > primera:
+        bloques = _iterar_en_paralelo(
+            mazo1, origen1, mazo2, origen2, primera, ultima, semilla, workers, nivel_log, perfil,
+            pool, politicas,
+        )
+    else:
+        bloques = _iterar_en_serie(
+            mazo1, origen1, mazo2, origen2, primera, ultima, semilla, nivel_log, perfil, politicas,
+        )
+    yield from bloques
+
+
+def _iterar_en_serie(mazo1, origen1, mazo2, origen2, primera, ultima, semilla,
+                     nivel_log: str = "completo", perfil: Perfilador = None,
+                     politicas: tuple = None):
+    """
+    Simula las partidas ``primera..ultima`` en este proceso y entrega
+    ``(ganadores, resumen, detalle)`` por bloque. Los bloques se dimensionan
+    como en ``_iterar_en_paralelo`` (≈ ``_SEGUNDOS_POR_BLOQUE``, como mucho
+    ``_BLOQUE_SERIAL`` partidas), así el consumidor revisa cortes y avance con
+    la misma frecuencia con uno o varios workers.
+    """
+    inicio = primera
+    seg_por_partida = None
+    while inicio <= ultima:
+        tam = min(_tamano_bloque(ultima - inicio + 1, 1, seg_por_partida), _BLOQUE_SERIAL)
+        _, ganadores, resumen, detalle, segundos, _ = _simular_bloque(
+            mazo1, origen1, mazo2, origen2, inicio, inicio + tam - 1, semilla, nivel_log, perfil,
+            politicas,
+        )
+        medido = segundos / tam
+        seg_por_partida = medido if seg_por_partida is None else 0.5 * (seg_por_partida + medido)
+        inicio += tam
+        yield ganadores, resumen, detalle
+
+
+def _simular_lote_vectorizado(mazo1, mazo2, inicio: int, fin: int, semilla: int,
+                              nivel_log: str = "completo"):
+    """
+    Simula con el motor vectorizado las partidas ``inicio..fin`` y devuelve los
+    códigos de ganador y sus filas de resumen con las mismas columnas que
+    ``simular_partida`` (None si ``nivel_log`` es "ninguno").
+    """
+    import numpy as np
+    import pandas as pd
+    from rulkanis import motor_vectorizado
+
+    tabla = motor_vectorizado.TablaCartas.desde_catalogo()
+    k = fin - inicio + 1
+    res = motor_vectorizado.simular_lote(
+        tabla, np.asarray(mazo1, dtype=np.int16), np.asarray(mazo2, dtype=np.int16), k, np.random.SeedSequence(semilla, spawn_key=(0, inicio))
+    )
+    codigos = res["ganador"].astype(np.int8)
+    if _nivel_log(nivel_log) < LOG_RESUMEN:
+        return inicio, codigos, None
+    nombres = np.array(GANADORES, dtype=object)
+    return inicio, codigos, pd.DataFrame(
+        {
+            "Partida": np.arange(inicio, fin + 1),
+            "Ganador": nombres[codigos],
+            "Vida Jugador 1": res["vida"][:, 0],
+            "Defensa J1": res["defensa"][:, 0],
+            "Vida Jugador 2": res["vida"][:, 1],
+            "Defensa J2": res["defensa"][:, 1],
+        }
+    )
+
+
+def _iterar_vectorizado(mazo1, mazo2, primera, ultima, semilla, workers, nivel_log: str = "completo",
+                        pool: Executor = None):
+    """
+    Ejecuta el motor vectorizado en lotes de tamaño fijo (así la salida no depende
+    del número de workers) y entrega ``(ganadores, df_resumen, None)`` de cada
+    lote en orden de partida (``df_resumen`` es None con ``nivel_log="ninguno"``);
+    el tercer elemento es el detalle, que este motor no produce.
+    """
+    lotes = [
+        (inicio, min(inicio + _TAM_LOTE_VECTORIZADO - 1, ultima))
+        for inicio in range(primera, ultima + 1, _TAM_LOTE_VECTORIZADO)
+    ]
+    if workers > 1 and len(lotes) > 1:
+        with _abrir_pool(pool, workers) as pool:
+            # Ventana acotada de lotes en vuelo, consumidos en orden
+            en_vuelo = deque()
+            try:
+                for i, f in lotes:
+                    en_vuelo.append(
+                        pool.submit(_simular_lote_vectorizado, mazo1, mazo2, i, f, semilla, nivel_log)
+                    )
+                    if len(en_vuelo) >= 2 * workers:
+                        yield (*en_vuelo.popleft().result()[1:], None)
+                while en_vuelo:
+                    yield (*en_vuelo.popleft().result()[1:], None)
+            finally:
+                for futuro in en_vuelo:
+                    futuro.cancel()
+    else:
+        for i, f in lotes:
+            yield (*_simular_lote_vectorizado(mazo1, mazo2, i, f, semilla, nivel_log)[1:], None)
+
+
+def _iterar_motor(motor, mazo1, origen1, mazo2, origen2, primera, ultima, semilla, workers,
+                  nivel_log: str = "completo", perfil: Perfilador = None, pool: Executor = None,
+                  politicas: tuple = None):
+    """
+    Devuelve el generador de bloques ``(ganadores, resumen, detalle)`` del motor
+    pedido para las partidas ``primera..ultima``. El ``perfil`` y las
+    ``politicas`` solo se usan con el motor clásico; ``pool`` se usa si
+    ``workers > 1``.
+    """
+    if motor == "vectorizado":
+        if politicas is not None:
+            raise ValueError("El motor vectorizado solo juega con la política de elegir_carta")
+        return _iterar_vectorizado(mazo1, mazo2, primera, ultima, semilla, workers, nivel_log, pool)
+    if motor == "clasico":
+        return _iterar_bloques(
+            mazo1, origen1, mazo2, origen2, primera, ultima, semilla, workers, nivel_log, perfil,
+            pool, politicas,
+        )
+    raise ValueError(f"Motor desconocido: '{motor}'")
+
+
+def _saltar_partidas(bloques, partidas: int):
+    """Descarta las primeras ``partidas`` de bloques ``(ganadores, None, None)``."""
+    for ganadores, resumen, detalle in bloques:
+        if partidas >= len(ganadores):
+            partidas -= len(ganadores)
+            continue
+        yield ganadores[partidas:], resumen, detalle
+        partidas = 0
+
+
+def _motivo_corte(cancelar, hora_limite: float | None) -> str | None:
+    """Motivo para dejar de pedir bloques: "cancelada", "límite de tiempo" o None."""
+    if cancelar is not None and cancelar.is_set():
+        return "cancelada"
+    if hora_limite is not None and time.perf_counter() >= hora_limite:
+        return "límite de tiempo"
+    return None
+
+
+def iter_partidas(
+    mazo1,
+    origen1,
+    mazo2,
+    origen2,
+    repeticiones: int,
+    seed: int = None,
+    motor: str = "clasico",
+    workers: int = 1,
+    nivel_log: str = "resumen",
+    progreso=None,
+    cancelar=None,
+    limite: float = None,
+    pool: Executor = None,
+):
+    """
+    Juega ``repeticiones`` partidas y entrega el resumen de cada una a medida
+    que terminan, en orden de partida: las mismas partidas que
+    ``simular_varias_partidas`` con la misma ``seed``.
+
+    La corrida termina antes si se activa ``cancelar``, si pasan ``limite``
+    segundos o si el consumidor cierra el generador; los cortes se revisan
+    entre bloques de partidas (ver ``_SEGUNDOS_POR_BLOQUE``), y lo ya jugado
+    se entrega siempre completo.
+
+    Args:
+        mazo1, origen1, mazo2, origen2, repeticiones, seed, motor, workers, pool:
+            Como en ``simular_varias_partidas``.
+        nivel_log (str): "resumen" entrega las filas con ``COLUMNAS_RESUMEN``;
+            "ninguno" solo "Partida" y "Ganador", sin el costo del resumen.
+        progreso (callable | bool): ``progreso(partidas, conteo)`` tras cada
+            bloque (ver ``simular_varias_partidas``); True usa un ``ReporteProgreso``.
+        cancelar (threading.Event): Corte cooperativo: al activarse no se
+            juegan más bloques.
+        limite (float): Segundos de reloj tras los cuales no se juegan más bloques.
+
+    Yields:
+        dict: Resumen de una partida.
+
+    Raises:
+        ValueError: Si ``nivel_log`` no es "ninguno" ni "resumen".
+    """
+    import numpy as np
+
+    if _nivel_log(nivel_log) > LOG_RESUMEN:
+        raise ValueError("iter_partidas solo entrega el resumen: nivel_log 'ninguno' o 'resumen'")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    reporte = ReporteProgreso(repeticiones) if progreso is True else None
+    progreso = reporte or progreso
+    hora_limite = None if limite is None else time.perf_counter() + limite
+    seguimiento = SeguimientoVictorias()
+    bloques = _iterar_motor(
+        motor, mazo1, origen1, mazo2, origen2, 1, repeticiones, seed, workers, nivel_log, None, pool
+    )
+    try:
+        for ganadores, resumen, _ in bloques:
+            primera = seguimiento.partidas + 1
+            seguimiento.agregar(ganadores)
+            if resumen is None:
+                for partida, codigo in enumerate(np.asarray(ganadores).tolist(), primera):
+                    yield {"Partida": partida, "Ganador": GANADORES[codigo]}
+            elif motor == "vectorizado":
+                yield from resumen.to_dict("records")
+            else:
+                yield from resumen
+            if progreso:
+                progreso(seguimiento.partidas, seguimiento.conteo)
+            if _motivo_corte(cancelar, hora_limite):
+                break
+    finally:
+        bloques.close()
+        if reporte is not None:
+            reporte.terminar()
+
+
+def iterar_ganadores(
+    mazo1,
+    origen1,
+    mazo2,
+    origen2,
+    primera: int,
+    ultima: int,
+    seed: int,
+    motor: str = "clasico",
+    workers: int = 1,
+    politicas: tuple = None,
+):
+    """
+    Juega las partidas ``primera..ultima`` sin registros y entrega, por bloque y
+    en orden de partida, un arreglo ``int8`` con el código de ganador de cada una
+    (ver ``estadistica.GANADORES``).
+
+    Con el motor clásico cada partida depende solo de ``seed`` y de su número,
+    así que cualquier rango reproduce las mismas partidas. El motor vectorizado
+    sortea por lotes de ``_TAM_LOTE_VECTORIZADO`` partidas contados desde
+    ``primera``: solo se reproducen los mismos lotes. ``politicas`` como en
+    ``simular_partida`` (solo motor clásico).
+    """
+    import numpy as np
+
+    for ganadores, _, _ in _iterar_motor(
+        motor, mazo1, origen1, mazo2, origen2, primera, ultima, seed, workers, "ninguno",
+        politicas=politicas,
+    ):
+        yield np.asarray(ganadores, dtype=np.int8)
+
+
+def contar_victorias(
+    mazo1,
+    origen1,
+    mazo2,
+    origen2,
+    repeticiones: int,
+    seed: int,
+    motor: str = "clasico",
+    workers: int = 1,
+    politicas: tuple = None,
+) -> "np.ndarray":
+    """
+    Juega ``repeticiones`` partidas sin registros ni salida y cuenta resultados.
+
+    Las partidas son las mismas que las de ``simular_varias_partidas`` con la
+    misma ``seed`` (y las mismas ``politicas``, ver ``simular_partida``).
+
+    Returns:
+        np.ndarray: Partidas por resultado, en el orden de ``estadistica.GANADORES``.
+    """
+    import numpy as np
+
+    conteo = np.zeros(len(GANADORES), dtype=np.int64)
+    for ganadores in iterar_ganadores(
+        mazo1, origen1, mazo2, origen2, 1, repeticiones, seed, motor, workers, politicas
+    ):
+        conteo += np.bincount(ganadores, minlength=len(GANADORES))
+    return conteo
+
+
+def simular_varias_partidas(
+    mazo1,
+    origen1,
+    mazo2,
+    origen2,
+    repeticiones,
+    write_excel=True,
+    workers: int = 1,
+    seed: int = None,
+    motor: str = "clasico",
+    nivel_log: str = "completo",
+    salida: str = None,
+    formato: str = "parquet",
+    precision: float = None,
+    confianza: float = 0.95,
+    cache=None,
+    perfilar: bool = False,
+    pool: Executor = None,
+    progreso=None,
+    cancelar=None,
+    limite: float = None,
+    checkpoint: str = None,
+    resume: bool = False,
+    checkpoint_partidas: int = None,
+    checkpoint_segundos: float = SEGUNDOS_CHECKPOINT,
+    politicas: tuple = None,
+):
+    """
+    Simula ``repeticiones`` partidas entre dos mazos y resume los resultados.
+
+    Args:
+        mazo1, mazo2 (array): Ids de las cartas de cada jugador en el catálogo.
+        origen1, origen2 (dict): Set de equipamiento elegido por pieza.
+        repeticiones (int): Número de partidas a simular.
+        write_excel (bool | str): Si es True guarda los resultados en
+            ``resultados_simulacion.xlsx`` (o en la ruta dada, si es un str); el
+            detalle se escribe por bloques a medida que se simula y se reparte
+            en "Detalle", "Detalle_2", … si supera el límite de filas de una
+            hoja (ver ``EscritorExcel``).
+        workers (int): Número de procesos. Con ``workers > 1`` las partidas se
+            reparten en bloques sobre un ``ProcessPoolExecutor``.
+        seed (int): Semilla de la corrida. Cada partida usa una semilla derivada
+            de ésta, así que con la misma semilla el resultado es idéntico sin
+            importar el número de workers. Si es None se genera una al azar.
+        motor (str): "clasico" juega cada partida con ``simular_partida``;
+            "vectorizado" usa ``motor_vectorizado`` y solo produce el resumen
+            (``df_detalle`` queda vacío).
+        nivel_log (str): "ninguno", "resumen", "turno" o "completo" (ver
+            ``logger.NIVELES_LOG``). Con "ninguno" solo se cuentan victorias y
+            ``df_resumen`` queda vacío; el texto de los eventos se genera solo
+            con "completo", al construir ``df_detalle``.
+        salida (str): Directorio donde volcar ``resumen`` y ``detalle`` por
+            bloques mientras corre la simulación (ver ``exportador``). En ese
+            caso las filas no se acumulan en memoria y ``df_resumen`` /
+            ``df_detalle`` vuelven vacíos.
+        formato (str): "parquet" (requiere pyarrow) o "csv", usado con ``salida``.
+        precision (float): Semiancho objetivo, en puntos porcentuales, de los
+            intervalos de confianza de victorias y empates (0.5 = ±0.5%). La
+            simulación se detiene en el primer punto de control (cada
+            ``estadistica.PASO_CONTROL`` partidas) en que todos los intervalos
+            son así de estrechos; ``repeticiones`` queda como tope. Si es None
+            se juegan todas las repeticiones.
+        confianza (float): Nivel de confianza de los intervalos de Wilson.
+        cache (CacheResultados): Caché persistente de resultados (ver
+            ``rulkanis.cache``). Las partidas ya jugadas con la misma semilla se
+            leen de la caché y solo se simulan las que faltan. Como guarda solo
+            el ganador de cada partida, requiere ``nivel_log="ninguno"``.
+        perfilar (bool): Si es True mide el tiempo de cada fase del bucle de
+            juego (efectos de estado, selección de carta, reglas por acción,
+            reacciones, registro) y de la exportación, y cuenta turnos, cartas
+            jugadas, tiradas de dado y reacciones (ver ``rulkanis.perfil``). El
+            motor vectorizado y las partidas leídas de la caché solo miden la
+            exportación.
+        pool (Executor): Pool de procesos ya abierto para repartir las partidas
+            cuando ``workers > 1``, así varias simulaciones seguidas lo
+            comparten; no se cierra al terminar. Por defecto se crea uno por
+            llamada.
+        progreso (callable | bool): Si se pasa, se llama tras cada bloque de
+            partidas como ``progreso(partidas, conteo)`` con las partidas
+            contadas hasta el momento y su conteo por resultado (en el orden de
+            ``estadistica.GANADORES``; no se debe modificar). True muestra un
+            ``ReporteProgreso`` (partidas/s, tiempo restante y porcentajes) y
+            avisa si se alcanzó la ``precision``.
+        cancelar (threading.Event): Corte cooperativo, p. ej. desde otro hilo:
+            al activarse no se juegan más bloques y se resume lo ya jugado.
+        limite (float): Segundos de reloj tras los cuales no se juegan más
+            bloques; se resume lo ya jugado. Los cortes se revisan entre
+            bloques, así que pueden demorar un bloque (≈ ``_SEGUNDOS_POR_BLOQUE``).
+        checkpoint (str): Directorio donde guardar puntos de control (ver
+            ``rulkanis.punto_control``): el conteo, las partidas jugadas y las
+            filas de resumen y detalle desde el punto anterior, escritos de
+            forma atómica cada ``checkpoint_partidas`` partidas o
+            ``checkpoint_segundos`` segundos (lo que llegue antes) y al
+            terminar. Las filas de cada tramo quedan en memoria hasta su punto
+            de control, también con ``salida``.
+        resume (bool): Si es True y ``checkpoint`` tiene un estado guardado,
+            continúa esa corrida: vuelve a escribir en ``salida`` y en el Excel
+            las filas ya guardadas y juega solo las partidas que faltan, con el
+            mismo resultado que una corrida sin cortes. Los parámetros (mazos,
+            semilla, motor, repeticiones, nivel de registro, precisión) deben
+            ser los mismos; con ``seed=None`` se usa la guardada. Si es False y
+            ya hay un estado, se lanza ``FileExistsError``.
+        checkpoint_partidas (int): Partidas entre puntos de control (None: solo por tiempo).
+        checkpoint_segundos (float): Segundos entre puntos de control (None: solo por partidas).
+        politicas (tuple): Par (jugador 1, jugador 2) de políticas de juego en
+            lugar de ``elegir_carta`` (ver ``simular_partida`` y
+            ``rulkanis.mcts``). Solo con el motor clásico y sin ``cache``.
+
+    Returns:
+        tuple: (df_resumen_final, df_resumen, df_detalle). ``df_resumen_final``
+        tiene una fila por jugador y otra de empates, con el intervalo de
+        confianza del porcentaje, las partidas jugadas y el motivo de la parada
+        ("repeticiones", "precisión alcanzada", "cancelada" o "límite de tiempo").
+        Con ``perfilar=True`` se agrega al final el ``Perfilador`` con las
+        mediciones (``perfil.tabla()`` da el informe).
+    """
+    import numpy as np
+    import pandas as pd
+
+    nivel = _nivel_log(nivel_log)
+    punto = None
+    if checkpoint is not None:
+        punto = PuntoControl(checkpoint, checkpoint_partidas, checkpoint_segundos)
+        if punto.existe():
+            if not resume:
+                raise FileExistsError(
+                    f"'{checkpoint}' ya tiene un punto de control: usar resume=True o borrarlo"
+                )
+            punto.cargar()
+            if seed is None:
+                seed = punto.meta["seed"]
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if punto is not None:
+        punto.iniciar({
+            "mazo1": huella_mazo(mazo1, origen1),
+            "mazo2": huella_mazo(mazo2, origen2),
+            "seed": seed,
+            "motor": motor,
+            "repeticiones": repeticiones,
+            "nivel_log": nivel_log,
+            "precision": precision,
+            "confianza": confianza,
+            "politicas": None if politicas is None else repr(tuple(politicas)),
+        })
+    # Partidas ya contadas en el punto de control, o todas si la corrida terminó
+    hechas = 0 if punto is None else (repeticiones if punto.terminada else punto.partidas)
+    perfil = Perfilador() if perfilar else None
+    reporte = ReporteProgreso(repeticiones) if progreso is True else None
+    progreso = reporte or progreso
+    hora_limite = None if limite is None else time.perf_counter() + limite
+    if cache is not None:
+        if nivel > LOG_NINGUNO:
+            raise ValueError("La caché de resultados requiere nivel_log='ninguno'")
+        if politicas is not None:
+            raise ValueError("La caché de resultados solo guarda partidas de elegir_carta")
+        bloques = _saltar_partidas(
+            (
+                (ganadores, None, None)
+                for ganadores in cache.iterar_ganadores(
+                    mazo1, origen1, mazo2, origen2, repeticiones, seed, motor, workers
+                )
+            ),
+            hechas,
+        )
+    else:
+        # Los puntos de control caen entre bloques, así que reanudar en
+        # ``hechas + 1`` respeta los lotes del motor vectorizado
+        bloques = _iterar_motor(
+            motor, mazo1, origen1, mazo2, origen2, hechas + 1, repeticiones, seed, workers,
+            nivel_log, perfil, pool, politicas,
+        )
+
+    escritores = []
+    if salida is not None:
+        escritores.append(abrir_escritor(salida, formato))
+    excel = None
+    if write_excel:
+        excel = EscritorExcel(write_excel if isinstance(write_excel, str) else ARCHIVO_EXCEL)
+        escritores.append(excel)
+
+    seguimiento = SeguimientoVictorias(precision, confianza)
+    parada = "repeticiones"
+    resumen_total = []
+    detalle_total = RegistroDetalle()
+
+    def guardar_filas(resumen, detalle):
+        if escritores:
+            with _medir(perfil, "detalle_dataframe"):
+                df_bloque = detalle.a_dataframe() if detalle is not None else None
+            for escritor in escritores:
+                with _medir(perfil, "escritura_" + escritor.extension):
+                    if resumen is not None:
+                        escritor.escribir("resumen", resumen)
+                    if df_bloque is not None:
+                        escritor.escribir("detalle", df_bloque)
+        if salida is None:
+            if resumen is None:
+                pass
+            elif motor == "vectorizado":
+                resumen_total.append(resumen)
+            else:
+                resumen_total.extend(resumen)
+            if detalle is not None:
+                detalle_total.extender(detalle)
+
+    try:
+        if punto is not None:
+            punto.restaurar(seguimiento)
+            if punto.terminada:
+                parada = punto.parada
+            for resumen, detalle in punto.bloques_guardados():
+                guardar_filas(resumen, detalle)
+        for ganadores, resumen, detalle in bloques:
+            usadas = seguimiento.agregar(ganadores)
+            if usadas < len(ganadores):
+                # Precisión alcanzada a mitad del bloque: se descarta el resto
+                if resumen is not None:
+                    resumen = resumen[:usadas]
+                if detalle is not None:
+                    detalle.recortar(seguimiento.partidas)
+            guardar_filas(resumen, detalle)
+            if punto is not None:
+                punto.agregar(resumen, detalle)
+
+            if progreso:
+                progreso(seguimiento.partidas, seguimiento.conteo)
+            if seguimiento.detenida:
+                parada = "precisión alcanzada"
+                break
+            corte = _motivo_corte(cancelar, hora_limite)
+            if corte:
+                parada = corte
+                break
+            if punto is not None and punto.toca(seguimiento.partidas):
+                with _medir(perfil, "punto_control"):
+                    punto.guardar(seguimiento)
+        if punto is not None:
+            punto.guardar(seguimiento, parada)
+    finally:
+        bloques.close()
+        if reporte is not None:
+            reporte.terminar()
+        # El Excel se cierra al final, con el resumen ya escrito
+        for escritor in escritores:
+            if escritor is not excel:
+                escritor.cerrar()
+
+    with _medir(perfil, "resultados_dataframe"):
+        if motor == "vectorizado":
+            df_resumen = (
+                pd.concat(resumen_total, ignore_index=True)
+                if resumen_total else pd.DataFrame(columns=COLUMNAS_RESUMEN)
+            )
+            df_detalle = pd.DataFrame()
+        else:
+            df_resumen = pd.DataFrame(resumen_total, columns=COLUMNAS_RESUMEN)
+            df_detalle = detalle_total.a_dataframe() if nivel >= LOG_TURNO else pd.DataFrame()
+
+    total = seguimiento.partidas
+    # Fuera del modo interactivo la parada solo se informa en la columna "Parada"
+    if seguimiento.detenida and reporte is not None:
+        print(f"\nPrecisión de ±{precision}% alcanzada tras {total} partidas")
+
+    catalogo = obtener_catalogo()
+    resumen_final = []
+    for codigo, (jugador, intervalo) in enumerate(zip(GANADORES, seguimiento.intervalos())):
+        vict = int(seguimiento.conteo[codigo])
+        if jugador == "Empate":
+            partes = cartas = ""
+        else:
+            origen, mazo = (origen1, mazo1) if jugador == "Jugador 1" else (origen2, mazo2)
+            partes = ", ".join(f"{p}: {origen[p]}" for p in origen)
+            cartas = ", ".join(c.nombre for c in catalogo.cartas_de(mazo))
+        resumen_final.append({
+            "Jugador": jugador,
+            "Victorias": vict,
+            "Porcentaje": round(100 * vict / total, 2) if total else float("nan"),
+            "IC inferior": round(intervalo[0], 2),
+            "IC superior": round(intervalo[1], 2),
+            "Partidas": total,
+            "Parada": parada,
+            "Partes seleccionadas": partes,
+            "Cartas del mazo": cartas,
+        })
+
+    df_resumen_final = pd.DataFrame(resumen_final)
+
+    if excel is not None:
+        print("\nGuardando resultados en Excel...")
+        with _medir(perfil, "excel_guardado"):
+            excel.escribir_resumen(df_resumen_final)
+            excel.cerrar()
+        if excel.ruta_alternativa:
+            print(f"\nEl archivo estaba abierto. Guardé resultados en '{excel.ruta}'")
+        else:
+            print(f"\nSimulación finalizada. Resultados en '{excel.ruta}'")
+
+    if perfilar:
+        return df_resumen_final, df_resumen, df_detalle, perfil
+    return df_resumen_final, df_resumen, df_detalle
+
+
+if __name__ == "__main__":
+    mazo1, origen1 = construir_mazo_combinado("Jugador 1")
+    mazo2, origen2 = construir_mazo_combinado("Jugador 2")
+    reps = int(input("\n¿Cuántas simulaciones quieres?: "))
+    ask_write = input("¿Guardar resultados en Excel? (S/N): ")
+    write_excel = ask_write.strip().upper() == "S"
+    simular_varias_partidas(mazo1, origen1, mazo2, origen2, reps, write_excel)
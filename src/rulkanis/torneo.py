@@ -0,0 +1,213 @@
+# torneo.py
+# -*- coding: utf-8 -*-
+# Torneo entre combinaciones de equipamiento: arma el mazo de cada combinación,
+# juega todos los emparejamientos en un pool de procesos y guarda el cubo de
+# resultados mazo × mazo, con puntos de control para poder reanudarlo.
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from rulkanis.estadistica import GANADORES
+from rulkanis.mazo import PIEZAS, SETS, construir_mazo_equipamiento
+from rulkanis.simulador import contar_victorias
+
+ARCHIVO_ESTADO = "torneo.npz"
+ARCHIVO_PARQUET = "torneo.parquet"
+# Segundos entre guardados del estado mientras corre el torneo
+SEGUNDOS_CHECKPOINT = 30.0
+
+
+def enumerar_combinaciones(filtro: dict = None) -> list:
+    """
+    Enumera combinaciones de equipamiento.
+
+    Args:
+        filtro (dict): pieza -> lista de sets permitidos. Las piezas que no
+            aparecen admiten todos los sets. Sin filtro salen las
+            ``len(SETS) ** len(PIEZAS)`` combinaciones.
+
+    Returns:
+        list: Tuplas con el índice en ``SETS`` del set de cada pieza de ``PIEZAS``.
+
+    Raises:
+        ValueError: Si el filtro nombra una pieza o un set que no existe.
+    """
+    filtro = filtro or {}
+    for pieza, sets in filtro.items():
+        if pieza not in PIEZAS:
+            raise ValueError(f"Pieza desconocida: '{pieza}'")
+        for nombre in sets:
+            if nombre not in SETS:
+                raise ValueError(f"Set desconocido: '{nombre}'")
+    opciones = [
+        [SETS.index(s) for s in filtro[pieza]] if pieza in filtro else range(len(SETS))
+        for pieza in PIEZAS
+    ]
+    return [tuple(c) for c in itertools.product(*opciones)]
+
+
+def origen_de(combinacion) -> dict:
+    """Convierte una combinación en el dict pieza -> set que usan los mazos."""
+    return {pieza: SETS[i] for pieza, i in zip(PIEZAS, combinacion)}
+
+
+@lru_cache(maxsize=None)
+def _mazo_de(combinacion: tuple, extras: tuple):
+    return construir_mazo_equipamiento(origen_de(combinacion), extras)
+
+
+def _jugar_emparejamiento(a: int, b: int, comb_a, comb_b, repeticiones, seed, motor, extras):
+    conteo = contar_victorias(
+        _mazo_de(comb_a, extras), origen_de(comb_a),
+        _mazo_de(comb_b, extras), origen_de(comb_b),
+        repeticiones, seed, motor,
+    )
+    return a, b, conteo
+
+
+def _guardar_estado(ruta: str, combinaciones, conteo, hecho, meta: dict):
+    # Escritura atómica: un corte a mitad del guardado no pierde el estado previo
+    temporal = ruta + ".tmp.npz"
+    np.savez(
+        temporal,
+        combinaciones=np.asarray(combinaciones, dtype=np.int8),
+        conteo=conteo,
+        hecho=hecho,
+        **{k: np.asarray(v) for k, v in meta.items()},
+    )
+    os.replace(temporal, ruta)
+
+
+def _cargar_estado(ruta: str, combinaciones, meta: dict):
+    with np.load(ruta) as datos:
+        if not np.array_equal(datos["combinaciones"], np.asarray(combinaciones, dtype=np.int8)):
+            raise ValueError(f"'{ruta}' corresponde a otras combinaciones")
+        for clave, valor in meta.items():
+            if datos[clave].tolist() != np.asarray(valor).tolist():
+                raise ValueError(f"'{ruta}' se generó con otro valor de '{clave}'")
+        return datos["conteo"].copy(), datos["hecho"].copy()
+
+
+def simular_torneo(
+    combinaciones: list,
+    repeticiones: int,
+    directorio: str,
+    workers: int = None,
+    seed: int = 0,
+    motor: str = "clasico",
+    extras=(),
+    formato: str = "npz",
+):
+    """
+    Juega todos los emparejamientos entre ``combinaciones``.
+
+    Cada par {A, B} es un solo trabajo de ``repeticiones`` partidas (A contra B);
+    su espejo B contra A se llena con los mismos resultados, ya que quién empieza
+    se sortea en cada partida. Todos los trabajos usan la misma ``seed``, así las
+    diferencias entre mazos no se mezclan con diferencias de azar.
+
+    El estado se guarda en ``<directorio>/torneo.npz`` cada
+    ``SEGUNDOS_CHECKPOINT`` segundos y al terminar (también si se interrumpe);
+    si el archivo ya existe con los mismos parámetros, se reanuda desde ahí.
+
+    Args:
+        combinaciones (list): Combinaciones de ``enumerar_combinaciones``.
+        repeticiones (int): Partidas por emparejamiento.
+        directorio (str): Carpeta de salida.
+        workers (int): Procesos; por defecto ``os.cpu_count()``.
+        seed (int): Semilla común de todos los emparejamientos.
+        motor (str): "clasico" o "vectorizado" (ver ``simular_varias_partidas``).
+        extras (iterable): Ids de cartas adicionales para todos los mazos.
+        formato (str): "npz" o "parquet"; con "parquet" también se escribe
+            ``torneo.parquet`` con una fila por par ordenado (requiere pyarrow).
+
+    Returns:
+        np.ndarray: Cubo ``conteo`` de forma (n, n, 3): para la fila ``i`` y la
+        columna ``j``, victorias de ``i``, victorias de ``j`` y empates. La
+        diagonal queda en cero.
+    """
+    if formato not in ("npz", "parquet"):
+        raise ValueError(f"Formato desconocido: '{formato}' (opciones: npz, parquet)")
+    combinaciones = [tuple(c) for c in combinaciones]
+    extras = tuple(extras)
+    workers = workers or os.cpu_count() or 1
+    n = len(combinaciones)
+    meta = {"repeticiones": repeticiones, "seed": seed, "motor": motor, "extras": np.asarray(extras, dtype=np.int64)}
+
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, ARCHIVO_ESTADO)
+    if os.path.exists(ruta):
+        conteo, hecho = _cargar_estado(ruta, combinaciones, meta)
+    else:
+        conteo = np.zeros((n, n, len(GANADORES)), dtype=np.int64)
+        hecho = np.zeros((n, n), dtype=bool)
+
+    trabajos = ((a, b) for a in range(n) for b in range(a + 1, n) if not hecho[a, b])
+    pendientes = set()
+    ultimo_guardado = time.monotonic()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                agotados = False
+                while not agotados or pendientes:
+                    while not agotados and len(pendientes) < 4 * workers:
+                        trabajo = next(trabajos, None)
+                        if trabajo is None:
+                            agotados = True
+                            break
+                        a, b = trabajo
+                        pendientes.add(pool.submit(
+                            _jugar_emparejamiento, a, b, combinaciones[a], combinaciones[b],
+                            repeticiones, seed, motor, extras,
+                        ))
+                    if not pendientes:
+                        break
+                    hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in hechos:
+                        a, b, c = futuro.result()
+                        conteo[a, b] = c
+                        conteo[b, a] = (c[1], c[0], c[2])
+                        hecho[a, b] = hecho[b, a] = True
+                    if time.monotonic() - ultimo_guardado >= SEGUNDOS_CHECKPOINT:
+                        _guardar_estado(ruta, combinaciones, conteo, hecho, meta)
+                        ultimo_guardado = time.monotonic()
+            finally:
+                for futuro in pendientes:
+                    futuro.cancel()
+    finally:
+        _guardar_estado(ruta, combinaciones, conteo, hecho, meta)
+
+    if formato == "parquet":
+        tabla_torneo(combinaciones, conteo).to_parquet(
+            os.path.join(directorio, ARCHIVO_PARQUET), index=False
+        )
+    return conteo
+
+
+def porcentaje_victorias(conteo: np.ndarray) -> np.ndarray:
+    """Matriz (n, n) con el porcentaje de victorias de la fila sobre la columna (NaN si no se jugó)."""
+    total = conteo.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, 100 * conteo[..., 0] / total, np.nan)
+
+
+def tabla_torneo(combinaciones: list, conteo: np.ndarray) -> pd.DataFrame:
+    """Cubo de resultados en formato largo: una fila por par ordenado jugado."""
+    a, b = np.nonzero(conteo.sum(axis=-1))
+    nombres = [
+        ", ".join(f"{p}: {s}" for p, s in origen_de(c).items()) for c in combinaciones
+    ]
+    return pd.DataFrame({
+        "Mazo A": [nombres[i] for i in a],
+        "Mazo B": [nombres[j] for j in b],
+        "Victorias A": conteo[a, b, 0],
+        "Victorias B": conteo[a, b, 1],
+        "Empates": conteo[a, b, 2],
+        "Porcentaje A": porcentaje_victorias(conteo)[a, b].round(2),
+    })
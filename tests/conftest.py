@@ -0,0 +1,48 @@
+# conftest.py
+# -*- coding: utf-8 -*-
+# Mazos fijos para las pruebas: dos combinaciones de equipamiento sin cartas
+# extra, armadas sin azar ni interacción (ver mazo.construir_mazo_equipamiento),
+# y jugadores con dados fijos para probar las reglas paso a paso.
+
+import pytest
+
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.jugador import Jugador
+from rulkanis.mazo import PIEZAS, SETS, construir_mazo_equipamiento
+
+ORIGEN1 = dict(zip(PIEZAS, ("Karsuk Jairuk", "Karsuk Jairuk", "Uke Gajur", "Uke Gajur", "Exilte Naor")))
+ORIGEN2 = {pieza: SETS[2] for pieza in PIEZAS}
+
+
+@pytest.fixture(scope="session")
+def mazos():
+    """(mazo1, origen1, mazo2, origen2) de un enfrentamiento fijo."""
+    return (
+        construir_mazo_equipamiento(ORIGEN1), ORIGEN1,
+        construir_mazo_equipamiento(ORIGEN2), ORIGEN2,
+    )
+
+
+class DadosFijos:
+    """``Dados`` de prueba: tira los valores de ``tiradas`` en orden y no baraja."""
+
+    def __init__(self, tiradas=()):
+        self.tiradas = list(tiradas)
+
+    def tirar(self) -> int:
+        return self.tiradas.pop(0)
+
+    def barajada(self, secuencia) -> list:
+        return list(secuencia)
+
+
+@pytest.fixture
+def nuevo_jugador():
+    """Fábrica de ``Jugador`` con un mazo de cartas del catálogo (por nomenclatura) y ``DadosFijos``."""
+    catalogo = obtener_catalogo()
+
+    def crear(nomenclaturas=(), tiradas=(), nombre="Jugador 1"):
+        cartas = [catalogo[catalogo.por_nomenclatura[n]] for n in nomenclaturas]
+        return Jugador(nombre, cartas, {}, DadosFijos(tiradas))
+
+    return crear
@@ -0,0 +1,74 @@
+# test_cache.py
+# -*- coding: utf-8 -*-
+# Caché persistente de resultados: pedir más partidas solo simula las que
+# faltan, el desalojo borra los tramos usados hace más tiempo y cambiar el
+# código del motor invalida lo guardado.
+
+import pytest
+
+from rulkanis import cache as modulo_cache
+from rulkanis import simulador
+from rulkanis.cache import CacheResultados
+
+
+@pytest.fixture
+def simuladas(monkeypatch):
+    """Lista de los tramos ``(primera, ultima, seed)`` que la caché manda a simular."""
+    tramos = []
+    original = simulador.iterar_ganadores
+
+    def iterar(mazo1, origen1, mazo2, origen2, primera, ultima, seed, *args, **kwargs):
+        tramos.append((primera, ultima, seed))
+        return original(mazo1, origen1, mazo2, origen2, primera, ultima, seed, *args, **kwargs)
+
+    monkeypatch.setattr(simulador, "iterar_ganadores", iterar)
+    return tramos
+
+
+def test_solo_simula_las_partidas_que_faltan(tmp_path, mazos, simuladas):
+    esperado = {n: simulador.contar_victorias(*mazos, n, 5).tolist() for n in (400, 500)}
+    del simuladas[:]
+    with CacheResultados(str(tmp_path / "cache.sqlite")) as cache:
+        cache.contar_victorias(*mazos, 300, seed=5)
+        assert simuladas == [(1, 300, 5)]
+
+        assert cache.contar_victorias(*mazos, 500, seed=5).tolist() == esperado[500]
+        assert simuladas == [(1, 300, 5), (301, 500, 5)]
+
+        # Todo guardado: no se simula nada más
+        assert cache.contar_victorias(*mazos, 400, seed=5).tolist() == esperado[400]
+        assert simuladas == [(1, 300, 5), (301, 500, 5)]
+
+
+def test_desaloja_los_tramos_usados_hace_mas_tiempo(tmp_path, mazos, simuladas):
+    # Cada tramo de 300 partidas ocupa 300 bytes: caben dos
+    with CacheResultados(str(tmp_path / "cache.sqlite"), max_bytes=700) as cache:
+        for seed in (1, 2):
+            cache.contar_victorias(*mazos, 300, seed=seed)
+        cache.contar_victorias(*mazos, 300, seed=1)
+        cache.contar_victorias(*mazos, 300, seed=3)
+        assert cache.tamano() <= 700
+        del simuladas[:]
+
+        # La semilla 2 era la usada hace más tiempo
+        for seed in (1, 3, 2):
+            cache.contar_victorias(*mazos, 300, seed=seed)
+        assert simuladas == [(1, 300, 2)]
+
+
+def test_cambio_del_motor_invalida_la_cache(tmp_path, mazos, simuladas, monkeypatch):
+    ruta = str(tmp_path / "cache.sqlite")
+    with CacheResultados(ruta) as cache:
+        cache.contar_victorias(*mazos, 200, seed=9)
+    nombres = {m.__name__ for m in modulo_cache.MODULOS_MOTOR}
+    assert {"rulkanis.reglas", "rulkanis.jugador", "rulkanis.simulador", "rulkanis.azar"} <= nombres
+
+    monkeypatch.setattr(modulo_cache, "VERSION_MOTOR", modulo_cache.VERSION_MOTOR + 1)
+    modulo_cache.hash_reglas.cache_clear()
+    try:
+        with CacheResultados(ruta) as cache:
+            assert cache.tamano() == 0
+            cache.contar_victorias(*mazos, 200, seed=9)
+    finally:
+        modulo_cache.hash_reglas.cache_clear()
+    assert simuladas == [(1, 200, 9), (1, 200, 9)]
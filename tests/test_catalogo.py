@@ -0,0 +1,55 @@
+# test_catalogo.py
+# -*- coding: utf-8 -*-
+# Catálogo único de cartas: las cartas son inmutables, se comparten por
+# referencia y vuelven a ser las mismas al deserializarlas.
+
+import pickle
+
+import pytest
+
+from rulkanis.carta import Carta
+from rulkanis.catalogo import TIPO_ID, nuevo_mazo, obtener_catalogo
+
+
+def test_catalogo_unico_e_indices():
+    catalogo = obtener_catalogo()
+    assert obtener_catalogo() is catalogo
+    for i, carta in enumerate(catalogo):
+        assert carta.id == i
+        assert catalogo.por_nomenclatura[carta.nomenclatura] == i
+        assert i in catalogo.por_nivel[carta.nivel]
+        assert i in catalogo.por_categoria[carta.categoria]
+    for (_, _, nivel), ids in catalogo.por_pieza.items():
+        assert all(catalogo[i].nivel == nivel for i in ids)
+
+
+def test_carta_inmutable():
+    carta = obtener_catalogo()[0]
+    with pytest.raises(AttributeError):
+        carta.nivel = 9
+    with pytest.raises(AttributeError):
+        del carta.nombre
+
+
+def test_pickle_reinterna_las_cartas_del_catalogo():
+    catalogo = obtener_catalogo()
+    cartas = list(catalogo)
+    copia = pickle.loads(pickle.dumps(cartas))
+    assert all(a is b for a, b in zip(copia, cartas))
+
+
+def test_pickle_de_carta_fuera_del_catalogo():
+    carta = Carta("Ataque normal + sangrado certero", "AN + sc", 5)
+    copia = pickle.loads(pickle.dumps(carta))
+    assert copia is not carta
+    assert (copia.id, copia.nombre, copia.codigos, copia.tipo, copia.categoria) == (
+        None, carta.nombre, ("AN", "SC"), carta.tipo, "ataque"
+    )
+
+
+def test_mazo_como_arreglo_de_ids():
+    catalogo = obtener_catalogo()
+    ids = [catalogo.por_nomenclatura[n] for n in ("AL", "BVG", "AN+SC")]
+    mazo = nuevo_mazo(ids)
+    assert mazo.typecode == TIPO_ID
+    assert [c.nomenclatura for c in catalogo.cartas_de(mazo)] == ["AL", "BVG", "AN+SC"]
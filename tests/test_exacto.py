@@ -0,0 +1,55 @@
+# test_exacto.py
+# -*- coding: utf-8 -*-
+# Solucionador exacto: coincide con Monte Carlo en un enfrentamiento chico y,
+# con un tope de estados, da cotas que se estrechan al subir el tope.
+
+import pytest
+
+from rulkanis.catalogo import nuevo_mazo
+from rulkanis.estadistica import GANADORES, intervalo_wilson
+from rulkanis.exacto import resolver_enfrentamiento
+from rulkanis.mazo import construir_mazos_random
+from rulkanis.simulador import contar_victorias
+
+PARTIDAS = 20000
+CONFIANZA = 0.999
+
+
+@pytest.fixture(scope="module")
+def mazos_chicos():
+    """Dos mazos de cinco cartas: el espacio de estados entra en pocos miles."""
+    mazos, _, _ = construir_mazos_random(2, seed=3, huellas=False)
+    return nuevo_mazo(mazos[0][:5]), nuevo_mazo(mazos[1][:5])
+
+
+@pytest.fixture(scope="module")
+def exacto(mazos_chicos):
+    return resolver_enfrentamiento(*mazos_chicos)
+
+
+def test_resultado_exacto(exacto):
+    assert exacto.exacto
+    assert sum(exacto.probabilidades) == pytest.approx(1.0)
+    assert exacto.cotas() == [(p, p) for p in exacto.probabilidades]
+
+
+def test_coincide_con_monte_carlo(mazos_chicos, exacto):
+    mazo1, mazo2 = mazos_chicos
+    conteo = contar_victorias(mazo1, {}, mazo2, {}, PARTIDAS, 1)
+    for resultado, n, p in zip(GANADORES, conteo.tolist(), exacto.probabilidades):
+        inferior, superior = intervalo_wilson(n, PARTIDAS, CONFIANZA)
+        assert inferior <= p <= superior, f"{resultado}: exacto {p:.4f}, Monte Carlo {n / PARTIDAS:.4f}"
+
+
+def test_cotas_con_tope_de_estados(mazos_chicos, exacto):
+    anterior = 1.0
+    for tope in (250, 1000, 2000, 4000):
+        acotado = resolver_enfrentamiento(*mazos_chicos, max_estados=tope)
+        assert not acotado.exacto
+        assert acotado.estados == tope
+        # Se expande primero lo más probable: cada tope resuelve más probabilidad
+        assert acotado.sin_resolver < anterior
+        anterior = acotado.sin_resolver
+        for (inferior, superior), p in zip(acotado.cotas(), exacto.probabilidades):
+            assert inferior - 1e-12 <= p <= superior + 1e-12
+    assert anterior < 0.01
@@ -0,0 +1,20 @@
+# test_importacion.py
+# -*- coding: utf-8 -*-
+# Presupuesto de importación de los módulos livianos: se importan en un
+# intérprete nuevo sin cargar DEPENDENCIAS_PESADAS (numpy, pandas, …) y en
+# menos de PRESUPUESTO_IMPORTACION segundos. Es la misma verificación que
+# ``python -m rulkanis.benchmark importacion``.
+
+import pytest
+
+from rulkanis.benchmark import MODULOS_LIVIANOS, PRESUPUESTO_IMPORTACION, medir_importacion
+
+
+@pytest.mark.parametrize("modulo", MODULOS_LIVIANOS)
+def test_importacion_liviana(modulo):
+    segundos, pesadas = medir_importacion(modulo)
+    assert not pesadas, f"{modulo} carga {', '.join(pesadas)} al importarse"
+    assert segundos < PRESUPUESTO_IMPORTACION, (
+        f"{modulo} tarda {1000 * segundos:.1f} ms en importarse "
+        f"(presupuesto {1000 * PRESUPUESTO_IMPORTACION:.0f} ms)"
+    )
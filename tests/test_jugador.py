@@ -0,0 +1,101 @@
+# test_jugador.py
+# -*- coding: utf-8 -*-
+# Estado compacto de Jugador: el mazo barajado se roba avanzando un cursor, la
+# mano guarda la posición de robo de cada carta y reiniciar deja al jugador
+# como al empezar una partida.
+
+import pytest
+
+from rulkanis.reglas import TURNOS_SUERTE, UMBRAL_AZAR, UMBRAL_AZAR_SUERTE, VIDA_INICIAL
+
+MAZO = ["AL", "AN", "AC", "BD", "BVP"]
+
+
+def test_robar_avanza_el_cursor(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO)
+    jugador.robar(2)
+    assert [(pos, c.nomenclatura) for pos, c in jugador.mano.items()] == [(0, "AL"), (1, "AN")]
+    assert [c.nomenclatura for c in jugador.mazo] == ["AC", "BD", "BVP"]
+    assert jugador.cartas_en_mazo() == 3
+
+    # Con el mazo vacío robar no hace nada
+    jugador.robar(10)
+    assert list(jugador.mano) == [0, 1, 2, 3, 4]
+    assert jugador.cartas_en_mazo() == 0 and jugador.mazo == []
+
+
+def test_descartar_por_posicion(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO)
+    jugador.robar(3)
+    carta = jugador.descartar(1)
+    assert carta.nomenclatura == "AN"
+    assert list(jugador.mano) == [0, 2]
+    assert jugador.descartadas == [carta]
+
+    # Las posiciones no se reutilizan: la próxima carta robada es la 3
+    jugador.robar(1)
+    assert list(jugador.mano) == [0, 2, 3]
+    with pytest.raises(ValueError):
+        jugador.descartar(1)
+
+
+def test_sin_cartas(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO[:2])
+    jugador.robar(2)
+    assert not jugador.sin_cartas() and jugador.puede_continuar()
+    jugador.descartar(0)
+    jugador.descartar(1)
+    assert jugador.sin_cartas() and not jugador.puede_continuar()
+
+
+def test_reiniciar(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO)
+    jugador.robar(3)
+    jugador.descartar(0)
+    jugador.vida = 2
+    jugador.defensa = jugador.sangrado = jugador.fuego = 3
+    jugador.activar_suerte()
+    jugador.esquiva = jugador.salta_turno = True
+
+    jugador.reiniciar()
+    assert jugador.vida == VIDA_INICIAL
+    assert jugador.suerte_turnos == 0 and not jugador.salta_turno
+    assert set(jugador.estado.values()) == {0}
+    assert not jugador.mano and not jugador.descartadas
+    assert [c.nomenclatura for c in jugador.mazo] == MAZO
+
+
+def test_suerte_dura_sus_turnos(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO)
+    jugador.activar_suerte()
+    for _ in range(TURNOS_SUERTE):
+        assert jugador.tiene_suerte()
+        jugador.terminar_turno()
+    assert not jugador.tiene_suerte()
+    # terminar_turno roba una carta por turno
+    assert len(jugador.mano) == TURNOS_SUERTE
+
+
+@pytest.mark.parametrize("suerte, dado, salta", [
+    (False, UMBRAL_AZAR - 1, True), (False, UMBRAL_AZAR, False),
+    (True, UMBRAL_AZAR_SUERTE - 1, True), (True, UMBRAL_AZAR_SUERTE, False),
+])
+def test_paralizado_segun_el_dado(nuevo_jugador, suerte, dado, salta):
+    jugador = nuevo_jugador(MAZO, tiradas=[dado])
+    if suerte:
+        jugador.activar_suerte()
+    jugador.paralizado = 2
+    jugador.aplicar_efectos_de_estado()
+    assert jugador.salta_turno is salta
+    assert jugador.paralizado == 1
+
+
+def test_efectos_de_estado(nuevo_jugador):
+    jugador = nuevo_jugador(MAZO)
+    jugador.sangrado = jugador.fuego = jugador.congelado = 1
+    jugador.defensa = 1
+    jugador.aplicar_efectos_de_estado()
+    # Sangrado quita vida; fuego quita primero defensa; congelado salta el turno
+    assert (jugador.vida, jugador.defensa) == (VIDA_INICIAL - 1, 0)
+    assert jugador.salta_turno
+    assert (jugador.sangrado, jugador.fuego, jugador.congelado) == (0, 0, 0)
@@ -0,0 +1,59 @@
+# test_motor_vectorizado.py
+# -*- coding: utf-8 -*-
+# El motor vectorizado juega con las mismas reglas que simular_partida, pero
+# con otro consumo del azar: las partidas no coinciden una a una, así que se
+# compara la proporción de cada resultado entre ambos motores.
+
+import numpy as np
+import pytest
+
+from rulkanis.estadistica import GANADORES, intervalo_wilson
+from rulkanis.catalogo import nuevo_mazo
+from rulkanis.mazo import construir_mazos_random
+from rulkanis.motor_vectorizado import EstadoLote, TablaCartas
+from rulkanis.reglas import CARTAS_INICIALES, VIDA_INICIAL
+from rulkanis.simulador import contar_victorias
+from rulkanis.torneo import origen_de
+
+REPETICIONES = 8000
+# Con este nivel de confianza por motor, la diferencia entre motores con las
+# mismas reglas queda casi siempre dentro de la suma de ambos semianchos
+CONFIANZA = 0.999
+
+
+def _mazos_al_azar():
+    mazos, sets, _ = construir_mazos_random(2, seed=11, huellas=False)
+    return (nuevo_mazo(mazos[0]), origen_de(sets[0]), nuevo_mazo(mazos[1]), origen_de(sets[1]))
+
+
+@pytest.mark.parametrize("enfrentamiento", ["fijo", "al_azar"])
+def test_coincide_con_el_motor_clasico(mazos, enfrentamiento):
+    if enfrentamiento == "al_azar":
+        mazos = _mazos_al_azar()
+
+    clasico = contar_victorias(*mazos, REPETICIONES, 3, motor="clasico")
+    vectorizado = contar_victorias(*mazos, REPETICIONES, 3, motor="vectorizado")
+    for resultado, a, b in zip(GANADORES, clasico.tolist(), vectorizado.tolist()):
+        inf_a, sup_a = intervalo_wilson(a, REPETICIONES, CONFIANZA)
+        inf_b, sup_b = intervalo_wilson(b, REPETICIONES, CONFIANZA)
+        tolerancia = (sup_a - inf_a + sup_b - inf_b) / 2
+        assert abs(a - b) / REPETICIONES <= tolerancia, (
+            f"{resultado}: clásico {a}, vectorizado {b} de {REPETICIONES}"
+        )
+
+
+def test_estado_inicial_del_lote(mazos):
+    mazo1, _, mazo2, _ = mazos
+    mazo1 = np.asarray(mazo1, dtype=np.int16)
+    mazo2 = np.asarray(mazo2, dtype=np.int16)
+    k = 50
+    estado = EstadoLote(TablaCartas.desde_catalogo(), mazo1, mazo2, k, np.random.default_rng(4))
+
+    assert (estado.vida == VIDA_INICIAL).all()
+    assert (estado.en_mano.sum(axis=2) == CARTAS_INICIALES).all()
+    assert (estado.cursor == CARTAS_INICIALES).all()
+    for p, mazo in enumerate((mazo1, mazo2)):
+        # Cada partida baraja el mazo completo
+        orden = np.sort(estado.orden[:, p, : len(mazo)], axis=1)
+        assert (orden == np.sort(mazo)).all()
+    assert set(np.unique(estado.actual).tolist()) == {0, 1}
@@ -0,0 +1,66 @@
+# test_punto_control.py
+# -*- coding: utf-8 -*-
+# Puntos de control: una corrida cortada y reanudada da el mismo resultado que
+# una corrida sin cortes con la misma semilla, y no se pisa ni se mezcla el
+# punto de control de otra corrida.
+
+import threading
+
+import pandas as pd
+import pytest
+
+from rulkanis.simulador import simular_varias_partidas
+
+SEMILLA = 77
+# (repeticiones, partidas entre puntos de control, partidas tras las que se corta)
+CORRIDAS = {"clasico": (3000, 500, 1200), "vectorizado": (10000, 2000, 4000)}
+
+
+def _simular(mazos, motor, repeticiones, **kwargs):
+    return simular_varias_partidas(
+        *mazos, repeticiones, write_excel=False, seed=SEMILLA, motor=motor, nivel_log="resumen",
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("motor", sorted(CORRIDAS))
+def test_reanudar_da_lo_mismo_que_sin_cortes(tmp_path, mazos, motor):
+    repeticiones, cada, corte = CORRIDAS[motor]
+    directorio = str(tmp_path / "punto")
+    cancelar = threading.Event()
+
+    def progreso(partidas, conteo):
+        if partidas >= corte:
+            cancelar.set()
+
+    cortada, _, _ = _simular(mazos, motor, repeticiones, checkpoint=directorio,
+                             checkpoint_partidas=cada, progreso=progreso, cancelar=cancelar)
+    assert (cortada["Parada"] == "cancelada").all()
+    assert corte <= cortada["Partidas"].iloc[0] < repeticiones
+
+    reanudada = _simular(mazos, motor, repeticiones, checkpoint=directorio,
+                         checkpoint_partidas=cada, resume=True)
+    sin_cortes = _simular(mazos, motor, repeticiones)
+    assert (reanudada[0]["Parada"] == "repeticiones").all()
+    for df_reanudada, df_sin_cortes in zip(reanudada, sin_cortes):
+        pd.testing.assert_frame_equal(df_reanudada, df_sin_cortes)
+    assert len(reanudada[1]) == repeticiones
+
+
+def test_punto_existente_sin_resume(tmp_path, mazos):
+    directorio = str(tmp_path / "punto")
+    _simular(mazos, "clasico", 200, checkpoint=directorio)
+    with pytest.raises(FileExistsError):
+        _simular(mazos, "clasico", 200, checkpoint=directorio)
+
+
+@pytest.mark.parametrize("cambio", [{"repeticiones": 300}, {"nivel_log": "ninguno"}, {"seed": SEMILLA + 1}])
+def test_punto_de_otra_corrida(tmp_path, mazos, cambio):
+    directorio = str(tmp_path / "punto")
+    _simular(mazos, "clasico", 200, checkpoint=directorio)
+    opciones = {"repeticiones": 200, "nivel_log": "resumen", "seed": SEMILLA, **cambio}
+    with pytest.raises(ValueError, match="es de otra corrida"):
+        simular_varias_partidas(
+            *mazos, opciones["repeticiones"], write_excel=False, seed=opciones["seed"],
+            nivel_log=opciones["nivel_log"], checkpoint=directorio, resume=True,
+        )
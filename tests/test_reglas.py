@@ -0,0 +1,162 @@
+# test_reglas.py
+# -*- coding: utf-8 -*-
+# Efecto de aplicar_carta por categoría de código, con los programas
+# compilados del catálogo y con cartas compiladas al vuelo.
+
+import pytest
+
+from rulkanis.carta import Carta
+from rulkanis.catalogo import obtener_catalogo
+from rulkanis.eventos import EV_ATAQUE, EV_DANO_VIDA, EV_ESTADO_APLICADO, EV_ESTADO_FALLIDO
+from rulkanis.reglas import (
+    DANO_INICIAL_ESTADO,
+    EFECTOS,
+    TURNOS_CONGELADO,
+    TURNOS_FUEGO,
+    TURNOS_PARALIZADO,
+    TURNOS_SANGRADO,
+    TURNOS_SUERTE,
+    UMBRAL_AZAR,
+    UMBRAL_AZAR_SUERTE,
+    VIDA_INICIAL,
+    aplicar_carta,
+    compilar_programa,
+    determinar_exito_carta,
+)
+
+
+def _carta(nomenclatura: str) -> Carta:
+    catalogo = obtener_catalogo()
+    return catalogo[catalogo.por_nomenclatura[nomenclatura]]
+
+
+@pytest.fixture
+def par(nuevo_jugador):
+    """(actual, oponente) con mazos de robo de cinco cartas."""
+    return nuevo_jugador(["BD"] * 5), nuevo_jugador(["BVP"] * 5, nombre="Jugador 2")
+
+
+@pytest.mark.parametrize("codigo, dano", [("AL", 1), ("AN", 2), ("AC", 3)])
+def test_ataque(par, codigo, dano):
+    actual, oponente = par
+    eventos = []
+    aplicar_carta(_carta(codigo), actual, oponente, eventos)
+    assert oponente.vida == VIDA_INICIAL - dano
+    assert actual.vida == VIDA_INICIAL
+    assert eventos[0][0] == EV_ATAQUE and eventos[0][2] == EV_DANO_VIDA
+
+
+def test_ataque_contra_defensa_y_esquiva(par):
+    actual, oponente = par
+    oponente.defensa = 2
+    aplicar_carta(_carta("AC"), actual, oponente)
+    assert (oponente.defensa, oponente.vida) == (0, VIDA_INICIAL - 1)
+
+    oponente.defensa = 3
+    aplicar_carta(_carta("AN"), actual, oponente)
+    assert (oponente.defensa, oponente.vida) == (1, VIDA_INICIAL - 1)
+
+    oponente.esquiva = True
+    aplicar_carta(_carta("AC"), actual, oponente)
+    assert (oponente.esquiva, oponente.defensa, oponente.vida) == (False, 1, VIDA_INICIAL - 1)
+
+
+@pytest.mark.parametrize("codigo, atributo, turnos, dano", [
+    ("SC", "sangrado", TURNOS_SANGRADO, DANO_INICIAL_ESTADO),
+    ("FC", "fuego", TURNOS_FUEGO, DANO_INICIAL_ESTADO),
+    ("PC", "paralizado", TURNOS_PARALIZADO, 0),
+    ("CC", "congelado", TURNOS_CONGELADO, 0),
+])
+def test_estado_certero(par, codigo, atributo, turnos, dano):
+    actual, oponente = par
+    eventos = []
+    aplicar_carta(_carta(codigo), actual, oponente, eventos)
+    assert getattr(oponente, atributo) == turnos
+    assert oponente.vida == VIDA_INICIAL - dano
+    assert eventos == [(EV_ESTADO_APLICADO, eventos[0][1], 0, dano, turnos)]
+
+
+@pytest.mark.parametrize("codigo, atributo", [
+    ("SA", "sangrado"), ("FA", "fuego"), ("PA", "paralizado"), ("CA", "congelado"),
+])
+def test_estado_azar_segun_el_dado(nuevo_jugador, codigo, atributo):
+    oponente = nuevo_jugador(nombre="Jugador 2")
+    actual = nuevo_jugador(tiradas=[UMBRAL_AZAR - 1, UMBRAL_AZAR])
+    eventos = []
+    aplicar_carta(_carta(codigo), actual, oponente, eventos)
+    assert getattr(oponente, atributo) == 0
+    assert eventos[0][0] == EV_ESTADO_FALLIDO
+
+    aplicar_carta(_carta(codigo), actual, oponente, eventos)
+    assert getattr(oponente, atributo) == EFECTOS[codigo][1]
+    assert eventos[1][0] == EV_ESTADO_APLICADO
+
+
+@pytest.mark.parametrize("codigo, defensa, vida", [
+    ("BD", 1, 0), ("BDN", 2, 0), ("BDF", 3, 0), ("BVP", 0, 1), ("BVM", 0, 2), ("BVG", 0, 3),
+])
+def test_bufos_de_defensa_y_vida(par, codigo, defensa, vida):
+    actual, oponente = par
+    aplicar_carta(_carta(codigo), actual, oponente)
+    assert (actual.defensa, actual.vida) == (defensa, VIDA_INICIAL + vida)
+    assert (oponente.defensa, oponente.vida) == (0, VIDA_INICIAL)
+
+
+def test_limpieza(par):
+    actual, oponente = par
+    actual.sangrado = actual.fuego = actual.paralizado = actual.congelado = actual.defensa = 2
+    aplicar_carta(_carta("BLA"), actual, oponente)
+    assert actual.estado == {
+        "defensa": 2, "sangrado": 0, "fuego": 0, "congelado": 0, "paralizado": 0, "esquiva": False,
+    }
+
+
+def test_suerte_baja_el_umbral_del_dado(nuevo_jugador):
+    carta_azar = Carta("Ataque normal azar", "AN", 2)
+    assert carta_azar.tipo == "AZAR"
+    actual = nuevo_jugador(tiradas=[UMBRAL_AZAR_SUERTE, UMBRAL_AZAR_SUERTE])
+    assert not determinar_exito_carta(carta_azar, actual)[0]
+
+    aplicar_carta(_carta("BS"), actual, nuevo_jugador(nombre="Jugador 2"))
+    assert actual.suerte_turnos == TURNOS_SUERTE
+    assert determinar_exito_carta(carta_azar, actual)[0]
+
+
+@pytest.mark.parametrize("codigo, tiradas, activada", [
+    ("EC", [], True), ("EA", [UMBRAL_AZAR], True), ("EA", [UMBRAL_AZAR - 1], False),
+])
+def test_esquiva(nuevo_jugador, codigo, tiradas, activada):
+    actual = nuevo_jugador(tiradas=tiradas)
+    aplicar_carta(_carta(codigo), actual, nuevo_jugador(nombre="Jugador 2"))
+    assert actual.esquiva is activada
+
+
+def test_robar_roba_para_ambos(par):
+    actual, oponente = par
+    aplicar_carta(_carta("RC"), actual, oponente)
+    assert len(actual.mano) == len(oponente.mano) == 1
+    assert actual.cartas_en_mazo() == oponente.cartas_en_mazo() == 4
+
+
+def test_carta_combinada_aplica_todos_sus_codigos(par):
+    actual, oponente = par
+    aplicar_carta(_carta("AN+SC"), actual, oponente)
+    assert oponente.sangrado == TURNOS_SANGRADO
+    assert oponente.vida == VIDA_INICIAL - 2 - DANO_INICIAL_ESTADO
+
+
+@pytest.mark.parametrize("nomenclatura", sorted(obtener_catalogo().por_nomenclatura))
+def test_programa_del_catalogo_igual_al_compilado_al_vuelo(nuevo_jugador, nomenclatura):
+    del_catalogo = _carta(nomenclatura)
+    assert del_catalogo.programa == compilar_programa(del_catalogo.codigos)
+
+    al_vuelo = Carta(del_catalogo.nombre, del_catalogo.nomenclatura, del_catalogo.nivel)
+    assert al_vuelo.programa is None
+    resultados = []
+    for carta in (del_catalogo, al_vuelo):
+        actual = nuevo_jugador(["BD"] * 5, tiradas=[UMBRAL_AZAR] * 4)
+        oponente = nuevo_jugador(["BVP"] * 5, nombre="Jugador 2")
+        eventos = []
+        aplicar_carta(carta, actual, oponente, eventos)
+        resultados.append((eventos, actual.vida, actual.estado, oponente.vida, oponente.estado))
+    assert resultados[0] == resultados[1]
@@ -0,0 +1,42 @@
+# test_simulador.py
+# -*- coding: utf-8 -*-
+# Reproducibilidad de simular_varias_partidas: cada partida usa una semilla
+# derivada de la semilla de la corrida, así que el resultado no depende del
+# número de workers.
+
+import pandas as pd
+import pytest
+
+from rulkanis.simulador import contar_victorias, simular_varias_partidas
+
+REPETICIONES = 600
+SEMILLA = 123
+
+
+# El motor vectorizado reparte lotes de _TAM_LOTE_VECTORIZADO partidas: con
+# 5000 hay dos lotes
+@pytest.mark.parametrize("motor, repeticiones", [("clasico", REPETICIONES), ("vectorizado", 5000)])
+def test_contar_victorias_no_depende_de_workers(mazos, motor, repeticiones):
+    uno = contar_victorias(*mazos, repeticiones, SEMILLA, motor=motor, workers=1)
+    dos = contar_victorias(*mazos, repeticiones, SEMILLA, motor=motor, workers=2)
+    assert uno.tolist() == dos.tolist()
+    assert uno.sum() == repeticiones
+
+
+@pytest.mark.parametrize("nivel_log", ["resumen", "completo"])
+def test_simular_varias_partidas_no_depende_de_workers(mazos, nivel_log):
+    uno = simular_varias_partidas(
+        *mazos, REPETICIONES, write_excel=False, workers=1, seed=SEMILLA, nivel_log=nivel_log
+    )
+    dos = simular_varias_partidas(
+        *mazos, REPETICIONES, write_excel=False, workers=2, seed=SEMILLA, nivel_log=nivel_log
+    )
+    for df_uno, df_dos in zip(uno, dos):
+        pd.testing.assert_frame_equal(df_uno, df_dos)
+    assert len(uno[1]) == REPETICIONES
+
+
+def test_otra_semilla_cambia_el_resultado(mazos):
+    uno = contar_victorias(*mazos, REPETICIONES, SEMILLA)
+    otra = contar_victorias(*mazos, REPETICIONES, SEMILLA + 1)
+    assert uno.tolist() != otra.tolist()